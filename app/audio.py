@@ -0,0 +1,381 @@
+"""Audio buffers and decoders shared by the ASR and TTS paths."""
+
+import asyncio
+import struct
+import threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Raw PCM encodings accepted by decode_audio without any header
+RAW_ENCODINGS = {
+    "pcm_s16le": np.dtype("<i2"),
+    "pcm_s32le": np.dtype("<i4"),
+    "pcm_f32le": np.dtype("<f4"),
+}
+
+
+def resample(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    """Resample mono audio with an FFT band-limited resampler."""
+    if orig_sr == target_sr or len(audio) == 0:
+        return audio
+    length = int(round(len(audio) * target_sr / orig_sr))
+    spectrum = np.fft.rfft(audio)
+    # Truncating (or zero-padding) the spectrum band-limits the output
+    keep = min(len(spectrum), length // 2 + 1)
+    out = np.fft.irfft(spectrum[:keep], length) * (length / len(audio))
+    return out.astype(np.float32)
+
+
+def float_to_pcm16(audio: np.ndarray) -> bytes:
+    """Convert float audio in [-1, 1] to 16-bit little-endian PCM bytes."""
+    audio = np.clip(np.asarray(audio, dtype=np.float32), -1.0, 1.0)
+    return (audio * 32767.0).astype("<i2").tobytes()
+
+
+def wav_header(sample_rate: int, channels: int = 1, bits: int = 16, data_size: int = None) -> bytes:
+    """Build a PCM WAV header.
+
+    Without ``data_size`` the RIFF and data sizes are set to 0xFFFFFFFF,
+    the usual convention for a WAV stream whose length is not known yet.
+    """
+    block_align = channels * bits // 8
+    riff_size = 0xFFFFFFFF if data_size is None else 36 + data_size
+    data_size = 0xFFFFFFFF if data_size is None else data_size
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", riff_size, b"WAVE",
+        b"fmt ", 16, WAVE_FORMAT_PCM, channels, sample_rate,
+        sample_rate * block_align, block_align, bits,
+        b"data", data_size,
+    )
+
+
+def _to_float32(samples: np.ndarray) -> np.ndarray:
+    """Scale integer PCM to [-1, 1]; float32 input is returned as is."""
+    if samples.dtype == np.float32:
+        return samples
+    if samples.dtype.kind == "f":
+        return samples.astype(np.float32)
+    if samples.dtype == np.uint8:
+        return (samples.astype(np.float32) - 128.0) / 128.0
+    scale = float(2 ** (8 * samples.dtype.itemsize - 1))
+    return samples.astype(np.float32) / scale
+
+
+def _parse_wav(view: memoryview) -> Optional[Tuple[np.ndarray, int, int]]:
+    """Locate the sample data of a RIFF/WAVE buffer without copying it.
+
+    Returns ``(samples, sample_rate, channels)`` or None when the buffer
+    uses an encoding that needs a real decoder.
+    """
+    offset = 12
+    fmt = None
+    while offset + 8 <= len(view):
+        chunk_id = bytes(view[offset:offset + 4])
+        (chunk_size,) = struct.unpack_from("<I", view, offset + 4)
+        body = offset + 8
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack_from("<HHIIHH", view, body)
+            if fmt[0] == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 26:
+                # The real format code starts the SubFormat GUID
+                (code,) = struct.unpack_from("<H", view, body + 24)
+                fmt = (code,) + fmt[1:]
+        elif chunk_id == b"data" and fmt is not None:
+            code, channels, sample_rate, _, _, bits = fmt
+            size = min(chunk_size, len(view) - body)
+            if code == WAVE_FORMAT_PCM and bits in (8, 16, 32):
+                dtype = {8: np.dtype("u1"), 16: np.dtype("<i2"), 32: np.dtype("<i4")}[bits]
+            elif code == WAVE_FORMAT_IEEE_FLOAT and bits in (32, 64):
+                dtype = np.dtype("<f4") if bits == 32 else np.dtype("<f8")
+            else:
+                return None
+            size -= size % (dtype.itemsize * channels)
+            samples = np.frombuffer(view[body:body + size], dtype=dtype)
+            return samples, sample_rate, channels
+        offset = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+# Output formats by file extension: ffmpeg muxer, encoder options, MIME type
+AUDIO_FORMATS = {
+    "wav": ("wav", {"acodec": "pcm_s16le"}, "audio/wav"),
+    "opus": ("ogg", {"acodec": "libopus", "ar": 48000, "audio_bitrate": "32k"}, "audio/ogg"),
+    "mp3": ("mp3", {"acodec": "libmp3lame", "audio_bitrate": "64k"}, "audio/mpeg"),
+}
+
+
+def _output_options(fmt: str, sample_rate: int = None) -> dict:
+    muxer, options, _ = AUDIO_FORMATS[fmt]
+    options = dict(options, format=muxer)
+    if sample_rate and "ar" not in options:
+        # Opus always runs at 48 kHz; the other formats take any rate
+        options["ar"] = sample_rate
+    return options
+
+
+def encode_audio(data: bytes, fmt: str, sample_rate: int = None) -> bytes:
+    """Re-encode an in-memory audio file (e.g. a WAV) as ``fmt`` with ffmpeg."""
+    import ffmpeg
+
+    out, _ = (
+        ffmpeg.input("pipe:0")
+        .output("pipe:1", **_output_options(fmt, sample_rate))
+        .global_args("-loglevel", "error")
+        .run(input=data, capture_stdout=True, capture_stderr=True)
+    )
+    return out
+
+
+def _decode_with_ffmpeg(data: bytes, sample_rate: int) -> np.ndarray:
+    import ffmpeg
+
+    out, _ = (
+        ffmpeg.input("pipe:0")
+        .output("pipe:1", format="f32le", ac=1, ar=sample_rate)
+        .global_args("-loglevel", "error")
+        .run(input=data, capture_stdout=True, capture_stderr=True)
+    )
+    return np.frombuffer(out, dtype="<f4")
+
+
+def decode_audio(
+    data: bytes,
+    sample_rate: int = 16000,
+    encoding: str = None,
+    source_rate: int = None,
+) -> np.ndarray:
+    """Decode an in-memory audio file to mono float32 at ``sample_rate``.
+
+    WAV files and raw PCM (``encoding`` of ``pcm_s16le``, ``pcm_s32le`` or
+    ``pcm_f32le``, recorded at ``source_rate``) are read straight out of
+    the buffer through a ``memoryview``; float32 mono input at the target
+    rate is returned as a zero-copy view. Every other container is decoded
+    by ffmpeg through pipes, without touching the disk.
+    """
+    view = memoryview(data)
+    if encoding in RAW_ENCODINGS:
+        dtype = RAW_ENCODINGS[encoding]
+        usable = len(view) - len(view) % dtype.itemsize
+        samples = np.frombuffer(view[:usable], dtype=dtype)
+        return resample(_to_float32(samples), source_rate or sample_rate, sample_rate)
+
+    if bytes(view[:4]) == b"RIFF" and bytes(view[8:12]) == b"WAVE":
+        parsed = _parse_wav(view)
+        if parsed is not None:
+            samples, rate, channels = parsed
+            samples = _to_float32(samples)
+            if channels > 1:
+                samples = samples.reshape(-1, channels).mean(axis=1, dtype=np.float32)
+            return resample(samples, rate, sample_rate)
+
+    return _decode_with_ffmpeg(data, sample_rate)
+
+
+class PCMRingBuffer:
+    """Fixed-capacity ring buffer of mono float32 PCM samples.
+
+    Writing past capacity overwrites the oldest samples, so memory stays
+    constant however long a stream runs. ``total_written`` counts every
+    sample ever appended, which lets callers keep absolute timestamps.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self._start = 0
+        self._length = 0
+        self.total_written = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, samples: np.ndarray):
+        """Append samples, dropping the oldest ones if the buffer is full."""
+        samples = np.asarray(samples, dtype=np.float32)
+        self.total_written += len(samples)
+        if len(samples) >= self.capacity:
+            self._data[:] = samples[-self.capacity:]
+            self._start = 0
+            self._length = self.capacity
+            return
+
+        overflow = self._length + len(samples) - self.capacity
+        if overflow > 0:
+            self.discard(overflow)
+
+        end = (self._start + self._length) % self.capacity
+        first = min(len(samples), self.capacity - end)
+        self._data[end:end + first] = samples[:first]
+        self._data[:len(samples) - first] = samples[first:]
+        self._length += len(samples)
+
+    def discard(self, count: int):
+        """Drop the ``count`` oldest samples."""
+        count = min(count, self._length)
+        self._start = (self._start + count) % self.capacity
+        self._length -= count
+
+    def get(self) -> np.ndarray:
+        """Return the buffered samples, oldest first.
+
+        The result is a view when the data is contiguous and a copy only
+        when it wraps around the end of the ring.
+        """
+        end = self._start + self._length
+        if end <= self.capacity:
+            return self._data[self._start:end]
+        return np.concatenate((self._data[self._start:], self._data[:end - self.capacity]))
+
+    def clear(self):
+        """Remove every buffered sample."""
+        self._start = 0
+        self._length = 0
+
+
+class RawPCMDecoder:
+    """Decoder for headerless 16-bit little-endian mono PCM streams."""
+
+    def __init__(self):
+        self._remainder = b""
+
+    def feed(self, data: bytes):
+        self._remainder += data
+
+    def read(self) -> np.ndarray:
+        usable = len(self._remainder) - len(self._remainder) % 2
+        samples = np.frombuffer(self._remainder[:usable], dtype="<i2")
+        self._remainder = self._remainder[usable:]
+        return _to_float32(samples)
+
+    def close(self) -> np.ndarray:
+        return self.read()
+
+
+class StreamDecoder:
+    """Incrementally decode a container stream (webm, ogg, ...) with ffmpeg.
+
+    A single ffmpeg process sees the whole stream, so continuation chunks
+    without a container header (as produced by ``MediaRecorder``) decode
+    correctly. Decoded float32 PCM is collected by a reader thread and
+    handed out by :meth:`read` as it becomes available.
+    """
+
+    def __init__(self, sample_rate: int = 16000, input_format: str = None):
+        import ffmpeg
+
+        input_kwargs = {"format": input_format} if input_format else {}
+        self._process = (
+            ffmpeg.input("pipe:0", **input_kwargs)
+            .output("pipe:1", format="f32le", ac=1, ar=sample_rate)
+            .global_args("-loglevel", "error")
+            .run_async(pipe_stdin=True, pipe_stdout=True)
+        )
+        self._chunks: List[bytes] = []
+        self._remainder = b""
+        self._lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_stdout, daemon=True)
+        self._reader.start()
+
+    def _read_stdout(self):
+        while True:
+            chunk = self._process.stdout.read1(65536)
+            if not chunk:
+                break
+            with self._lock:
+                self._chunks.append(chunk)
+
+    def feed(self, data: bytes):
+        """Send encoded bytes to the decoder."""
+        self._process.stdin.write(data)
+        self._process.stdin.flush()
+
+    def read(self) -> np.ndarray:
+        """Return every sample decoded since the previous call."""
+        with self._lock:
+            data = self._remainder + b"".join(self._chunks)
+            self._chunks = []
+        usable = len(data) - len(data) % 4
+        self._remainder = data[usable:]
+        return np.frombuffer(data[:usable], dtype="<f4")
+
+    def close(self) -> np.ndarray:
+        """Finish the stream and return the remaining decoded samples."""
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        self._reader.join(timeout=5)
+        self._process.wait()
+        return self.read()
+
+
+async def run_decoder(decoder, method: str, *args):
+    """Call ``feed`` or ``close`` of a decoder without blocking the event loop.
+
+    :class:`StreamDecoder` writes to ffmpeg's stdin and waits for the
+    process on close, so it runs in a worker thread; raw PCM is decoded
+    inline.
+    """
+    if isinstance(decoder, StreamDecoder):
+        return await asyncio.to_thread(getattr(decoder, method), *args)
+    return getattr(decoder, method)(*args)
+
+
+class StreamEncoder:
+    """Incrementally encode 16-bit mono PCM with ffmpeg.
+
+    The mirror image of :class:`StreamDecoder`: PCM is written to one
+    ffmpeg process as it is produced and the encoded container bytes are
+    collected by a reader thread, so the first packets are available long
+    before the input ends.
+    """
+
+    def __init__(self, fmt: str, sample_rate: int, output_rate: int = None):
+        import ffmpeg
+
+        self._process = (
+            ffmpeg.input("pipe:0", format="s16le", ac=1, ar=sample_rate)
+            .output("pipe:1", **_output_options(fmt, output_rate))
+            .global_args("-loglevel", "error")
+            .run_async(pipe_stdin=True, pipe_stdout=True)
+        )
+        self._chunks: List[bytes] = []
+        self._lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_stdout, daemon=True)
+        self._reader.start()
+
+    def _read_stdout(self):
+        while True:
+            chunk = self._process.stdout.read1(65536)
+            if not chunk:
+                break
+            with self._lock:
+                self._chunks.append(chunk)
+
+    def read(self) -> bytes:
+        """Return every encoded byte produced since the previous call."""
+        with self._lock:
+            data = b"".join(self._chunks)
+            self._chunks = []
+        return data
+
+    def feed(self, pcm: bytes) -> bytes:
+        """Send PCM to the encoder and return the output available so far."""
+        self._process.stdin.write(pcm)
+        self._process.stdin.flush()
+        return self.read()
+
+    def close(self) -> bytes:
+        """Finish the stream and return the remaining encoded bytes."""
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        self._reader.join(timeout=5)
+        self._process.wait()
+        return self.read()
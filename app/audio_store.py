@@ -0,0 +1,189 @@
+"""Managed store of synthesized audio files served under ``/audio``."""
+
+import asyncio
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .audio import AUDIO_FORMATS, encode_audio
+from .config import config
+
+# "<content hash>.<extension>"; anything else is rejected before touching the disk
+AUDIO_ID_PATTERN = re.compile(r"^([0-9a-f]{32})\.([a-z0-9]+)$")
+
+
+class AudioStore:
+    """Content-addressed directory of audio files with size and TTL bounds.
+
+    Files are named after the SHA-256 of their content, so storing the same
+    response twice yields the same ID and clients can cache it forever.
+    Every access refreshes an entry; entries not used for ``ttl_s`` seconds
+    and the least recently used entries beyond ``max_bytes`` are removed by
+    a background task. Compressed variants of a WAV (``<id>.opus``,
+    ``<id>.mp3``) are encoded on first request and stored next to it.
+    """
+
+    def __init__(self, directory: str = None, max_bytes: int = None, ttl_s: float = None):
+        directory = config.audio_store_dir if directory is None else directory
+        self.directory = Path(directory).expanduser()
+        self.max_bytes = config.audio_store_mb * 1024 * 1024 if max_bytes is None else max_bytes
+        self.ttl_s = config.audio_store_ttl_s if ttl_s is None else ttl_s
+
+        # id -> (size, last access), least recently used first
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._evictions = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def _load_index(self):
+        """Index files left by a previous run, oldest first, on first use."""
+        self._loaded = True
+        if not self.directory.exists():
+            return
+        entries = []
+        for path in self.directory.iterdir():
+            if AUDIO_ID_PATTERN.match(path.name):
+                stat = path.stat()
+                entries.append((stat.st_mtime, path.name, stat.st_size))
+        for mtime, audio_id, size in sorted(entries):
+            self._entries[audio_id] = (size, mtime)
+            self._size += size
+
+    def put(self, data: bytes, extension: str = "wav") -> str:
+        """Store ``data`` and return its ID."""
+        audio_id = f"{hashlib.sha256(data).hexdigest()[:32]}.{extension}"
+        self._write(audio_id, data)
+        return audio_id
+
+    def put_file(self, path: str, remove: bool = True) -> str:
+        """Store an existing file (e.g. a temporary WAV) and return its ID."""
+        extension = os.path.splitext(path)[1].lstrip(".") or "wav"
+        with open(path, "rb") as f:
+            audio_id = self.put(f.read(), extension)
+        if remove:
+            os.remove(path)
+        return audio_id
+
+    def _write(self, audio_id: str, data: bytes):
+        with self._lock:
+            if not self._loaded:
+                self._load_index()
+            if audio_id in self._entries:
+                self._touch(audio_id)
+                return
+        path = self.directory / audio_id
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        with self._lock:
+            if audio_id not in self._entries:
+                self._size += len(data)
+            self._entries[audio_id] = (len(data), time.time())
+            self._entries.move_to_end(audio_id)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _touch(self, audio_id: str) -> Optional[Path]:
+        entry = self._entries.get(audio_id)
+        if entry is None:
+            return None
+        self._entries[audio_id] = (entry[0], time.time())
+        self._entries.move_to_end(audio_id)
+        return self.directory / audio_id
+
+    def get(self, audio_id: str) -> Optional[Path]:
+        """Path of a stored file, or None if it is unknown or expired."""
+        if not AUDIO_ID_PATTERN.match(audio_id):
+            return None
+        with self._lock:
+            if not self._loaded:
+                self._load_index()
+            path = self._touch(audio_id)
+        if path is not None and not path.exists():
+            with self._lock:
+                self._forget(audio_id)
+            return None
+        return path
+
+    async def resolve(self, audio_id: str) -> Optional[Path]:
+        """Like :meth:`get`, encoding a missing compressed variant of a WAV.
+
+        Raises ``ValueError`` for formats that cannot be produced.
+        """
+        path = self.get(audio_id)
+        match = AUDIO_ID_PATTERN.match(audio_id)
+        if path is not None or match is None:
+            return path
+        digest, extension = match.groups()
+        if extension not in AUDIO_FORMATS:
+            raise ValueError(f"Unsupported audio format '{extension}'")
+        source = self.get(f"{digest}.wav")
+        if source is None:
+            return None
+        data = await asyncio.to_thread(encode_audio, source.read_bytes(), extension)
+        await asyncio.to_thread(self._write, audio_id, data)
+        return self.get(audio_id)
+
+    def _forget(self, audio_id: str):
+        entry = self._entries.pop(audio_id, None)
+        if entry is not None:
+            self._size -= entry[0]
+
+    def evict(self, now: float = None) -> int:
+        """Remove expired entries, then the least recently used over the size cap."""
+        now = time.time() if now is None else now
+        removed = []
+        with self._lock:
+            if not self._loaded:
+                self._load_index()
+            for audio_id, (size, last_used) in list(self._entries.items()):
+                if now - last_used <= self.ttl_s and self._size <= self.max_bytes:
+                    break
+                self._forget(audio_id)
+                removed.append(audio_id)
+            self._evictions += len(removed)
+        for audio_id in removed:
+            try:
+                (self.directory / audio_id).unlink()
+            except OSError:
+                pass
+        return len(removed)
+
+    def start(self, interval: float = 60.0):
+        """Run eviction from a background task on the running loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(interval))
+
+    async def _run(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.evict)
+            except Exception as e:
+                print(f"Audio store eviction failed: {e}")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+            }
+
+
+# Global audio store instance
+audio_store = AudioStore()
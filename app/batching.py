@@ -0,0 +1,97 @@
+"""Dynamic micro-batching of concurrent model requests."""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .metrics import Histogram
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+QUEUE_WAIT_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+
+
+class MicroBatcher:
+    """Collect concurrent requests into batches for a single model call.
+
+    Requests are held for at most ``max_wait_ms`` (or until ``max_batch_size``
+    items are waiting) and then handed to ``process_batch`` together. The
+    batch function must return one result per item, in order; each caller
+    receives its own result or the exception raised for the batch. A result
+    that is an exception fails only the request it belongs to.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 20.0,
+    ):
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(QUEUE_WAIT_BUCKETS_MS)
+
+        self._pending: List[Tuple[Any, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, item: Any) -> Any:
+        """Queue ``item`` for the next batch and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000.0, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Dispatch up to ``max_batch_size`` waiting requests as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch = self._pending[:self.max_batch_size]
+        del self._pending[:self.max_batch_size]
+        if self._pending:
+            # Leftovers start a fresh wait window of their own
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.max_wait_ms / 1000.0, self._flush)
+        if batch:
+            asyncio.ensure_future(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future, float]]):
+        started = time.perf_counter()
+        self.batch_sizes.observe(len(batch))
+        for _, _, enqueued in batch:
+            self.queue_wait_ms.observe((started - enqueued) * 1000.0)
+
+        items = [item for item, _, _ in batch]
+        try:
+            results = await self.process_batch(items)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch-size and queue-wait histograms for tuning the window."""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "waiting": len(self._pending),
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+        }
@@ -12,6 +12,9 @@ class ModelConfig:
     path: str
     language: str
     sample_rate: int = 16000
+    # Runtime: "pytorch", "int8" (dynamically quantized) or, for ASR only,
+    # "onnx" (ONNX Runtime); see app/export_asr.py and app/models/xtts.py
+    backend: str = "pytorch"
 
 
 @dataclass
@@ -27,6 +30,7 @@ class SabaConfig:
     # Default models
     default_asr_model: str = "whisper_amharic"
     default_tts_model: str = "espnet_amharic"
+    asr_backend: str = "pytorch"  # Backend of the built-in ASR models
     
     # Application settings
     host: str = "0.0.0.0"
@@ -36,6 +40,74 @@ class SabaConfig:
     # Wake word settings
     wake_word: str = "ሳባ"  # "Saba" in Amharic
     wake_word_threshold: float = 0.5
+    wake_word_max_cost: float = 1.0  # Largest phonetic edit cost accepted as a fuzzy match
+    wake_word_cost_per_symbol: float = 0.1  # Accepted edit cost per symbol of the variant (capped by max_cost)
+    
+    # Audio keyword spotting (wake word detection on raw PCM)
+    kws_template_dir: str = "~/.config/saba/kws"  # Recordings (*.wav) of the wake word
+    kws_threshold: float = 0.7  # Minimum template similarity for a detection
+    kws_refractory_s: float = 1.0  # Ignore further detections for this long
+    
+    # Streaming voice turns (/api/voice/turn_ws)
+    voice_end_silence_ms: float = 700.0  # Silence that ends the user's turn
+    voice_speculate_silence_ms: float = 250.0  # Pause after which the reply is prepared early
+    
+    # Conversation session settings
+    session_backend: str = "memory"  # "memory" or "sqlite" (shared by workers)
+    session_db_path: str = "saba_sessions.db"
+    session_ttl: float = 30.0  # Seconds of inactivity before a conversation ends
+    
+    # Model hot-swap (POST /api/models/{kind}/{name}/swap)
+    admin_token: str = ""  # Required in the X-Admin-Token header; empty disables model management
+    model_export_dir: str = "./exports"  # New checkpoints must live under this directory
+    
+    # Start loading models in the background as soon as the server starts
+    model_warmup: bool = True
+    
+    # RAM budget for resident models of each kind (0 = unlimited)
+    model_memory_budget_mb: int = 0
+    
+    # Inference executor settings
+    inference_workers: int = 2  # Threads running blocking model calls
+    inference_queue_depth: int = 16  # Requests allowed to wait for a worker
+    inference_model_concurrency: int = 1  # Concurrent calls per model
+    inference_retry_after: int = 1  # Seconds suggested to saturated clients
+    
+    # Model worker processes (0 = run models in the API process)
+    model_workers: int = 0
+    model_worker_threads: int = 0  # Torch threads per worker (0 = its share of the cores)
+    model_worker_shm_mb: int = 32  # Shared-memory audio buffer per worker
+    
+    # ASR micro-batching settings
+    asr_batch_size: int = 8  # Maximum requests per batched forward pass
+    asr_batch_wait_ms: float = 20.0  # How long to wait for a batch to fill
+    
+    # Voice activity detection in front of ASR
+    vad_enabled: bool = True
+    vad_threshold_db: float = -40.0  # Frame level (dBFS) that counts as speech
+    vad_hangover_ms: float = 300.0  # Keep this much audio after speech stops
+    vad_min_speech_ms: float = 60.0  # Shorter bursts are treated as clicks
+    vad_min_silence_ms: float = 500.0  # Pause that splits an upload into segments
+    vad_max_segment_s: float = 30.0  # Longest segment handed to the model at once
+    
+    # Long-form transcription of large uploads
+    long_form_window_s: float = 28.0  # Longest window handed to the model at once
+    long_form_overlap_s: float = 1.0  # Overlap kept when a window has no pause to cut at
+    long_form_parallelism: int = 4  # Windows transcribed concurrently
+    
+    # TTS audio cache settings
+    tts_cache_memory_mb: int = 64  # In-memory LRU tier
+    tts_cache_dir: str = "~/.cache/saba/tts"  # On-disk tier ("" disables it)
+    tts_cache_disk_mb: int = 1024  # On-disk tier size cap
+    tts_prewarm: bool = False  # Pre-synthesize skill responses at startup
+    audio_encoder_workers: int = 2  # Threads encoding Opus/MP3 output
+    tts_speakers: str = ""  # Comma-separated built-in or registered speakers prepared at load (int8 XTTS)
+    speaker_dir: str = "~/.cache/saba/speakers"  # Registered XTTS voices (conditioning latents)
+    
+    # Synthesized audio served under /audio
+    audio_store_dir: str = "~/.cache/saba/audio"
+    audio_store_mb: int = 512  # Size cap of the directory
+    audio_store_ttl_s: float = 3600.0  # Files unused for this long are removed
     
     def __post_init__(self):
         if self.asr_models is None:
@@ -44,19 +116,22 @@ class SabaConfig:
                     name="openai/whisper-base",  # Base model, can be fine-tuned for Amharic
                     path="openai/whisper-base",
                     language="am",  # Amharic language code
-                    sample_rate=16000
+                    sample_rate=16000,
+                    backend=self.asr_backend,
                 ),
                 "wav2vec2_amharic": ModelConfig(
                     name="facebook/wav2vec2-base-960h",  # Can be fine-tuned for Amharic
                     path="facebook/wav2vec2-base-960h", 
                     language="am",
-                    sample_rate=16000
+                    sample_rate=16000,
+                    backend=self.asr_backend,
                 ),
                 "whisper_multilingual": ModelConfig(
                     name="openai/whisper-small",  # Better multilingual support
                     path="openai/whisper-small",
                     language="am",
-                    sample_rate=16000
+                    sample_rate=16000,
+                    backend=self.asr_backend,
                 )
             }
             
@@ -74,6 +149,13 @@ class SabaConfig:
                     language="am",
                     sample_rate=22050
                 ),
+                "xtts_int8": ModelConfig(
+                    name="xtts_v2_int8",  # XTTS v2 optimised for CPU inference
+                    path="tts_models/multilingual/multi-dataset/xtts_v2",
+                    language="am",
+                    sample_rate=24000,
+                    backend="int8",
+                ),
                 "festival_amharic": ModelConfig(
                     name="festival_amharic",  # Placeholder for Festival-based Amharic TTS
                     path="models/festival_amharic",
@@ -91,8 +173,51 @@ def get_config() -> SabaConfig:
         debug=os.getenv("SABA_DEBUG", "false").lower() == "true",
         default_asr_model=os.getenv("SABA_ASR_MODEL", "whisper_amharic"),
         default_tts_model=os.getenv("SABA_TTS_MODEL", "espnet_amharic"),
+        asr_backend=os.getenv("SABA_ASR_BACKEND", "pytorch"),
         wake_word=os.getenv("SABA_WAKE_WORD", "ሳባ"),
-        wake_word_threshold=float(os.getenv("SABA_WAKE_THRESHOLD", "0.5"))
+        wake_word_threshold=float(os.getenv("SABA_WAKE_THRESHOLD", "0.5")),
+        wake_word_max_cost=float(os.getenv("SABA_WAKE_MAX_COST", "1.0")),
+        wake_word_cost_per_symbol=float(os.getenv("SABA_WAKE_COST_PER_SYMBOL", "0.1")),
+        kws_template_dir=os.getenv("SABA_KWS_TEMPLATES", "~/.config/saba/kws"),
+        kws_threshold=float(os.getenv("SABA_KWS_THRESHOLD", "0.7")),
+        kws_refractory_s=float(os.getenv("SABA_KWS_REFRACTORY", "1.0")),
+        voice_end_silence_ms=float(os.getenv("SABA_VOICE_END_SILENCE_MS", "700")),
+        voice_speculate_silence_ms=float(os.getenv("SABA_VOICE_SPECULATE_MS", "250")),
+        session_backend=os.getenv("SABA_SESSION_BACKEND", "memory"),
+        session_db_path=os.getenv("SABA_SESSION_DB", "saba_sessions.db"),
+        session_ttl=float(os.getenv("SABA_SESSION_TTL", "30")),
+        admin_token=os.getenv("SABA_ADMIN_TOKEN", ""),
+        model_export_dir=os.getenv("SABA_EXPORT_DIR", "./exports"),
+        model_warmup=os.getenv("SABA_MODEL_WARMUP", "true").lower() == "true",
+        model_memory_budget_mb=int(os.getenv("SABA_MODEL_MEMORY_MB", "0")),
+        inference_workers=int(os.getenv("SABA_INFERENCE_WORKERS", "2")),
+        inference_queue_depth=int(os.getenv("SABA_INFERENCE_QUEUE_DEPTH", "16")),
+        inference_model_concurrency=int(os.getenv("SABA_MODEL_CONCURRENCY", "1")),
+        inference_retry_after=int(os.getenv("SABA_RETRY_AFTER", "1")),
+        model_workers=int(os.getenv("SABA_MODEL_WORKERS", "0")),
+        model_worker_threads=int(os.getenv("SABA_MODEL_WORKER_THREADS", "0")),
+        model_worker_shm_mb=int(os.getenv("SABA_MODEL_WORKER_SHM_MB", "32")),
+        asr_batch_size=int(os.getenv("SABA_ASR_BATCH_SIZE", "8")),
+        asr_batch_wait_ms=float(os.getenv("SABA_ASR_BATCH_WAIT_MS", "20")),
+        vad_enabled=os.getenv("SABA_VAD", "true").lower() == "true",
+        vad_threshold_db=float(os.getenv("SABA_VAD_THRESHOLD_DB", "-40")),
+        vad_hangover_ms=float(os.getenv("SABA_VAD_HANGOVER_MS", "300")),
+        vad_min_speech_ms=float(os.getenv("SABA_VAD_MIN_SPEECH_MS", "60")),
+        vad_min_silence_ms=float(os.getenv("SABA_VAD_MIN_SILENCE_MS", "500")),
+        vad_max_segment_s=float(os.getenv("SABA_VAD_MAX_SEGMENT_S", "30")),
+        long_form_window_s=float(os.getenv("SABA_LONG_FORM_WINDOW_S", "28")),
+        long_form_overlap_s=float(os.getenv("SABA_LONG_FORM_OVERLAP_S", "1")),
+        long_form_parallelism=int(os.getenv("SABA_LONG_FORM_PARALLELISM", "4")),
+        tts_cache_memory_mb=int(os.getenv("SABA_TTS_CACHE_MEMORY_MB", "64")),
+        tts_cache_dir=os.getenv("SABA_TTS_CACHE_DIR", "~/.cache/saba/tts"),
+        tts_cache_disk_mb=int(os.getenv("SABA_TTS_CACHE_DISK_MB", "1024")),
+        tts_prewarm=os.getenv("SABA_TTS_PREWARM", "false").lower() == "true",
+        audio_encoder_workers=int(os.getenv("SABA_ENCODER_WORKERS", "2")),
+        tts_speakers=os.getenv("SABA_TTS_SPEAKERS", ""),
+        speaker_dir=os.getenv("SABA_SPEAKER_DIR", "~/.cache/saba/speakers"),
+        audio_store_dir=os.getenv("SABA_AUDIO_DIR", "~/.cache/saba/audio"),
+        audio_store_mb=int(os.getenv("SABA_AUDIO_STORE_MB", "512")),
+        audio_store_ttl_s=float(os.getenv("SABA_AUDIO_TTL", "3600")),
     )
 
 
@@ -1,24 +1,61 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, WebSocket, WebSocketDisconnect
 
+from ..inference import InferenceSaturatedError
+from ..registry import UnknownModelError
 from ..services.asr_service import asr_service
+from ..streaming import STREAM_ENCODINGS
 
 router = APIRouter()
 
 @router.post("/transcribe")
-async def transcribe(file: UploadFile = File(...)):
+async def transcribe(file: UploadFile = File(...), model: str = Form(None), long_form: bool = Form(False)):
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file uploaded")
-    text = await asr_service.transcribe(file)
+    if long_form:
+        # Returns {"transcript", "segments": [{"start", "end", "text"}]}
+        return await asr_service.transcribe_long(file, model=model)
+    text = await asr_service.transcribe(file, model=model)
     return {"transcript": text}
 
 
 @router.websocket("/transcribe_ws")
-async def transcribe_ws(ws: WebSocket):
+async def transcribe_ws(ws: WebSocket, encoding: str = None, model: str = None):
+    """Stream audio chunks in, receive ``partial``/``final`` JSON messages.
+
+    Binary frames carry encoded audio (a webm/ogg stream by default, or
+    headerless PCM with ``?encoding=pcm_s16le``). ``?model=`` selects a
+    configured ASR model. A text frame ``end`` finishes the current
+    utterance and starts a new one.
+    """
     await ws.accept()
+    if encoding is not None and encoding not in STREAM_ENCODINGS:
+        # Would otherwise be handed to ffmpeg as its input format
+        await ws.close(code=1008, reason=f"Unsupported encoding '{encoding}'")
+        return
+    try:
+        stream = asr_service.create_stream(encoding, model)
+    except UnknownModelError as e:
+        await ws.close(code=1008, reason=str(e))
+        return
     try:
         while True:
-            data = await ws.receive_bytes()
-            text = await asr_service.transcribe_bytes(data)
-            await ws.send_text(text)
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                results = await stream.feed(message["bytes"])
+            elif message.get("text") == "end":
+                results = await stream.close()
+                stream = asr_service.create_stream(encoding, model)
+            else:
+                continue
+            for result in results:
+                await ws.send_json(result)
+    except InferenceSaturatedError:
+        # 1013: Try Again Later
+        await ws.close(code=1013)
     except WebSocketDisconnect:
         pass
+    finally:
+        # Stop the decoder (an ffmpeg process for encoded audio) of the open utterance
+        await stream.discard()
@@ -0,0 +1,53 @@
+"""Serves stored audio responses with range and conditional requests."""
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from ..audio import AUDIO_FORMATS
+from ..audio_store import audio_store
+
+router = APIRouter()
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the client's If-None-Match already names ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+@router.api_route("/audio/{audio_id}", methods=["GET", "HEAD"])
+async def get_audio(audio_id: str, request: Request):
+    """Stream a stored audio file.
+
+    IDs are content hashes, so responses are immutable: clients get an
+    ``ETag``, can revalidate with ``If-None-Match`` (304) and seek with
+    ``Range`` requests. Asking for ``<id>.opus`` or ``<id>.mp3`` encodes
+    the stored WAV on first use; other formats are refused (406) before
+    anything is encoded.
+    """
+    _, dot, requested = audio_id.rpartition(".")
+    if dot and requested not in AUDIO_FORMATS:
+        raise HTTPException(status_code=406, detail=f"Unsupported audio format '{requested}'")
+    try:
+        path = await audio_store.resolve(audio_id)
+    except ValueError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    except Exception as e:
+        # ffmpeg failed on a stored file: a server error, not a bad request
+        raise HTTPException(status_code=500, detail=f"Audio could not be encoded: {e}")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Audio not found or expired")
+
+    etag = f'"{audio_id}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={int(audio_store.ttl_s)}, immutable",
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    extension = path.suffix.lstrip(".")
+    media_type = AUDIO_FORMATS[extension][2] if extension in AUDIO_FORMATS else None
+    return FileResponse(path, media_type=media_type, headers=headers)
@@ -0,0 +1,112 @@
+"""Model management endpoints: residency, loading and hot-swap."""
+
+import asyncio
+import hmac
+from pathlib import Path
+
+from fastapi import APIRouter, Form, Header, HTTPException
+
+from ..config import config
+from ..models.asr import ASR_BACKENDS
+from ..models.tts import TTS_BACKENDS
+from ..services.asr_service import asr_service
+from ..services.tts_service import tts_service
+
+router = APIRouter()
+
+BACKENDS = {"asr": ASR_BACKENDS, "tts": TTS_BACKENDS}
+
+
+def _registry(kind: str):
+    registries = {"asr": asr_service.registry, "tts": tts_service.registry}
+    if kind not in registries:
+        raise HTTPException(status_code=404, detail=f"Unknown model kind '{kind}'")
+    return registries[kind]
+
+
+@router.get("/models")
+async def list_models():
+    """Configured models, which ones are resident and their memory use."""
+    return {
+        "asr": asr_service.registry.status(),
+        "tts": tts_service.registry.status(),
+    }
+
+
+def _check_admin(token: str):
+    if not config.admin_token:
+        raise HTTPException(status_code=403, detail="Model management is disabled (set SABA_ADMIN_TOKEN)")
+    if not token or not hmac.compare_digest(token.encode(), config.admin_token.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.post("/models/{kind}/{name}/load")
+async def load_model(kind: str, name: str, admin_token: str = Header(None, alias="X-Admin-Token")):
+    """Load a model into memory ahead of the first request.
+
+    Requires the ``X-Admin-Token`` header to match ``SABA_ADMIN_TOKEN``.
+    """
+    _check_admin(admin_token)
+    registry = _registry(kind)
+    await registry.ensure_loaded(name)
+    return {"status": "loaded", "kind": kind, "model": name}
+
+
+def _allowed_path(kind: str, path: str) -> str:
+    """A configured checkpoint, or a directory inside the export directory.
+
+    Checkpoints are unpickled when loaded, so arbitrary paths are refused.
+    """
+    configured = config.asr_models if kind == "asr" else config.tts_models
+    if path in {model_config.path for model_config in configured.values()}:
+        return path
+    exports = Path(config.model_export_dir).expanduser().resolve()
+    resolved = Path(path).expanduser().resolve()
+    if exports not in resolved.parents:
+        raise HTTPException(status_code=400, detail=f"Checkpoints must be configured or under {exports}")
+    return str(resolved)
+
+
+@router.post("/models/{kind}/{name}/swap")
+async def swap_model(
+    kind: str,
+    name: str,
+    path: str = Form(None),
+    backend: str = Form(None),
+    admin_token: str = Header(None, alias="X-Admin-Token"),
+):
+    """Reload a model, optionally from a new checkpoint or backend, without dropping requests.
+
+    Requires the ``X-Admin-Token`` header to match ``SABA_ADMIN_TOKEN``.
+    """
+    _check_admin(admin_token)
+    registry = _registry(kind)
+    registry.resolve(name)
+    if backend and backend not in BACKENDS[kind]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {kind} backend '{backend}', expected one of {', '.join(BACKENDS[kind])}",
+        )
+    if path:
+        path = _allowed_path(kind, path)
+    await asyncio.to_thread(registry.swap, name, path, backend)
+    model_config = registry.models[name]
+    return {
+        "status": "swapped",
+        "kind": kind,
+        "model": name,
+        "path": model_config.path,
+        "backend": model_config.backend,
+    }
+
+
+@router.delete("/models/{kind}/{name}")
+async def unload_model(kind: str, name: str, admin_token: str = Header(None, alias="X-Admin-Token")):
+    """Unload a resident model.
+
+    Requires the ``X-Admin-Token`` header to match ``SABA_ADMIN_TOKEN``.
+    """
+    _check_admin(admin_token)
+    registry = _registry(kind)
+    unloaded = await asyncio.to_thread(registry.unload, name)
+    return {"status": "unloaded" if unloaded else "not_loaded", "kind": kind, "model": name}
@@ -0,0 +1,68 @@
+"""Registered XTTS voices: conditioning computed once from reference audio."""
+
+import os
+from tempfile import NamedTemporaryFile
+from typing import List
+
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+
+from ..inference import InferenceSaturatedError
+from ..registry import UnknownModelError
+from ..services.tts_service import tts_service
+from ..speakers import speaker_registry
+
+router = APIRouter()
+
+
+@router.get("/speakers")
+async def list_speakers(model: str = None):
+    """Speakers registered for a TTS model."""
+    return {"model": model or tts_service.registry.default, "speakers": tts_service.list_speakers(model)}
+
+
+@router.post("/speakers")
+async def register_speaker(
+    name: str = Form(...),
+    audio: List[UploadFile] = File(...),
+    model: str = Form(None),
+):
+    """Register (or replace) a voice from one or more reference recordings.
+
+    The voice can then be passed as ``speaker`` to the synthesis endpoints.
+    A few clean clips of 5-15 seconds give the best conditioning.
+    """
+    try:
+        name = speaker_registry.validate_name(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    paths = []
+    try:
+        for upload in audio:
+            suffix = os.path.splitext(upload.filename or "")[1] or ".wav"
+            with NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+                tmp.write(await upload.read())
+                paths.append(tmp.name)
+        await tts_service.register_speaker(name, paths, model)
+    except (InferenceSaturatedError, UnknownModelError):
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Speaker registration failed: {str(e)}")
+    finally:
+        for path in paths:
+            os.unlink(path)
+    return {"status": "registered", "speaker": name, "model": model or tts_service.registry.default}
+
+
+@router.delete("/speakers/{name}")
+async def remove_speaker(name: str, model: str = None):
+    """Forget a registered voice."""
+    try:
+        removed = tts_service.remove_speaker(name, model)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not removed:
+        raise HTTPException(status_code=404, detail=f"Speaker '{name}' is not registered")
+    return {"status": "removed", "speaker": name}
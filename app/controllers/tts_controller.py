@@ -1,19 +1,187 @@
-from fastapi import APIRouter, Form, HTTPException
-from fastapi.responses import FileResponse
+import json
+import os
 
+from fastapi import APIRouter, Form, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+
+from ..audio import wav_header
+from ..encoding import media_type_for, negotiate_format
+from ..inference import InferenceSaturatedError
+from ..registry import UnknownModelError
 from ..services.tts_service import tts_service
 
 router = APIRouter()
 
+
+async def _prefetch(chunks):
+    """Wait for the first chunk of ``chunks`` and return an iterator over all of them.
+
+    Errors raised before any audio exists, saturation included, surface
+    here while the response can still carry a status code.
+    """
+    try:
+        first = [await chunks.__anext__()]
+    except StopAsyncIteration:
+        first = []
+
+    async def stream():
+        try:
+            for chunk in first:
+                yield chunk
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
+
+    return stream()
+
+
+async def _start_stream(chunks):
+    try:
+        return await _prefetch(chunks)
+    except (InferenceSaturatedError, UnknownModelError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"TTS synthesis failed: {str(e)}")
+
+
 @router.post("/synthesize")
-async def synthesize(text: str = Form(...), speaker: str = Form(None)):
-    """Synthesize speech from text with optional speaker selection."""
+async def synthesize(
+    request: Request,
+    text: str = Form(...),
+    speaker: str = Form(None),
+    stream: bool = Form(False),
+    model: str = Form(None),
+    audio_format: str = Form(None, alias="format"),
+    sample_rate: int = Form(None),
+):
+    """Synthesize speech from text with optional speaker selection.
+
+    With ``stream=true`` the audio is sent with chunked transfer encoding as
+    each sentence finishes, instead of after the whole utterance. The first
+    sentence is rendered before the response starts, so saturation (503)
+    and synthesis errors (500) are still reported as such.
+
+    The output format is taken from ``format`` (``wav``, ``pcm``, ``opus``
+    or ``mp3``) or negotiated from the ``Accept`` header, and
+    ``sample_rate`` resamples it; Opus is always 48 kHz.
+    """
     if not text:
         raise HTTPException(status_code=400, detail="Text is empty")
-    
+    try:
+        fmt = negotiate_format(request.headers.get("accept"), audio_format)
+    except ValueError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+
+    if fmt != "wav" or sample_rate:
+        await tts_service.ensure_loaded(model)
+        output_rate = 48000 if fmt == "opus" else sample_rate or tts_service.sample_rate_for(model)
+        media_type = media_type_for(fmt, output_rate)
+        if stream:
+            chunks = await _start_stream(
+                tts_service.synthesize_encoded_stream(text, fmt, speaker, model, sample_rate)
+            )
+            return StreamingResponse(chunks, media_type=media_type)
+        try:
+            data = await tts_service.synthesize_encoded(text, fmt, speaker, model, sample_rate)
+        except (InferenceSaturatedError, UnknownModelError):
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"TTS synthesis failed: {str(e)}")
+        return Response(
+            data,
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="output.{fmt}"'},
+        )
+
+    if stream:
+        # The WAV header needs the loaded model's sample rate
+        await tts_service.ensure_loaded(model)
+        chunks = await _start_stream(tts_service.synthesize_stream(text, speaker, model))
+
+        async def audio_stream():
+            yield wav_header(tts_service.sample_rate_for(model))
+            async for chunk in chunks:
+                yield chunk
+
+        return StreamingResponse(audio_stream(), media_type="audio/wav")
+
     try:
         # Use the updated service method with speaker parameter
-        out_file = await tts_service.synthesize(text, speaker)
-        return FileResponse(out_file, media_type="audio/wav", filename="output.wav")
+        out_file = await tts_service.synthesize(text, speaker, model=model)
+        return FileResponse(
+            out_file,
+            media_type="audio/wav",
+            filename="output.wav",
+            background=BackgroundTask(os.remove, out_file),
+        )
+    except (InferenceSaturatedError, UnknownModelError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"TTS synthesis failed: {str(e)}")
+
+
+@router.websocket("/synthesize_ws")
+async def synthesize_ws(ws: WebSocket):
+    """Stream synthesized speech over a websocket.
+
+    Each text frame is either plain text or JSON
+    ``{"text": ..., "speaker": ..., "model": ..., "format": ..., "sample_rate": ...}``.
+    The reply is a ``start`` JSON message describing the audio format, one
+    or more binary frames per sentence (16-bit PCM unless another
+    ``format`` was asked for), and an ``end`` message. A failed synthesis
+    is reported with an ``error`` message instead of ``start`` or ``end``.
+    """
+    await ws.accept()
+    try:
+        while True:
+            message = await ws.receive_text()
+            try:
+                request = json.loads(message)
+            except ValueError:
+                request = {"text": message}
+            if not isinstance(request, dict) or not request.get("text"):
+                await ws.send_json({"type": "error", "detail": "Text is empty"})
+                continue
+
+            model = request.get("model")
+            sample_rate = request.get("sample_rate")
+            try:
+                fmt = negotiate_format(None, request.get("format") or "pcm")
+                await tts_service.ensure_loaded(model)
+            except (ValueError, UnknownModelError) as e:
+                await ws.send_json({"type": "error", "detail": str(e)})
+                continue
+            if fmt == "pcm" and not sample_rate:
+                chunks = tts_service.synthesize_stream(request["text"], request.get("speaker"), model)
+            else:
+                chunks = tts_service.synthesize_encoded_stream(
+                    request["text"], fmt, request.get("speaker"), model, sample_rate
+                )
+            try:
+                chunks = await _prefetch(chunks)
+            except InferenceSaturatedError:
+                raise
+            except Exception as e:
+                await ws.send_json({"type": "error", "detail": f"TTS synthesis failed: {str(e)}"})
+                continue
+            await ws.send_json({
+                "type": "start",
+                "encoding": "pcm_s16le" if fmt == "pcm" else fmt,
+                "sample_rate": 48000 if fmt == "opus" else sample_rate or tts_service.sample_rate_for(model),
+            })
+            try:
+                async for chunk in chunks:
+                    await ws.send_bytes(chunk)
+            except (InferenceSaturatedError, WebSocketDisconnect):
+                raise
+            except Exception as e:
+                await ws.send_json({"type": "error", "detail": f"TTS synthesis failed: {str(e)}"})
+                continue
+            await ws.send_json({"type": "end"})
+    except InferenceSaturatedError:
+        # 1013: Try Again Later
+        await ws.close(code=1013)
+    except WebSocketDisconnect:
+        pass
@@ -1,116 +1,261 @@
 """Voice assistant controller for conversational interactions."""
 
-from fastapi import APIRouter, HTTPException, Form, UploadFile, File
+import asyncio
+import uuid
+
+from fastapi import APIRouter, HTTPException, Form, UploadFile, File, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse
 from typing import Optional
 
+from ..audio import AUDIO_FORMATS
+from ..audio_store import audio_store
+from ..inference import InferenceSaturatedError
+from ..registry import UnknownModelError
 from ..wake_word import voice_assistant
 from ..skills import skill_manager
+from ..voice_pipeline import VoiceTurnSession
 from ..services.asr_service import asr_service
 from ..services.tts_service import tts_service
 from ..config import config
 
 router = APIRouter()
 
+# Clients identify their conversation with this header or cookie
+SESSION_HEADER = "X-Saba-Session"
+SESSION_COOKIE = "saba_session"
+
+
+def get_session_id(request: Request) -> str:
+    """Session ID from the request header or cookie, or a new one."""
+    return (
+        request.headers.get(SESSION_HEADER)
+        or request.cookies.get(SESSION_COOKIE)
+        or uuid.uuid4().hex
+    )
+
+
+def session_response(content: dict, session_id: str) -> JSONResponse:
+    """JSON response that hands the session ID back to the client."""
+    response = JSONResponse(dict(content, session_id=session_id))
+    response.headers[SESSION_HEADER] = session_id
+    response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite="lax")
+    return response
+
 
 @router.post("/voice/chat")
-async def voice_chat(text: str = Form(...)):
+async def voice_chat(request: Request, text: str = Form(...)):
     """Handle voice chat input (text-based for now)."""
+    session_id = get_session_id(request)
     try:
         # Process through voice assistant core
-        response_text = await voice_assistant.process_voice_input(text)
+        response_text = await voice_assistant.process_voice_input(text, session_id)
         
         if response_text is None:
             # No response (wake word not detected, etc.)
-            return JSONResponse({
+            return session_response({
                 "status": "listening",
                 "message": "Waiting for wake word..."
-            })
+            }, session_id)
         
-        return JSONResponse({
+        return session_response({
             "status": "success",
             "response": response_text,
-            "conversation_active": voice_assistant.conversation.is_active
-        })
+            "conversation_active": (await voice_assistant.get_session(session_id)).is_active
+        }, session_id)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing voice input: {str(e)}")
 
 
 @router.post("/voice/chat/audio")
-async def voice_chat_audio(file: UploadFile = File(...)):
-    """Handle voice chat with audio input."""
+async def voice_chat_audio(request: Request, file: UploadFile = File(...), audio_format: str = Form("wav")):
+    """Handle voice chat with audio input.
+
+    The spoken reply is kept in the audio store; ``audio_url`` points at it
+    in ``audio_format`` (``wav``, ``opus`` or ``mp3``).
+    """
+    if audio_format not in AUDIO_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported audio format '{audio_format}'")
+    session_id = get_session_id(request)
     try:
         # First transcribe the audio
         transcript = await asr_service.transcribe(file)
         
         if not transcript.strip():
-            return JSONResponse({
+            return session_response({
                 "status": "error",
                 "message": "Could not transcribe audio"
-            })
+            }, session_id)
         
         # Process through voice assistant
-        response_text = await voice_assistant.process_voice_input(transcript)
+        response_text = await voice_assistant.process_voice_input(transcript, session_id)
         
         if response_text is None:
-            return JSONResponse({
+            return session_response({
                 "status": "listening", 
                 "transcript": transcript,
                 "message": "Waiting for wake word..."
-            })
+            }, session_id)
             
-        # Generate speech response
+        # Generate speech response and keep it where /audio serves it
         audio_file = await tts_service.synthesize(response_text)
+        audio_id = await asyncio.to_thread(audio_store.put_file, audio_file)
         
-        return JSONResponse({
+        return session_response({
             "status": "success",
             "transcript": transcript,
             "response": response_text,
-            "audio_url": f"/audio/{audio_file.split('/')[-1]}",
-            "conversation_active": voice_assistant.conversation.is_active
-        })
+            "audio_url": f"/audio/{audio_id.rsplit('.', 1)[0]}.{audio_format}",
+            "conversation_active": (await voice_assistant.get_session(session_id)).is_active
+        }, session_id)
         
+    except InferenceSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing voice audio: {str(e)}")
 
 
+@router.websocket("/voice/listen_ws")
+async def listen_ws(ws: WebSocket, model: str = None):
+    """Always-on listening: spot the wake word in audio, then transcribe.
+
+    Binary frames carry 16 kHz 16-bit mono PCM (10-20 ms per frame works
+    well). Until the wake word is heard the audio only goes through the
+    lightweight keyword spotter. A detection sends a ``wake`` message and
+    starts the conversation; the following audio is streamed to the ASR
+    model (``partial``/``final`` messages) until the client sends the text
+    frame ``end``, which is answered with a ``response`` message before
+    spotting resumes.
+    """
+    session_id = get_session_id(ws)
+    await ws.accept()
+    detector = voice_assistant.wake_detector
+    if not detector.spotter.enabled:
+        await ws.close(code=1011, reason="No wake word templates configured")
+        return
+    try:
+        model = asr_service.registry.resolve(model)
+    except UnknownModelError as e:
+        await ws.close(code=1008, reason=str(e))
+        return
+    spotting = detector.spotter.stream()
+    transcriber = None
+    finals = []
+    try:
+        while True:
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            data = message.get("bytes")
+            if data is not None and transcriber is None:
+                if await detector.process_audio_stream(data, spotting):
+                    await voice_assistant.start_conversation(session_id)
+                    await ws.send_json({
+                        "type": "wake",
+                        "confidence": detector.last_event.confidence,
+                        "session_id": session_id,
+                    })
+                    transcriber = asr_service.create_stream("pcm_s16le", model)
+            elif data is not None or (message.get("text") == "end" and transcriber is not None):
+                ended = data is None
+                results = await transcriber.close() if ended else await transcriber.feed(data)
+                for result in results:
+                    await ws.send_json(result)
+                    if result["type"] == "final":
+                        finals.append(result["text"])
+                if not ended:
+                    continue
+                transcript = " ".join(finals).strip()
+                transcriber, finals = None, []
+                spotting.reset()
+                response_text = None
+                if transcript:
+                    response_text = await voice_assistant.process_voice_input(transcript, session_id)
+                await ws.send_json({"type": "response", "transcript": transcript, "text": response_text})
+    except InferenceSaturatedError:
+        # 1013: Try Again Later
+        await ws.close(code=1013)
+    except WebSocketDisconnect:
+        pass
+
+
+@router.websocket("/voice/turn_ws")
+async def turn_ws(ws: WebSocket, model: str = None, tts_model: str = None, speaker: str = None):
+    """Full voice turns with the ASR, skill and TTS stages overlapped.
+
+    Binary frames carry 16 kHz 16-bit mono PCM. The server detects when the
+    user starts and stops talking, streams ``partial``/``final`` messages,
+    announces the end of the turn with ``turn`` and answers with a
+    ``response`` message followed by one binary PCM frame per sentence and
+    ``response_end``. Talking over the reply cancels it (``barge_in``). The
+    text frame ``end`` ends the turn without waiting for silence.
+    """
+    session_id = get_session_id(ws)
+    await ws.accept()
+    try:
+        model = asr_service.registry.resolve(model)
+        tts_model = tts_service.registry.resolve(tts_model)
+    except UnknownModelError as e:
+        await ws.close(code=1008, reason=str(e))
+        return
+    turn = VoiceTurnSession(ws, session_id, asr_model=model, tts_model=tts_model, speaker=speaker)
+    try:
+        while True:
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                await turn.feed(message["bytes"])
+            elif message.get("text") == "end":
+                await turn.end_turn()
+    except InferenceSaturatedError:
+        # 1013: Try Again Later
+        await ws.close(code=1013)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await turn.close()
+
+
 @router.post("/voice/wake")
-async def trigger_wake_word():
+async def trigger_wake_word(request: Request):
     """Manually trigger wake word detection (for testing)."""
+    session_id = get_session_id(request)
     try:
-        voice_assistant.conversation.start_conversation()
-        return JSONResponse({
+        await voice_assistant.start_conversation(session_id)
+        return session_response({
             "status": "success",
             "message": "Wake word triggered, conversation started"
-        })
+        }, session_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error triggering wake word: {str(e)}")
 
 
 @router.post("/voice/end")
-async def end_conversation():
+async def end_conversation(request: Request):
     """End the current conversation."""
+    session_id = get_session_id(request)
     try:
-        voice_assistant.conversation.end_conversation()
-        return JSONResponse({
+        await voice_assistant.end_conversation(session_id)
+        return session_response({
             "status": "success",
             "message": "Conversation ended"
-        })
+        }, session_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error ending conversation: {str(e)}")
 
 
 @router.get("/voice/status")
-async def get_voice_status():
+async def get_voice_status(request: Request):
     """Get current voice assistant status."""
-    return JSONResponse({
+    session_id = get_session_id(request)
+    return session_response({
         "wake_word": config.wake_word,
         "is_listening": voice_assistant.wake_detector.is_listening,
-        "conversation_active": voice_assistant.conversation.is_active,
-        "session_id": voice_assistant.conversation.session_id,
+        "conversation_active": (await voice_assistant.get_session(session_id)).is_active,
+        "active_sessions": await voice_assistant.sessions.acount(),
         "available_skills": skill_manager.list_skills()
-    })
+    }, session_id)
 
 
 @router.get("/voice/config")
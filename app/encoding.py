@@ -0,0 +1,148 @@
+"""Output format negotiation and encoding of synthesized speech."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Optional
+
+import numpy as np
+
+from .audio import StreamEncoder, encode_audio, resample, wav_header
+from .config import config
+
+# Formats the TTS endpoints can return; "pcm" is headerless 16-bit
+# little-endian mono at the requested sample rate
+OUTPUT_FORMATS = ("wav", "pcm", "opus", "mp3")
+
+# Accepted MIME types (lowercase, without parameters) for each format
+MIME_TYPES: Dict[str, str] = {
+    "audio/wav": "wav",
+    "audio/wave": "wav",
+    "audio/x-wav": "wav",
+    "audio/pcm": "pcm",
+    "audio/l16": "pcm",
+    "audio/ogg": "opus",
+    "audio/opus": "opus",
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+}
+
+
+def negotiate_format(accept: Optional[str], requested: Optional[str] = None) -> str:
+    """Pick the output format from a ``format`` field or an Accept header.
+
+    An explicit ``requested`` format wins. Otherwise the Accept entries are
+    tried by descending quality; ``*/*``, ``audio/*`` or no header at all
+    mean WAV. Raises ``ValueError`` if nothing acceptable can be produced.
+    """
+    if requested:
+        requested = requested.lower()
+        if requested not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported audio format '{requested}'")
+        return requested
+    if not accept:
+        return "wav"
+
+    candidates = []
+    for position, entry in enumerate(accept.split(",")):
+        media_type, *params = [part.strip() for part in entry.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            candidates.append((-quality, position, media_type.lower()))
+    for _, _, media_type in sorted(candidates):
+        if media_type in MIME_TYPES:
+            return MIME_TYPES[media_type]
+        if media_type in ("*/*", "audio/*"):
+            return "wav"
+    raise ValueError(f"None of the accepted types can be produced: {accept}")
+
+
+def media_type_for(fmt: str, sample_rate: int) -> str:
+    if fmt == "pcm":
+        return f"audio/pcm;rate={sample_rate};channels=1;encoding=s16le"
+    return {"wav": "audio/wav", "opus": "audio/ogg", "mp3": "audio/mpeg"}[fmt]
+
+
+def convert_pcm(pcm: bytes, sample_rate: int, output_rate: int = None) -> bytes:
+    """Resample 16-bit PCM (returned unchanged when the rate already matches)."""
+    if not output_rate or output_rate == sample_rate:
+        return pcm
+    audio = np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+    audio = np.clip(resample(audio, sample_rate, output_rate), -1.0, 1.0)
+    return (audio * 32767.0).astype("<i2").tobytes()
+
+
+class AudioEncoder:
+    """Encodes synthesized PCM off the event loop.
+
+    WAV and PCM output only needs resampling and is done with NumPy;
+    Opus and MP3 go through ffmpeg. Whole clips are encoded on a bounded
+    thread pool; streams get one ffmpeg process each, fed as sentences are
+    synthesised, so encoding runs alongside synthesis.
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or config.audio_encoder_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="saba-encoder")
+        return self._pool
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._get_pool(), fn, *args)
+
+    @staticmethod
+    def encode_blocking(pcm: bytes, sample_rate: int, fmt: str, output_rate: int = None) -> bytes:
+        if fmt in ("wav", "pcm"):
+            data = convert_pcm(pcm, sample_rate, output_rate)
+            if fmt == "pcm":
+                return data
+            return wav_header(output_rate or sample_rate, data_size=len(data)) + data
+        return encode_audio(wav_header(sample_rate, data_size=len(pcm)) + pcm, fmt, output_rate)
+
+    async def encode(self, pcm: bytes, sample_rate: int, fmt: str, output_rate: int = None) -> bytes:
+        """Encode a whole clip of 16-bit mono PCM."""
+        return await self._run(self.encode_blocking, pcm, sample_rate, fmt, output_rate)
+
+    async def encode_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        sample_rate: int,
+        fmt: str,
+        output_rate: int = None,
+    ) -> AsyncIterator[bytes]:
+        """Encode PCM chunks as they are produced, yielding encoded bytes."""
+        if fmt in ("wav", "pcm"):
+            if fmt == "wav":
+                yield wav_header(output_rate or sample_rate)
+            async for pcm in chunks:
+                yield await self._run(convert_pcm, pcm, sample_rate, output_rate)
+            return
+
+        encoder = await self._run(StreamEncoder, fmt, sample_rate, output_rate)
+        try:
+            async for pcm in chunks:
+                data = await self._run(encoder.feed, pcm)
+                if data:
+                    yield data
+        finally:
+            data = await self._run(encoder.close)
+        if data:
+            yield data
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Global audio encoder instance
+audio_encoder = AudioEncoder()
@@ -0,0 +1,110 @@
+"""Export configured ASR models for faster CPU inference.
+
+Writes int8 dynamically quantized PyTorch models or ONNX Runtime models
+(optionally int8 quantized as well) that ``ASRModel`` loads when the model
+config's ``backend`` is ``"int8"`` or ``"onnx"``.
+
+Usage: python -m app.export_asr --backend onnx --quantize --output ./exports
+"""
+
+import argparse
+import os
+import shutil
+from pathlib import Path
+
+from .config import config
+from .models.asr import INT8_WEIGHTS, auto_model_class, load_onnx_model, quantize_int8
+
+# ORTQuantizer presets for dynamic int8 quantization, by target CPU
+QUANTIZE_TARGETS = ("avx2", "avx512", "avx512_vnni", "arm64")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Export ASR models to int8 PyTorch or ONNX Runtime")
+    parser.add_argument(
+        "--model",
+        action="append",
+        choices=sorted(config.asr_models),
+        help="Configured ASR model to export (repeatable; default: all)",
+    )
+    parser.add_argument("--backend", choices=["int8", "onnx"], required=True)
+    parser.add_argument("--output", required=True, help="Directory receiving one folder per model")
+    parser.add_argument(
+        "--quantize",
+        action="store_true",
+        help="Also quantize ONNX weights to int8 (onnx backend only)",
+    )
+    parser.add_argument(
+        "--quantize-target",
+        choices=QUANTIZE_TARGETS,
+        default="avx2",
+        help="CPU instruction set the quantized ONNX model is tuned for",
+    )
+    return parser.parse_args()
+
+
+def _save_processor(source: str, output: Path):
+    from transformers import AutoProcessor
+
+    AutoProcessor.from_pretrained(source).save_pretrained(output)
+
+
+def export_int8(source: str, output: Path):
+    """Save a checkpoint with its Linear layers quantized to int8."""
+    import torch
+
+    model_config, auto_class = auto_model_class(source)
+    model = quantize_int8(auto_class.from_pretrained(source).eval())
+    output.mkdir(parents=True, exist_ok=True)
+    torch.save(model.state_dict(), output / INT8_WEIGHTS)
+    model_config.save_pretrained(output)
+    if model_config.is_encoder_decoder:
+        model.generation_config.save_pretrained(output)
+    _save_processor(source, output)
+
+
+def export_onnx(source: str, output: Path, quantize: bool = False, target: str = "avx2"):
+    """Export a checkpoint to ONNX, optionally with int8 weights."""
+    load_onnx_model(source).save_pretrained(output)
+    _save_processor(source, output)
+    if quantize:
+        _quantize_onnx(output, target)
+
+
+def _quantize_onnx(output: Path, target: str):
+    """Quantize every ONNX graph in ``output`` in place."""
+    from optimum.onnxruntime import ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    quantization_config = getattr(AutoQuantizationConfig, target)(is_static=False, per_channel=False)
+    for graph in sorted(output.glob("*.onnx")):
+        quantizer = ORTQuantizer.from_pretrained(output, file_name=graph.name)
+        quantizer.quantize(save_dir=output, quantization_config=quantization_config)
+        # Keep the original file names so the model loads without extra options
+        os.replace(output / f"{graph.stem}_quantized.onnx", graph)
+        data = output / f"{graph.name}_data"
+        if data.exists():
+            data.unlink()
+
+
+def main():
+    args = parse_args()
+    if args.quantize and args.backend != "onnx":
+        raise SystemExit("--quantize only applies to --backend onnx (int8 is already quantized)")
+
+    suffix = args.backend + ("-int8" if args.quantize else "")
+    for name in args.model or sorted(config.asr_models):
+        model_config = config.asr_models[name]
+        output = Path(args.output) / f"{name}-{suffix}"
+        if output.exists():
+            shutil.rmtree(output)
+        print(f"Exporting {name} ({model_config.path}) to {output}")
+        if args.backend == "int8":
+            export_int8(model_config.path, output)
+        else:
+            export_onnx(model_config.path, output, args.quantize, args.quantize_target)
+        print(f"Serve it with path={output} backend={args.backend}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Inference executor keeping blocking model calls off the event loop."""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from .config import config
+
+
+class InferenceSaturatedError(Exception):
+    """Raised when the inference executor cannot accept more work."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Inference executor is saturated, retry later")
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    """Bounded thread pool that every model call goes through.
+
+    Work is admitted only while the number of pending calls stays below
+    ``max_workers + max_queue_depth``; beyond that callers get an
+    :class:`InferenceSaturatedError` so the API can answer with 503 instead
+    of queueing without bound. Each model key additionally has its own
+    concurrency cap so a slow model cannot take every worker.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        max_queue_depth: int = None,
+        model_concurrency: int = None,
+        retry_after: int = None,
+    ):
+        self.max_workers = max_workers or config.inference_workers
+        self.max_queue_depth = (
+            config.inference_queue_depth if max_queue_depth is None else max_queue_depth
+        )
+        self.model_concurrency = model_concurrency or config.inference_model_concurrency
+        self.retry_after = retry_after or config.inference_retry_after
+        self.concurrency_overrides: Dict[str, int] = {}
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._pending = 0
+        self._rejected = 0
+        self._completed = 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of calls admitted at once (running + queued)."""
+        return self.max_workers + self.max_queue_depth
+
+    def set_concurrency(self, key: str, limit: int):
+        """Override the concurrency cap for a single model key."""
+        self.concurrency_overrides[key] = limit
+        self._semaphores.pop(key, None)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="saba-inference"
+            )
+        return self._pool
+
+    def _get_semaphore(self, key: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            limit = self.concurrency_overrides.get(key, self.model_concurrency)
+            semaphore = asyncio.Semaphore(limit)
+            self._semaphores[key] = semaphore
+        return semaphore
+
+    async def run(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` in the pool under the cap for ``key``.
+
+        Raises
+        ------
+        InferenceSaturatedError:
+            If the executor already holds ``capacity`` pending calls.
+        """
+        if self._pending >= self.capacity:
+            self._rejected += 1
+            raise InferenceSaturatedError(self.retry_after)
+
+        self._pending += 1
+        try:
+            async with self._get_semaphore(key):
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self._get_pool(), functools.partial(fn, *args, **kwargs)
+                )
+            self._completed += 1
+            return result
+        finally:
+            self._pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Current executor occupancy and counters."""
+        return {
+            "workers": self.max_workers,
+            "queue_depth": self.max_queue_depth,
+            "pending": self._pending,
+            "completed": self._completed,
+            "rejected": self._rejected,
+        }
+
+    def shutdown(self, wait: bool = False):
+        """Stop the worker threads."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+        self._semaphores.clear()
+
+
+# Global inference executor instance
+inference_executor = InferenceExecutor()
@@ -0,0 +1,179 @@
+"""Compiled trigger index used by SkillManager to route input in one pass."""
+
+import re
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:  # Python 3.11+
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # pragma: no cover
+    import sre_constants
+    import sre_parse
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton for matching many keywords in a single scan.
+
+    Matching cost depends on the text length (plus the number of matches),
+    not on how many keywords were added.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[Tuple[Any, ...]] = [()]
+        self._built = False
+
+    def add(self, word: str, value: Any):
+        """Add ``word``; matches of it report ``value``."""
+        if not word:
+            return
+        node = 0
+        for char in word:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append(())
+            node = next_node
+        self._outputs[node] += (value,)
+        self._built = False
+
+    def build(self):
+        """Compute failure links (breadth first) and merge their outputs."""
+        queue = deque(self._goto[0].values())
+        for node in queue:
+            self._fail[node] = 0
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child] += self._outputs[self._fail[child]]
+                queue.append(child)
+        self._built = True
+
+    def find_all(self, text: str) -> Iterator[Tuple[int, Any]]:
+        """Yield ``(end_index, value)`` for every keyword occurrence in ``text``."""
+        if not self._built:
+            self.build()
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for value in outputs[node]:
+                yield index, value
+
+    def contains_any(self, text: str) -> bool:
+        """True if any keyword occurs in ``text``."""
+        return next(self.find_all(text), None) is not None
+
+
+def literal_prefixes(pattern: str) -> Optional[List[str]]:
+    """Literal strings one of which starts every match of ``pattern``.
+
+    Returns None when no such set can be derived (e.g. the pattern starts
+    with a character class or is case-insensitive).
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return None
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+    return _prefixes(parsed)
+
+
+def _prefixes(items) -> Optional[List[str]]:
+    prefix = ""
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            prefix += chr(av)
+            continue
+        if prefix:
+            break
+        if op is sre_constants.AT:
+            # Zero-width anchor in front of the literal
+            continue
+        if op is sre_constants.SUBPATTERN:
+            _, add_flags, _, sub_items = av
+            if add_flags & re.IGNORECASE:
+                return None
+            return _prefixes(sub_items)
+        if op is sre_constants.BRANCH:
+            result = []
+            for branch in av[1]:
+                branch_prefixes = _prefixes(branch)
+                if branch_prefixes is None:
+                    return None
+                result.extend(branch_prefixes)
+            return result
+        return None
+    return [prefix] if prefix else None
+
+
+class IntentIndex:
+    """Shared index over the declared triggers of a list of skills.
+
+    Matching runs on the lowercased input. Keywords of every skill go into
+    one :class:`AhoCorasick` automaton together with the literal prefixes of
+    their regex patterns, so one scan yields keyword hits and the few
+    pattern candidates worth verifying at the hit position. Patterns with no
+    literal prefix go into a single combined regex. :meth:`match` returns
+    the position of the first (highest priority) skill whose triggers fire.
+    Skills that override ``can_handle`` cannot be indexed; their positions
+    are listed in ``imperative`` for the caller to check in order.
+    """
+
+    def __init__(self, skills: Sequence[Any]):
+        self.size = len(skills)
+        self.imperative: List[int] = []
+        self._automaton = AhoCorasick()
+        self._group_positions: Dict[str, int] = {}
+        alternatives = []
+
+        for position, skill in enumerate(skills):
+            if not skill.is_declarative():
+                self.imperative.append(position)
+                continue
+            for keyword in skill.keywords:
+                self._automaton.add(keyword.lower(), (position, None, 0))
+            for number, pattern in enumerate(skill.patterns):
+                prefixes = literal_prefixes(pattern)
+                if prefixes is None:
+                    group = f"s{position}_{number}"
+                    self._group_positions[group] = position
+                    # Zero-width lookahead so every start position is tried
+                    alternatives.append(f"(?=(?P<{group}>{pattern}))")
+                    continue
+                compiled = re.compile(pattern)
+                for prefix in prefixes:
+                    self._automaton.add(prefix, (position, compiled, len(prefix)))
+
+        self._automaton.build()
+        self._patterns = re.compile("|".join(alternatives)) if alternatives else None
+
+    def match(self, text: str) -> Optional[int]:
+        """Position of the highest priority declarative skill that matches."""
+        text_lower = text.lower()
+        best = None
+        for end, (position, compiled, length) in self._automaton.find_all(text_lower):
+            if best is not None and position >= best:
+                continue
+            if compiled is None or compiled.match(text_lower, end - length + 1):
+                best = position
+                if best == 0:
+                    return best
+        if self._patterns is not None:
+            for found in self._patterns.finditer(text_lower):
+                position = self._group_positions[found.lastgroup]
+                if best is None or position < best:
+                    best = position
+        return best
@@ -0,0 +1,277 @@
+"""Lightweight keyword spotting on raw PCM for always-on wake-word listening.
+
+Audio is turned into log-mel frames (25 ms windows every 10 ms) and matched
+against recorded examples of the wake word with a streaming subsequence DTW,
+all in NumPy on the CPU. Only after a detection does the caller hand audio
+to the full ASR model.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from .audio import decode_audio
+
+
+def mel_filterbank(sample_rate: int, n_fft: int, n_mels: int, fmin: float = 20.0, fmax: float = None) -> np.ndarray:
+    """Triangular mel filters as an ``(n_fft // 2 + 1, n_mels)`` matrix."""
+    fmax = fmax or sample_rate / 2
+
+    def hz_to_mel(hz):
+        return 2595.0 * np.log10(1.0 + np.asarray(hz) / 700.0)
+
+    def mel_to_hz(mel):
+        return 700.0 * (10.0 ** (np.asarray(mel) / 2595.0) - 1.0)
+
+    edges = mel_to_hz(np.linspace(hz_to_mel(fmin), hz_to_mel(fmax), n_mels + 2))
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).T.astype(np.float32)
+
+
+class LogMelExtractor:
+    """Vectorised log-mel features for mono float32 audio."""
+
+    def __init__(self, sample_rate: int = 16000, n_mels: int = 40, frame_ms: float = 25.0, hop_ms: float = 10.0):
+        self.sample_rate = sample_rate
+        self.n_mels = n_mels
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.hop_length = int(sample_rate * hop_ms / 1000)
+        self.n_fft = 1 << (self.frame_length - 1).bit_length()
+        self.window = np.hanning(self.frame_length).astype(np.float32)
+        self.filters = mel_filterbank(sample_rate, self.n_fft, n_mels)
+
+    def num_frames(self, num_samples: int) -> int:
+        if num_samples < self.frame_length:
+            return 0
+        return 1 + (num_samples - self.frame_length) // self.hop_length
+
+    def compute(self, samples: np.ndarray) -> np.ndarray:
+        """Log-mel frames of ``samples`` as an ``(n_frames, n_mels)`` array."""
+        count = self.num_frames(len(samples))
+        if count == 0:
+            return np.zeros((0, self.n_mels), dtype=np.float32)
+        frames = np.lib.stride_tricks.sliding_window_view(samples, self.frame_length)[::self.hop_length][:count]
+        spectrum = np.fft.rfft(frames * self.window, n=self.n_fft)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        return np.log(power.astype(np.float32) @ self.filters + 1e-6)
+
+
+def frame_energy(features: np.ndarray) -> np.ndarray:
+    """Log of the total mel power of each frame."""
+    peak = features.max(axis=1)
+    return peak + np.log(np.exp(features - peak[:, None]).sum(axis=1))
+
+
+def normalize_frames(features: np.ndarray, dynamic_range: float = 4.0) -> np.ndarray:
+    """Prepare log-mel frames for cosine distance.
+
+    Bands more than ``dynamic_range`` (natural-log units, about 4.3 dB
+    each) below the loudest band of their frame are raised to that floor,
+    which keeps background noise in quiet bands from dominating. The frame
+    gain is then removed and the result scaled to unit length.
+    """
+    features = np.maximum(features, features.max(axis=1, keepdims=True) - dynamic_range)
+    centered = features - features.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(centered, axis=1, keepdims=True)
+    return centered / np.maximum(norms, 1e-6)
+
+
+def trim_silence(features: np.ndarray, margin_db: float = 30.0) -> np.ndarray:
+    """Drop leading/trailing frames far quieter than the loudest frame."""
+    if len(features) == 0:
+        return features
+    energy = frame_energy(features)
+    # Natural-log mel power; 10*log10(e) dB per unit
+    loud = np.nonzero(energy >= energy.max() - margin_db / 4.343)[0]
+    return features[loud[0]:loud[-1] + 1]
+
+
+@dataclass
+class KeywordDetection:
+    """A keyword found in the audio stream."""
+    confidence: float
+    template: str
+    end_time: float  # Seconds since the stream started
+    duration: float
+
+
+class KeywordSpotter:
+    """Wake-word templates compiled for streaming DTW scoring.
+
+    All template frames are stacked into one matrix so each incoming frame
+    needs a single matrix-vector product against every template, and the
+    DTW state of all templates is updated with a few vectorised operations.
+    The per-stream state is one cost and one length value per template frame.
+
+    A score above ``threshold`` is reported once it has not improved for
+    ``settle_frames`` frames, so the detection is the best alignment rather
+    than the first partial one to cross the threshold.
+    """
+
+    def __init__(self, extractor: LogMelExtractor = None, threshold: float = 0.7, refractory_s: float = 1.0,
+                 energy_floor: float = -3.0, settle_frames: int = 10):
+        self.extractor = extractor or LogMelExtractor()
+        self.threshold = threshold
+        self.refractory_s = refractory_s
+        self.settle_frames = settle_frames
+        self.energy_floor = energy_floor
+        self.names: List[str] = []
+        self._templates: List[np.ndarray] = []
+        self._compile()
+
+    @classmethod
+    def from_directory(cls, path: str, **kwargs) -> "KeywordSpotter":
+        """Load ``*.wav`` recordings and ``*.npy`` log-mel arrays from ``path``."""
+        spotter = cls(**kwargs)
+        path = os.path.expanduser(path or "")
+        if not path or not os.path.isdir(path):
+            return spotter
+        for filename in sorted(os.listdir(path)):
+            full_path = os.path.join(path, filename)
+            try:
+                if filename.endswith(".npy"):
+                    spotter.add_features(np.load(full_path), name=filename)
+                elif filename.endswith(".wav"):
+                    with open(full_path, "rb") as f:
+                        audio = decode_audio(f.read(), spotter.extractor.sample_rate)
+                    spotter.add_template(audio, name=filename)
+            except Exception as e:
+                print(f"Skipping keyword template {filename}: {e}")
+        return spotter
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._templates)
+
+    def add_template(self, audio: np.ndarray, name: str = None):
+        """Add a recording of the wake word (mono float32 at the extractor's rate)."""
+        self.add_features(trim_silence(self.extractor.compute(np.asarray(audio, dtype=np.float32))), name)
+
+    def add_features(self, features: np.ndarray, name: str = None):
+        """Add a template given as log-mel frames."""
+        features = np.asarray(features, dtype=np.float32)
+        if features.ndim != 2 or features.shape[1] != self.extractor.n_mels or len(features) < 2:
+            raise ValueError(f"expected (frames, {self.extractor.n_mels}) log-mel features")
+        self._templates.append(normalize_frames(features))
+        self.names.append(name or f"template_{len(self.names)}")
+        self._compile()
+
+    def _compile(self):
+        # Each template occupies two zero "start" cells followed by its frames,
+        # so shifted views never mix the state of neighbouring templates
+        lengths = [len(t) for t in self._templates]
+        width = sum(lengths) + 2 * len(lengths)
+        self._frames = np.zeros((width, self.extractor.n_mels), dtype=np.float32)
+        self._start_cells = np.zeros(width, dtype=bool)
+        self._ends = []
+        offset = 0
+        for template in self._templates:
+            self._start_cells[offset:offset + 2] = True
+            self._frames[offset + 2:offset + 2 + len(template)] = template
+            offset += 2 + len(template)
+            self._ends.append(offset - 1)
+        self._ends = np.asarray(self._ends, dtype=np.int64)
+
+    def stream(self) -> "KeywordStream":
+        """Start a new detection state for one audio stream."""
+        return KeywordStream(self)
+
+
+class KeywordStream:
+    """Streaming detection state for one audio source.
+
+    Feed mono float32 PCM of any chunk size (10-20 ms hops are typical);
+    samples that do not fill a whole frame yet are carried over.
+    """
+
+    def __init__(self, spotter: KeywordSpotter):
+        self.spotter = spotter
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._frame_index = 0
+        self._quiet_until = 0
+        self.reset()
+
+    def reset(self):
+        """Forget any partial match (the sample carry-over is kept)."""
+        width = len(self.spotter._frames)
+        self._cost = np.full(width, np.inf, dtype=np.float32)
+        self._length = np.zeros(width, dtype=np.float32)
+        self._candidate: Optional[KeywordDetection] = None
+        self._candidate_frame = 0
+
+    def process(self, samples: np.ndarray) -> Optional[KeywordDetection]:
+        """Consume PCM samples; return a detection if the keyword just ended."""
+        spotter = self.spotter
+        extractor = spotter.extractor
+        samples = np.concatenate([self._pending, np.asarray(samples, dtype=np.float32)])
+        count = extractor.num_frames(len(samples))
+        self._pending = samples[count * extractor.hop_length:]
+        if count == 0 or not spotter.enabled:
+            self._frame_index += count
+            return None
+
+        if len(self._cost) != len(spotter._frames):
+            # Templates were added since this stream started
+            self.reset()
+        features = extractor.compute(samples)
+        loud = frame_energy(features) > spotter.energy_floor
+        distances = 1.0 - normalize_frames(features) @ spotter._frames.T
+        # Quiet frames match nothing
+        distances[~loud] = 1.0
+        detection = None
+        for row in distances:
+            self._frame_index += 1
+            found = self._step(row)
+            if found is not None:
+                detection = found
+        return detection
+
+    def _step(self, distance: np.ndarray) -> Optional[KeywordDetection]:
+        spotter = self.spotter
+        cost, length = self._cost, self._length
+        cost[spotter._start_cells] = 0.0
+        length[spotter._start_cells] = 0.0
+
+        # Each template frame continues from itself, its predecessor, or the one
+        # before that (speaking up to twice as fast as the template)
+        stay = cost
+        previous = np.concatenate(([np.inf], cost[:-1]))
+        skip = np.concatenate(([np.inf, np.inf], cost[:-2]))
+        choices = np.stack([stay, previous, skip])
+        best = np.argmin(choices, axis=0)
+        cost_in = np.take_along_axis(choices, best[None], axis=0)[0]
+        length_in = np.stack([length, np.concatenate(([0.0], length[:-1])),
+                              np.concatenate(([0.0, 0.0], length[:-2]))])
+        length_in = np.take_along_axis(length_in, best[None], axis=0)[0]
+
+        self._cost = cost_in + distance
+        self._length = length_in + 1.0
+
+        if self._frame_index < self._quiet_until:
+            return None
+        ends = spotter._ends
+        scores = 1.0 - self._cost[ends] / np.maximum(self._length[ends], 1.0)
+        winner = int(np.argmax(scores))
+        hop_s = spotter.extractor.hop_length / spotter.extractor.sample_rate
+        candidate = self._candidate
+        if scores[winner] >= spotter.threshold and (candidate is None or scores[winner] > candidate.confidence):
+            self._candidate = KeywordDetection(
+                confidence=float(scores[winner]),
+                template=spotter.names[winner],
+                end_time=round(self._frame_index * hop_s, 3),
+                duration=round(float(self._length[ends[winner]]) * hop_s, 3),
+            )
+            self._candidate_frame = self._frame_index
+            return None
+        if candidate is None or self._frame_index - self._candidate_frame < spotter.settle_frames:
+            return None
+
+        candidate.confidence = round(candidate.confidence, 3)
+        self.reset()
+        self._quiet_until = self._frame_index + int(spotter.refractory_s / hop_s)
+        return candidate
@@ -0,0 +1,176 @@
+"""Long-form transcription of large uploads in overlapping windows."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .audio import RawPCMDecoder, StreamDecoder, run_decoder
+from .streaming import overlap_length
+from .vad import EnergyVAD
+
+# Upload bytes read (and fed to the decoder) at a time
+READ_CHUNK_BYTES = 64 * 1024
+
+
+class LongFormTranscriber:
+    """Transcribe arbitrarily long audio with bounded memory.
+
+    The upload is decoded incrementally and cut into windows of at most
+    ``window_s`` seconds. With a ``vad`` the cut is placed in the middle of
+    the last pause within the final ``search_s`` seconds of the window;
+    when there is no pause the window is cut hard and the next one starts
+    ``overlap_s`` earlier, the duplicated words being removed again when
+    the text is stitched. Up to ``max_in_flight`` windows are transcribed
+    concurrently (the ASR batcher runs them as one batch), and decoding
+    waits for a free slot, so memory stays constant however long the input
+    is. Windows without speech are not sent to the model.
+    """
+
+    def __init__(
+        self,
+        transcribe: Callable[[np.ndarray], Awaitable[str]],
+        sample_rate: int = 16000,
+        encoding: str = None,
+        window_s: float = 28.0,
+        overlap_s: float = 1.0,
+        search_s: float = 5.0,
+        min_silence_ms: float = 300.0,
+        max_in_flight: int = 4,
+        vad: Optional[EnergyVAD] = None,
+    ):
+        self.transcribe = transcribe
+        self.sample_rate = sample_rate
+        self.window = int(window_s * sample_rate)
+        self.overlap = int(overlap_s * sample_rate)
+        if not 0 <= self.overlap < self.window:
+            # Each window must start after the previous one, or decoding never advances
+            raise ValueError(f"overlap_s ({overlap_s}) must be at least 0 and less than window_s ({window_s})")
+        self.search = min(int(search_s * sample_rate), self.window // 2)
+        self.min_silence_frames = 1
+        self.vad = vad
+        if vad is not None:
+            self.min_silence_frames = max(1, int(min_silence_ms * sample_rate / 1000) // vad.frame_length)
+
+        if encoding == "pcm_s16le":
+            self.decoder = RawPCMDecoder()
+        else:
+            self.decoder = StreamDecoder(sample_rate, input_format=encoding)
+
+        self._slots = asyncio.Semaphore(max(1, max_in_flight))
+        self._chunks: List[np.ndarray] = []
+        self._buffered = 0
+        self._offset = 0
+        self._overlaps_previous = False
+        self._tasks: List[asyncio.Task] = []
+        self._results: Dict[int, Tuple[int, int, bool, str]] = {}
+
+    async def transcribe_file(self, file, chunk_size: int = READ_CHUNK_BYTES) -> Dict[str, Any]:
+        """Read an upload in chunks and return its transcript and segments."""
+        try:
+            while True:
+                data = await file.read(chunk_size)
+                if not data:
+                    break
+                await self.feed(data)
+        except BaseException:
+            self._cancel()
+            raise
+        return await self.close()
+
+    async def feed(self, data: bytes):
+        """Decode more encoded audio and dispatch every full window."""
+        await run_decoder(self.decoder, "feed", data)
+        await self._consume(self.decoder.read())
+
+    async def close(self) -> Dict[str, Any]:
+        """Transcribe the remaining audio and stitch all segments together."""
+        try:
+            await self._consume(await run_decoder(self.decoder, "close"))
+            if self._buffered:
+                await self._dispatch(np.concatenate(self._chunks))
+                self._chunks, self._buffered = [], 0
+            await asyncio.gather(*self._tasks)
+        except BaseException:
+            self._cancel()
+            raise
+        return self._stitch()
+
+    async def _consume(self, samples: np.ndarray):
+        if len(samples) == 0:
+            return
+        self._chunks.append(samples)
+        self._buffered += len(samples)
+        while self._buffered >= self.window:
+            buffer = np.concatenate(self._chunks)
+            cut, hard = self._cut_point(buffer)
+            await self._dispatch(buffer[:cut])
+            keep_from = cut - self.overlap if hard else cut
+            self._offset += keep_from
+            self._overlaps_previous = hard and self.overlap > 0
+            self._chunks = [buffer[keep_from:]]
+            self._buffered = len(buffer) - keep_from
+
+    def _cut_point(self, buffer: np.ndarray) -> Tuple[int, bool]:
+        """Where to end the next segment, and whether the cut is hard."""
+        if self.vad is None:
+            return self.window, True
+        region_start = self.window - self.search
+        speech = self.vad.raw_flags(buffer[region_start:self.window])
+        edges = np.diff(np.concatenate(([1], speech.astype(np.int8), [1])))
+        starts, ends = np.nonzero(edges == -1)[0], np.nonzero(edges == 1)[0]
+        pauses = [(s, e) for s, e in zip(starts, ends) if e - s >= self.min_silence_frames]
+        if not pauses:
+            return self.window, True
+        start, end = pauses[-1]
+        return region_start + int(start + end) // 2 * self.vad.frame_length, False
+
+    async def _dispatch(self, audio: np.ndarray):
+        """Start transcribing one segment once a slot is free."""
+        await self._slots.acquire()
+        index = len(self._tasks)
+        segment = (index, self._offset, self._offset + len(audio), self._overlaps_previous)
+        self._tasks.append(asyncio.ensure_future(self._run(segment, audio)))
+
+    async def _run(self, segment, audio: np.ndarray):
+        index, start, end, overlaps_previous = segment
+        try:
+            if self.vad is not None and not self.vad.is_speech(audio):
+                text = ""
+            else:
+                text = await self.transcribe(audio)
+        finally:
+            self._slots.release()
+        self._results[index] = (start, end, overlaps_previous, text)
+
+    def _cancel(self):
+        for task in self._tasks:
+            task.cancel()
+        # Called while unwinding (possibly on cancellation), so the decoder
+        # is closed in the background rather than awaited
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(None, self._close_decoder)
+
+    def _close_decoder(self):
+        try:
+            self.decoder.close()
+        except Exception:
+            pass
+
+    def _stitch(self) -> Dict[str, Any]:
+        words: List[str] = []
+        segments = []
+        for index in sorted(self._results):
+            start, end, overlaps_previous, text = self._results[index]
+            segment_words = text.split()
+            if overlaps_previous and words:
+                segment_words = segment_words[overlap_length(words, segment_words, max_words=8):]
+            if not segment_words:
+                continue
+            words.extend(segment_words)
+            segments.append({
+                "start": round(start / self.sample_rate, 2),
+                "end": round(end / self.sample_rate, 2),
+                "text": " ".join(segment_words),
+            })
+        return {"transcript": " ".join(words), "segments": segments}
@@ -1,14 +1,34 @@
-from fastapi import FastAPI
+import asyncio
+import time
+
+# Imported first so the recorded import time covers everything below
+from .startup import PROCESS_START, startup_timer
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 
 from .controllers.asr_controller import router as asr_router
+from .controllers.audio_controller import router as audio_router
 from .controllers.tts_controller import router as tts_router
 from .controllers.voice_controller import router as voice_router
+from .controllers.models_controller import router as models_router
+from .controllers.speakers_controller import router as speakers_router
 from .services.asr_service import asr_service
 from .services.tts_service import tts_service
+from .audio_store import audio_store
+from .encoding import audio_encoder
 from .config import config
+from .inference import InferenceSaturatedError, inference_executor
+from .prewarm import tts_prewarmer
+from .registry import UnknownModelError
+from .tts_cache import tts_cache
+from .vad import vad_stats
 from .wake_word import voice_assistant
+from .workers import worker_pool
+
+startup_timer.record("import_app", time.perf_counter() - PROCESS_START)
 
 app = FastAPI(
     title="Saba - Amharic Voice Assistant",
@@ -25,6 +45,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(InferenceSaturatedError)
+async def inference_saturated_handler(request: Request, exc: InferenceSaturatedError):
+    """Apply backpressure when the inference executor is full."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+@app.exception_handler(UnknownModelError)
+async def unknown_model_handler(request: Request, exc: UnknownModelError):
+    """Reject requests for models that are not configured."""
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
 @app.get("/healthcheck")
 def healthcheck():
     """Health check endpoint."""
@@ -37,21 +71,75 @@ def healthcheck():
         "tts_model": config.default_tts_model
     }
 
+@app.get("/readyz")
+def readyz():
+    """Readiness probe: 200 only once the ASR and TTS models are loaded."""
+    ready = asr_service.is_loaded and tts_service.is_loaded
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "loading",
+            "asr_loaded": asr_service.is_loaded,
+            "tts_loaded": tts_service.is_loaded,
+            "startup_seconds": startup_timer.report(),
+        },
+    )
+
+async def warm_up_models():
+    """Load the ASR and TTS models in parallel worker threads."""
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        asyncio.to_thread(asr_service.load),
+        asyncio.to_thread(tts_service.load),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"Model warm-up failed: {result}")
+    startup_timer.record("warm_up_models", time.perf_counter() - started)
+
+@app.get("/metrics")
+def metrics():
+    """Serving metrics for tuning the inference path."""
+    return {
+        "inference": inference_executor.stats(),
+        "asr_batching": asr_service.stats(),
+        "tts_cache": tts_cache.stats(),
+        "tts_prewarm": tts_prewarmer.progress(),
+        "vad": vad_stats.snapshot(),
+        "model_workers": worker_pool.stats(),
+        "audio_store": audio_store.stats(),
+    }
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize voice assistant on startup."""
     voice_assistant.start_listening()
+    audio_store.start()
+    if config.model_warmup:
+        asyncio.ensure_future(warm_up_models())
+    if config.tts_prewarm:
+        # Runs in the background so /healthcheck answers immediately
+        tts_prewarmer.start(tts_service)
     print(f"Saba voice assistant started. Wake word: {config.wake_word}")
 
 @app.on_event("shutdown") 
 async def shutdown_event():
     """Cleanup on shutdown."""
     voice_assistant.stop_listening()
+    tts_prewarmer.stop()
+    audio_store.stop()
+    audio_encoder.shutdown()
+    inference_executor.shutdown()
+    worker_pool.shutdown()
 
 # Include routers
 app.include_router(asr_router, prefix="/api", tags=["Speech-to-Text"])
 app.include_router(tts_router, prefix="/api", tags=["Text-to-Speech"])
 app.include_router(voice_router, prefix="/api", tags=["Voice Assistant"])
+app.include_router(models_router, prefix="/api", tags=["Models"])
+app.include_router(speakers_router, prefix="/api", tags=["Speakers"])
+app.include_router(audio_router, tags=["Audio"])
 
 # Serve static files (for frontend)
 # app.mount("/static", StaticFiles(directory="frontend"), name="static")
@@ -0,0 +1,37 @@
+"""Lightweight in-process metrics for tuning Saba's serving path."""
+
+import bisect
+import threading
+from typing import Dict, Any, List, Sequence
+
+
+class Histogram:
+    """Fixed-bucket histogram, cheap enough to observe on every request."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets: List[float] = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record a single observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Bucket counts keyed by upper bound ("+Inf" for the overflow bucket)."""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        labels = [str(bound) for bound in self.buckets] + ["+Inf"]
+        return {
+            "buckets": dict(zip(labels, counts)),
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+        }
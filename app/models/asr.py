@@ -1,11 +1,70 @@
-from tempfile import NamedTemporaryFile
-
-from transformers import pipeline
+import os
+from pathlib import Path
 
+from ..audio import decode_audio
+from ..batching import MicroBatcher
 from ..config import config
+from ..inference import inference_executor
+from ..registry import module_memory_bytes, state_dict_bytes
+from ..text import asr_normalizer
+from ..vad import create_vad
+
+ASR_BACKENDS = ("pytorch", "int8", "onnx")
+
+# Quantized weights written by app.export_asr next to the model config
+INT8_WEIGHTS = "pytorch_model_int8.pt"
+
+
+def auto_model_class(model: str):
+    """Seq2seq (Whisper) or CTC (wav2vec2) auto class for a checkpoint."""
+    from transformers import AutoConfig, AutoModelForCTC, AutoModelForSpeechSeq2Seq
+
+    model_config = AutoConfig.from_pretrained(model)
+    return model_config, AutoModelForSpeechSeq2Seq if model_config.is_encoder_decoder else AutoModelForCTC
+
+
+def quantize_int8(module):
+    """Dynamically quantize the Linear layers of a model to int8."""
+    import torch
+
+    return torch.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_int8_model(model: str):
+    """Load an int8 model exported by ``app.export_asr``.
+
+    Any other checkpoint is loaded in fp32 and quantized on the fly.
+    """
+    import torch
+    from transformers import GenerationConfig
+
+    model_config, auto_class = auto_model_class(model)
+    weights = os.path.join(model, INT8_WEIGHTS)
+    if not os.path.isfile(weights):
+        return quantize_int8(auto_class.from_pretrained(model)).eval()
+
+    # Build the quantized module structure, then fill in the saved weights
+    loaded = quantize_int8(auto_class.from_config(model_config))
+    # Packed int8 weights are not plain tensors, so this unpickles: only load
+    # our own exports (hot-swap accepts paths under SABA_EXPORT_DIR only)
+    loaded.load_state_dict(torch.load(weights, map_location="cpu", weights_only=False))
+    if model_config.is_encoder_decoder:
+        loaded.generation_config = GenerationConfig.from_pretrained(model)
+    return loaded.eval()
+
+
+def load_onnx_model(model: str):
+    """Load an ONNX Runtime model, exporting a PyTorch checkpoint if needed."""
+    from optimum.onnxruntime import ORTModelForCTC, ORTModelForSpeechSeq2Seq
+
+    model_config, _ = auto_model_class(model)
+    auto_class = ORTModelForSpeechSeq2Seq if model_config.is_encoder_decoder else ORTModelForCTC
+    exported = os.path.isdir(model) and any(name.endswith(".onnx") for name in os.listdir(model))
+    return auto_class.from_pretrained(model, export=not exported)
+
 
 class ASRModel:
-    def __init__(self, model: str = None, language: str = "am"):
+    def __init__(self, model: str = None, language: str = "am", sample_rate: int = None, backend: str = None):
         """Initialize the speech recognition pipeline.
 
         Parameters
@@ -15,6 +74,11 @@ class ASRModel:
             If None, uses the default model from config.
         language:
             Language code for the ASR model (default: "am" for Amharic).
+        sample_rate:
+            Input sample rate. If None, taken from the matching model config.
+        backend:
+            "pytorch", "int8" or "onnx". If None, taken from the matching
+            model config.
         """
         if model is None:
             model_config = config.asr_models[config.default_asr_model]
@@ -22,71 +86,126 @@ class ASRModel:
             
         self.language = language
         self.model_name = model
+        self.sample_rate = sample_rate or next(
+            (cfg.sample_rate for cfg in config.asr_models.values() if cfg.path == model),
+            16000,
+        )
+        self.backend = backend or next(
+            (cfg.backend for cfg in config.asr_models.values() if cfg.path == model),
+            "pytorch",
+        )
+        if self.backend not in ASR_BACKENDS:
+            raise ValueError(f"Unknown ASR backend '{self.backend}', expected one of {', '.join(ASR_BACKENDS)}")
         
+        # Imported here so that importing the app does not load transformers
+        from transformers import pipeline
+
         # Initialize the pipeline with language settings for Amharic
         pipeline_kwargs = {"model": model}
+        if self.backend != "pytorch":
+            # The pipeline gets a loaded model, so name the processor files too
+            loader = load_int8_model if self.backend == "int8" else load_onnx_model
+            pipeline_kwargs = {"model": loader(model), "tokenizer": model, "feature_extractor": model}
         
         # For Whisper models, we can specify the language
-        if "whisper" in model.lower():
+        model_type = getattr(getattr(pipeline_kwargs["model"], "config", None), "model_type", "")
+        if "whisper" in model.lower() or model_type == "whisper":
             # Whisper supports forced language decoding
             self.pipe = pipeline(
                 "automatic-speech-recognition", 
-                model=model,
-                generate_kwargs={"language": "amharic", "task": "transcribe"}
+                generate_kwargs={"language": "amharic", "task": "transcribe"},
+                **pipeline_kwargs,
             )
         else:
             self.pipe = pipeline("automatic-speech-recognition", **pipeline_kwargs)
 
+        # Silence is trimmed (and long uploads split at pauses) before the model
+        self.vad = create_vad(self.sample_rate) if config.vad_enabled else None
+
+        # Concurrent requests share batched forward passes
+        self.batcher = MicroBatcher(
+            self._run_batch,
+            max_batch_size=config.asr_batch_size,
+            max_wait_ms=config.asr_batch_wait_ms,
+        )
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the model weights."""
+        if self.backend == "onnx":
+            directory = getattr(self.pipe.model, "model_save_dir", None)
+            return sum(f.stat().st_size for f in Path(directory).glob("*.onnx*")) if directory else 0
+        if self.backend == "int8":
+            return state_dict_bytes(self.pipe.model)
+        return module_memory_bytes(self.pipe.model)
+
     async def transcribe(self, file):
         """Transcribe an uploaded audio file."""
-        with NamedTemporaryFile(delete=False, suffix=file.filename) as tmp:
-            contents = await file.read()
-            tmp.write(contents)
-            tmp.flush()
-            
-            # For Amharic, we might want to preprocess or post-process
-            result = self.pipe(tmp.name)
-            text = result.get("text", "")
-            
-            # Post-process for Amharic if needed
-            return self._post_process_amharic_text(text)
+        contents = await file.read()
+        return await self.batcher.submit(contents)
 
     async def transcribe_bytes(self, data: bytes) -> str:
-        """Transcribe raw audio bytes."""
-        with NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-            tmp.write(data)
-            tmp.flush()
-            
-            result = self.pipe(tmp.name)
-            text = result.get("text", "")
-            
-            # Post-process for Amharic if needed
-            return self._post_process_amharic_text(text)
+        """Transcribe an in-memory audio file (WAV, webm, ogg, ...)."""
+        return await self.batcher.submit(data)
+
+    async def transcribe_array(self, audio) -> str:
+        """Transcribe mono float32 PCM sampled at ``self.sample_rate``."""
+        return await self.batcher.submit(audio)
+
+    async def _run_batch(self, items):
+        return await inference_executor.run(
+            self.model_name, self._transcribe_batch, items
+        )
+
+    def _transcribe_batch(self, items) -> list:
+        """Blocking batched transcription, run on the inference executor.
+
+        ``items`` are encoded audio files or PCM arrays. Files are decoded
+        in memory and cut into speech segments; the pipeline pads the
+        arrays and runs batched forward passes over all of them. Items
+        without speech never reach the model. An item that cannot be decoded
+        gets its exception as its result, leaving the rest of the batch to
+        be transcribed.
+        """
+        inputs, owners, errors = [], [], {}
+        for index, item in enumerate(items):
+            if isinstance(item, (bytes, bytearray)):
+                try:
+                    segments = self._speech_segments(decode_audio(item, self.sample_rate))
+                except Exception as e:
+                    errors[index] = e
+                    continue
+            else:
+                segments = [item]
+            for segment in segments:
+                inputs.append({"raw": segment, "sampling_rate": self.sample_rate})
+                owners.append(index)
+
+        texts = [[] for _ in items]
+        if inputs:
+            # For Amharic, we might want to preprocess or post-process
+            results = self.pipe(inputs, batch_size=min(len(inputs), max(1, config.asr_batch_size)))
+            for owner, result in zip(owners, results):
+                texts[owner].append(result.get("text", ""))
+
+        # Post-process for Amharic, the whole batch at once
+        transcripts = asr_normalizer.normalize_batch([" ".join(parts) for parts in texts])
+        for index, error in errors.items():
+            transcripts[index] = error
+        return transcripts
+
+    def _speech_segments(self, audio) -> list:
+        """Speech regions of a decoded upload (the whole clip without VAD)."""
+        if self.vad is None:
+            return [audio]
+        return [
+            audio[start:end]
+            for start, end in self.vad.segments(
+                audio,
+                min_silence_ms=config.vad_min_silence_ms,
+                max_segment_s=config.vad_max_segment_s,
+            )
+        ]
             
     def _post_process_amharic_text(self, text: str) -> str:
-        """Post-process transcribed text for better Amharic handling."""
-        if not text:
-            return text
-            
-        # Basic cleanup and normalization for Amharic text
-        text = text.strip()
-        
-        # Remove common transcription artifacts
-        text = text.replace("  ", " ")  # Multiple spaces
-        
-        # Handle common Amharic transcription issues
-        # (These would be refined based on actual model performance)
-        replacements = {
-            # Common mistranscriptions that might occur
-            "saba": "ሳባ",
-            "ethiopia": "ኢትዮጵያ",
-            "amharic": "አማርኛ",
-        }
-        
-        text_lower = text.lower()
-        for eng, amh in replacements.items():
-            if eng in text_lower:
-                # Only replace if the text seems to be mixed language
-                text = text.replace(eng, amh)
-                
-        return text
+        """Post-process transcribed text for better Amharic handling (see ``app.text``)."""
+        return asr_normalizer.normalize(text)
@@ -1,12 +1,27 @@
-from pathlib import Path
+import asyncio
 from tempfile import NamedTemporaryFile
+from typing import AsyncIterator
 
-from TTS.api import TTS
+import numpy as np
 
+from ..audio import float_to_pcm16, wav_header
 from ..config import config
+from ..encoding import audio_encoder
+from ..inference import inference_executor
+from ..registry import module_memory_bytes
+from ..speakers import speaker_registry
+from ..text import split_sentences, tts_normalizer
+from ..tts_cache import tts_cache
+
+# Runtimes a TTS model can be loaded with; see ModelConfig.backend
+TTS_BACKENDS = ("pytorch", "int8")
+
 
 class TTSModel:
-    def __init__(self, model_name: str = None, language: str = "am"):
+    # Runtime of the loaded model; see ModelConfig.backend
+    backend = "pytorch"
+
+    def __init__(self, model_name: str = None, language: str = "am", sample_rate: int = None):
         """Initialize Text-to-Speech model.
         
         Parameters
@@ -15,6 +30,9 @@ class TTSModel:
             TTS model name or path. If None, uses default from config.
         language:
             Language code (default: "am" for Amharic).
+        sample_rate:
+            Output sample rate. If None, taken from the matching model config
+            (and overridden by the loaded synthesizer's own rate).
         """
         if model_name is None:
             model_config = config.tts_models[config.default_tts_model]
@@ -22,7 +40,14 @@ class TTSModel:
             
         self.language = language
         self.model_name = model_name
+        self.sample_rate = sample_rate or next(
+            (cfg.sample_rate for cfg in config.tts_models.values() if cfg.path == model_name),
+            22050,
+        )
         
+        # Imported here so that importing the app does not load Coqui TTS
+        from TTS.api import TTS
+
         # Initialize TTS with Amharic-friendly settings
         try:
             self.tts = TTS(model_name)
@@ -31,6 +56,52 @@ class TTSModel:
             print(f"Failed to load {model_name}, falling back to multilingual model: {e}")
             self.tts = TTS("tts_models/multilingual/multi-dataset/xtts_v2")
 
+        synthesizer = getattr(self.tts, "synthesizer", None)
+        if synthesizer is not None and getattr(synthesizer, "output_sample_rate", None):
+            self.sample_rate = synthesizer.output_sample_rate
+
+        # XTTS can be conditioned directly on registered speakers' latents
+        model = getattr(synthesizer, "tts_model", None)
+        self.xtts = model if hasattr(model, "get_conditioning_latents") else None
+        if self.xtts is not None:
+            self.xtts_language = self._resolve_xtts_language()
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the model weights."""
+        return module_memory_bytes(self.tts)
+
+    def cache_model_id(self) -> str:
+        """Model identity in audio cache keys; each backend sounds slightly different."""
+        return self.model_name if self.backend == "pytorch" else f"{self.model_name}@{self.backend}"
+
+    def _resolve_xtts_language(self) -> str:
+        languages = getattr(self.xtts.config, "languages", None) or []
+        if self.language in languages:
+            return self.language
+        print(f"XTTS has no '{self.language}' support, synthesizing with 'en' pronunciation rules")
+        return "en"
+
+    def speaker_latents(self, speaker: str = None):
+        """Conditioning of a registered speaker, or None."""
+        return speaker_registry.get(self.model_name, speaker) if speaker else None
+
+    def _speaker_cache_id(self, speaker: str = None):
+        """Speaker identity in audio cache keys; re-registering a voice changes it."""
+        latents = speaker_registry.get(self.model_name, speaker) if speaker else None
+        return f"{speaker}@{latents.digest}" if latents is not None else speaker
+
+    def register_speaker_blocking(self, name: str, audio_paths: list):
+        """Compute and store the conditioning of a voice from reference recordings."""
+        name = speaker_registry.validate_name(name)
+        if self.xtts is None:
+            raise ValueError(f"{self.model_name} does not support registered speakers")
+        gpt_cond_latent, speaker_embedding = self.xtts.get_conditioning_latents(audio_path=list(audio_paths))
+        speaker_registry.put(self.model_name, name, gpt_cond_latent, speaker_embedding)
+
+    async def register_speaker(self, name: str, audio_paths: list):
+        """Register a voice on the inference executor (the speaker encoder is a model pass)."""
+        await inference_executor.run(self.model_name, self.register_speaker_blocking, name, audio_paths)
+
     async def synthesize(self, text: str, speaker: str = None) -> str:
         """Synthesize speech from text.
         
@@ -48,61 +119,164 @@ class TTSModel:
         """
         # Preprocess text for better Amharic synthesis
         processed_text = self._preprocess_amharic_text(text)
-        
+        pcm = await self.synthesize_pcm(processed_text, speaker)
+        return self._write_wav(pcm)
+
+    async def synthesize_pcm(self, processed_text: str, speaker: str = None) -> bytes:
+        """Return 16-bit PCM for already preprocessed text, using the cache.
+
+        Cache hits are answered without touching the inference executor
+        (disk hits are read in a worker thread); misses are rendered and
+        stored.
+        """
+        key = tts_cache.make_key(
+            processed_text, self.cache_model_id(), self._speaker_cache_id(speaker), self.language, self.sample_rate
+        )
+        pcm = await tts_cache.aget(key)
+        if pcm is None:
+            audio = await self._synthesize_audio(processed_text, speaker)
+            pcm = float_to_pcm16(audio)
+            await tts_cache.aput(key, pcm)
+        return pcm
+
+    async def _synthesize_audio(self, processed_text: str, speaker: str = None) -> np.ndarray:
+        """Render a waveform on the inference executor."""
+        return await inference_executor.run(
+            self.model_name, self._render, processed_text, speaker
+        )
+
+    async def prewarm(self, text: str, speaker: str = None):
+        """Render ``text`` into the cache, whole and sentence by sentence.
+
+        This covers both the one-shot and the streaming synthesis paths.
+        """
+        processed_text = self._preprocess_amharic_text(text)
+        await self.synthesize_pcm(processed_text, speaker)
+        for sentence in split_sentences(processed_text):
+            await self.synthesize_pcm(sentence, speaker)
+
+    async def synthesize_stream(self, text: str, speaker: str = None) -> AsyncIterator[bytes]:
+        """Synthesize speech sentence by sentence.
+
+        The text is split at Amharic sentence punctuation and the sentences
+        are rendered as a pipeline: while one sentence is being yielded the
+        next one is already synthesising, so the first audio is available
+        after roughly the cost of the first sentence.
+
+        Yields
+        ------
+        bytes:
+            16-bit mono PCM at ``self.sample_rate``, one chunk per sentence.
+        """
+        sentences = split_sentences(self._preprocess_amharic_text(text))
+        if not sentences:
+            return
+
+        def render(sentence):
+            return asyncio.ensure_future(self.synthesize_pcm(sentence, speaker))
+
+        pending = render(sentences[0])
+        try:
+            for index in range(len(sentences)):
+                pcm = await pending
+                if index + 1 < len(sentences):
+                    pending = render(sentences[index + 1])
+                yield pcm
+        finally:
+            if not pending.done():
+                pending.cancel()
+
+    def _variant_key(self, processed_text: str, speaker: str, fmt: str, sample_rate: int = None) -> str:
+        """Cache key of an encoded rendition, stored next to the raw PCM."""
+        key = tts_cache.make_key(
+            processed_text, self.cache_model_id(), self._speaker_cache_id(speaker), self.language, self.sample_rate
+        )
+        return f"{key}-{fmt}-{sample_rate or self.sample_rate}"
+
+    async def synthesize_encoded(self, text: str, fmt: str, speaker: str = None, sample_rate: int = None) -> bytes:
+        """Synthesize ``text`` as a complete file in ``fmt`` (see ``app.encoding``).
+
+        ``sample_rate`` resamples the output (Opus is always 48 kHz).
+        Encoded results are cached like the PCM they were made from.
+        """
+        processed_text = self._preprocess_amharic_text(text)
+        key = self._variant_key(processed_text, speaker, fmt, sample_rate)
+        data = await tts_cache.aget(key)
+        if data is None:
+            pcm = await self.synthesize_pcm(processed_text, speaker)
+            data = await audio_encoder.encode(pcm, self.sample_rate, fmt, sample_rate)
+            await tts_cache.aput(key, data)
+        return data
+
+    async def synthesize_encoded_stream(
+        self, text: str, fmt: str, speaker: str = None, sample_rate: int = None
+    ) -> AsyncIterator[bytes]:
+        """Stream ``text`` in ``fmt``, encoding each sentence as it is synthesized.
+
+        A complete stream is cached, so repeating the request replays it.
+        WAV streams carry an open-ended header and are not cached.
+        """
+        processed_text = self._preprocess_amharic_text(text)
+        key = self._variant_key(processed_text, speaker, fmt, sample_rate)
+        data = await tts_cache.aget(key) if fmt != "wav" else None
+        if data is not None:
+            yield data
+            return
+        parts = []
+        encoded = audio_encoder.encode_stream(
+            self.synthesize_stream(text, speaker), self.sample_rate, fmt, sample_rate
+        )
+        async for chunk in encoded:
+            parts.append(chunk)
+            yield chunk
+        if fmt != "wav":
+            await tts_cache.aput(key, b"".join(parts))
+
+    def _render(self, processed_text: str, speaker: str = None) -> np.ndarray:
+        """Blocking synthesis to an in-memory waveform."""
+        latents = self.speaker_latents(speaker) if self.xtts is not None else None
+        if latents is not None:
+            return self._render_conditioned(processed_text, latents)
+        try:
+            if speaker:
+                wav = self.tts.tts(text=processed_text, speaker=speaker, language=self.language)
+            else:
+                wav = self.tts.tts(text=processed_text, language=self.language)
+        except Exception as e:
+            # If language-specific synthesis fails, try without language specification
+            print(f"Language-specific synthesis failed, trying default: {e}")
+            wav = self.tts.tts(text=processed_text)
+        return np.asarray(wav, dtype=np.float32)
+
+    def _render_conditioned(self, processed_text: str, latents) -> np.ndarray:
+        """XTTS synthesis from precomputed speaker conditioning (``SpeakerLatents``)."""
+        import torch
+
+        with torch.inference_mode():
+            out = self.xtts.inference(
+                processed_text,
+                self.xtts_language,
+                torch.from_numpy(latents.gpt_cond_latent),
+                torch.from_numpy(latents.speaker_embedding),
+                # Sentences are already split by synthesize_stream
+                enable_text_splitting=False,
+            )
+        wav = out["wav"]
+        if hasattr(wav, "cpu"):
+            wav = wav.cpu().numpy()
+        return np.asarray(wav, dtype=np.float32).reshape(-1)
+
+    def _write_wav(self, pcm: bytes) -> str:
+        """Write PCM to a temporary WAV file and return its path."""
         with NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-            try:
-                # For multilingual models, try to specify language
-                if hasattr(self.tts, 'synthesize'):
-                    # Some TTS models support language specification
-                    if speaker:
-                        self.tts.tts_to_file(
-                            text=processed_text, 
-                            file_path=tmp.name,
-                            speaker=speaker,
-                            language=self.language
-                        )
-                    else:
-                        self.tts.tts_to_file(
-                            text=processed_text, 
-                            file_path=tmp.name,
-                            language=self.language
-                        )
-                else:
-                    # Fallback for simpler TTS models
-                    self.tts.tts_to_file(text=processed_text, file_path=tmp.name)
-                    
-            except Exception as e:
-                # If language-specific synthesis fails, try without language specification
-                print(f"Language-specific synthesis failed, trying default: {e}")
-                self.tts.tts_to_file(text=processed_text, file_path=tmp.name)
-                
+            tmp.write(wav_header(self.sample_rate, data_size=len(pcm)))
+            tmp.write(pcm)
         return tmp.name
         
     def _preprocess_amharic_text(self, text: str) -> str:
-        """Preprocess text for better Amharic TTS."""
-        if not text:
-            return text
-            
-        # Basic preprocessing for Amharic text
-        text = text.strip()
-        
-        # Handle mixed language text - extract Amharic parts
-        # For now, just clean up common issues
-        
-        # Remove extra whitespace
-        text = " ".join(text.split())
-        
-        # Handle punctuation for better speech synthesis
-        text = text.replace(".", "።")  # Use Amharic period
-        text = text.replace("?", "፧")  # Use Amharic question mark
-        text = text.replace("!", "፤")  # Use Amharic exclamation
-        
-        # If text contains both Amharic and English, prioritize Amharic
-        # This is a simple heuristic - in production, you'd want better language detection
-        has_amharic = any(ord(char) >= 0x1200 and ord(char) <= 0x137F for char in text)
-        if has_amharic:
-            # Keep only Amharic parts for better synthesis
-            # This is a simplified approach
-            pass
-            
-        return text
+        """Preprocess text for better Amharic TTS.
+
+        Whitespace is collapsed, numbers and abbreviations are spelled out
+        and Latin sentence punctuation becomes Ethiopic (see ``app.text``).
+        """
+        return tts_normalizer.normalize(text)
@@ -0,0 +1,144 @@
+"""XTTS v2 tuned for CPU inference.
+
+Selected with ``backend="int8"`` in a ``tts_models`` entry. The GPT
+decoder, which generates the audio tokens autoregressively and dominates
+synthesis time, runs with int8 dynamically quantized weights; the HiFi-GAN
+vocoder has its weight normalisation folded into the convolutions. Speaker
+conditioning (the GPT conditioning latent and the speaker embedding) is
+computed once per speaker instead of on every request (registered voices
+come from ``app.speakers``), and a warm-up pass at load time keeps one-off
+initialisation out of the first request.
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+import numpy as np
+
+from ..config import config
+from ..registry import state_dict_bytes
+from ..speakers import SpeakerLatents
+from .tts import TTSModel
+
+WARMUP_TEXT = "ሰላም። እንዴት ነዎት፧"
+
+
+def linearize_conv1d(module: Any) -> Any:
+    """Replace GPT-2 ``Conv1D`` layers with equivalent ``nn.Linear`` ones.
+
+    GPT-2 stores its projections as ``Conv1D`` (a transposed Linear), which
+    dynamic quantization does not recognise.
+    """
+    import torch
+    from transformers.pytorch_utils import Conv1D
+
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            linear = torch.nn.Linear(child.weight.shape[0], child.nf)
+            linear.weight.data = child.weight.data.t().contiguous()
+            linear.bias.data = child.bias.data
+            setattr(module, name, linear)
+        else:
+            linearize_conv1d(child)
+    return module
+
+
+def parse_speakers(value: str) -> list:
+    """Speakers listed in ``SABA_TTS_SPEAKERS`` (comma-separated)."""
+    return [speaker.strip() for speaker in (value or "").split(",") if speaker.strip()]
+
+
+class QuantizedXTTSModel(TTSModel):
+    """XTTS v2 with an int8 GPT decoder and cached speaker conditioning.
+
+    Caching, streaming and encoding are inherited from ``TTSModel``; only
+    loading and rendering differ.
+    """
+
+    backend = "int8"
+
+    def __init__(self, model_name: str = None, language: str = "am", sample_rate: int = None, speakers: list = None):
+        if model_name is None:
+            model_name = config.tts_models[config.default_tts_model].path
+
+        self.language = language
+        self.model_name = model_name
+
+        # Imported here so that importing the app does not load Coqui TTS
+        from TTS.api import TTS
+
+        # TTS() resolves and downloads the checkpoint; the model itself is used directly
+        self.tts = TTS(model_name)
+        self.xtts = self.tts.synthesizer.tts_model
+        self._optimize()
+
+        audio_config = getattr(self.xtts.config, "audio", None)
+        self.sample_rate = getattr(audio_config, "output_sample_rate", None) or sample_rate or 24000
+        self.xtts_language = self._resolve_xtts_language()
+
+        # Built-in voices (registered ones are cached by the speaker registry)
+        self._latents: Dict[str, SpeakerLatents] = {}
+        self._lock = threading.Lock()
+        speakers = parse_speakers(config.tts_speakers) if speakers is None else speakers
+        builtin = list(self._builtin_speakers())
+        self.default_speaker = speakers[0] if speakers else (builtin[0] if builtin else None)
+        for speaker in speakers:
+            self.speaker_latents(speaker)
+
+        self._warm_up()
+
+    def _optimize(self):
+        """Quantize the GPT decoder and fold the vocoder's weight norm."""
+        import torch
+
+        self.xtts.eval()
+        # In place, so the inference wrapper built at load time sees the new layers
+        linearize_conv1d(self.xtts.gpt)
+        torch.quantization.quantize_dynamic(self.xtts.gpt, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        vocoder = getattr(getattr(self.xtts, "hifigan_decoder", None), "waveform_decoder", None)
+        try:
+            vocoder.remove_weight_norm()
+        except (AttributeError, ValueError):
+            # No vocoder hook, or already removed when the checkpoint loaded
+            pass
+
+    def _builtin_speakers(self) -> Dict[str, Any]:
+        manager = getattr(self.xtts, "speaker_manager", None)
+        return getattr(manager, "speakers", None) or {}
+
+    def speaker_latents(self, speaker: str = None) -> SpeakerLatents:
+        """Conditioning of a registered voice or a built-in speaker.
+
+        ``speaker`` comes from clients, so it is only ever a name: voices
+        are cloned from audio through the speaker registry, never from a
+        server path.
+        """
+        key = speaker or self.default_speaker
+        latents = super().speaker_latents(key)
+        if latents is not None:
+            return latents
+        with self._lock:
+            latents = self._latents.get(key)
+        if latents is not None:
+            return latents
+
+        builtin = self._builtin_speakers()
+        if key not in builtin:
+            raise ValueError(f"Unknown speaker '{key}'")
+        latents = SpeakerLatents(builtin[key]["gpt_cond_latent"], builtin[key]["speaker_embedding"])
+        with self._lock:
+            self._latents[key] = latents
+        return latents
+
+    def _warm_up(self):
+        started = time.perf_counter()
+        self._render(self._preprocess_amharic_text(WARMUP_TEXT))
+        print(f"Warmed up {self.model_name} (int8) in {time.perf_counter() - started:.2f}s")
+
+    def memory_bytes(self) -> int:
+        return state_dict_bytes(self.xtts)
+
+    def _render(self, processed_text: str, speaker: str = None) -> np.ndarray:
+        """Blocking synthesis with the cached speaker conditioning."""
+        return self._render_conditioned(processed_text, self.speaker_latents(speaker))
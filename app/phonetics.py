@@ -0,0 +1,205 @@
+"""Phonetic keys and fuzzy matching for wake words in Amharic transcripts.
+
+Ge'ez fidel and Latin spellings are both reduced to a compact phonetic key:
+one symbol per consonant class (homophone letters such as ሰ/ሠ or ሀ/ሐ/ኀ/ኸ
+share a class) followed by its vowel, with doubled letters collapsed since
+gemination is not written in fidel. ``ሳባ``, ``saba`` and ``sabba`` all
+become ``saba``.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+from .intents import AhoCorasick
+
+# Consonant class of each 8-letter fidel row, indexed by (codepoint - 0x1200) // 8.
+# Uppercase symbols stand for sounds written with two Latin letters.
+FIDEL_CONSONANTS = [
+    "h", "l", "h", "m", "s", "r", "s", "X",  # ሀ ለ ሐ መ ሠ ረ ሰ ሸ
+    "q", "q", "q", "q", "b", "v", "t", "C",  # ቀ ቈ ቐ ቘ በ ቨ ተ ቸ
+    "h", "h", "n", "N", "", "k", "k", "h",  # ኀ ኈ ነ ኘ አ ከ ኰ ኸ
+    "h", "w", "", "z", "Z", "y", "d", "d",  # ዀ ወ ዐ ዘ ዠ የ ደ ዸ
+    "j", "g", "g", "g", "T", "Q", "P", "S",  # ጀ ገ ጐ ጘ ጠ ጨ ጰ ጸ
+    "S", "f", "p", "",  # ፀ ፈ ፐ
+]
+
+# Vowel of each fidel order; the sixth order is a bare consonant (or ɨ)
+FIDEL_VOWELS = ["e", "u", "i", "a", "e", "", "o", "wa"]
+
+# Latin digraphs mapped onto the same consonant symbols as the fidel rows
+LATIN_DIGRAPHS = [("sh", "X"), ("ch", "C"), ("ny", "N"), ("zh", "Z"), ("ts", "S")]
+LATIN_LETTERS = str.maketrans({"c": "k", "x": "ks", "ä": "e", "é": "e", "ə": "e", "ɨ": ""})
+
+VOWELS = frozenset("aeiou")
+
+# Consonants that ASR output commonly confuses; substituting within a group is cheap
+SIMILAR_CONSONANTS = [set("szSXZ"), set("tdT"), set("kqg"), set("CQj"), set("pPbfv"), set("h")]
+
+TOKEN_PATTERN = re.compile(r"[^\W\d_]+")
+
+
+def _fidel_key(char: str) -> Optional[str]:
+    offset = ord(char) - 0x1200
+    if not 0 <= offset < len(FIDEL_CONSONANTS) * 8:
+        return None
+    return FIDEL_CONSONANTS[offset // 8] + FIDEL_VOWELS[offset % 8]
+
+
+def _latin_key(run: str) -> str:
+    for digraph, symbol in LATIN_DIGRAPHS:
+        run = run.replace(digraph, symbol)
+    return run.translate(LATIN_LETTERS)
+
+
+def phonetic_key(word: str) -> str:
+    """Reduce one word in fidel and/or Latin script to its phonetic key."""
+    parts, latin = [], []
+    for char in word.lower():
+        key = _fidel_key(char)
+        if key is None:
+            latin.append(char)
+            continue
+        if latin:
+            parts.append(_latin_key("".join(latin)))
+            latin = []
+        parts.append(key)
+    if latin:
+        parts.append(_latin_key("".join(latin)))
+    # Gemination and lengthened vowels are not distinctive for matching
+    return re.sub(r"(.)\1+", r"\1", "".join(parts))
+
+
+def _substitution_cost(a: str, b: str) -> float:
+    if a == b:
+        return 0.0
+    if a in VOWELS and b in VOWELS:
+        return 0.5
+    if any(a in group and b in group for group in SIMILAR_CONSONANTS):
+        return 0.5
+    return 1.0
+
+
+def _indel_cost(char: str) -> float:
+    return 0.5 if char in VOWELS or char == "h" else 1.0
+
+
+def weighted_distance(a: str, b: str) -> float:
+    """Edit distance where vowel and similar-consonant edits cost half."""
+    previous = [0.0]
+    for char in b:
+        previous.append(previous[-1] + _indel_cost(char))
+    for char_a in a:
+        current = [previous[0] + _indel_cost(char_a)]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + _indel_cost(char_a),
+                current[j - 1] + _indel_cost(char_b),
+                previous[j - 1] + _substitution_cost(char_a, char_b),
+            ))
+        previous = current
+    return previous[-1]
+
+
+def _deletions(key: str, depth: int) -> Set[str]:
+    """``key`` and every string obtained by deleting up to ``depth`` symbols."""
+    result = {key}
+    frontier = {key}
+    for _ in range(depth):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        result |= frontier
+    return result
+
+
+@dataclass
+class PhoneticMatch:
+    """Best wake-word match found in a text."""
+    confidence: float
+    variant: str
+    token: str
+
+
+class WakeWordMatcher:
+    """Prebuilt index of wake-word variants for fuzzy matching.
+
+    Variants are indexed SymSpell-style: every phonetic key is stored under
+    all strings reachable by deleting up to ``max_deletions`` symbols. A
+    token is looked up through its own deletions, so the work per token
+    depends on the token's length and not on how many variants exist; only
+    the few candidates found are scored with :func:`weighted_distance`.
+    Keys of all variants are also compiled into an Aho-Corasick automaton
+    to spot a variant embedded in a longer word (e.g. with a prefix).
+
+    Confidence is 0.9 for a whole-word match, 0.7 for a match inside a word,
+    and ``0.9 - 0.45 * cost`` for a fuzzy match. The accepted edit cost
+    grows with the variant's length, ``cost_per_symbol`` per symbol up to
+    ``max_cost``: a single edit to a short key such as "saba" mostly lands
+    on another real word ("ሰባ", seventy), so short keys only match exactly.
+    """
+
+    EXACT_CONFIDENCE = 0.9
+    PARTIAL_CONFIDENCE = 0.7
+    COST_PENALTY = 0.45
+
+    def __init__(self, variants: Iterable[str] = (), max_cost: float = 1.0, max_deletions: int = 2,
+                 cost_per_symbol: float = 0.1):
+        self.max_cost = max_cost
+        self.cost_per_symbol = cost_per_symbol
+        self.max_deletions = max_deletions
+        self._variants: Dict[str, str] = {}
+        self._deletes: Dict[str, List[str]] = {}
+        self._substrings = AhoCorasick()
+        for variant in variants:
+            self.add(variant)
+
+    def add(self, variant: str):
+        """Index another spelling of the wake word."""
+        key = phonetic_key(variant.strip())
+        if not key or key in self._variants:
+            return
+        self._variants[key] = variant
+        for deleted in _deletions(key, self.max_deletions):
+            self._deletes.setdefault(deleted, []).append(key)
+        self._substrings.add(key, key)
+
+    @property
+    def variants(self) -> List[str]:
+        return list(self._variants.values())
+
+    def match(self, text: str) -> Optional[PhoneticMatch]:
+        """Return the most confident wake-word match in ``text``, if any."""
+        best: Optional[PhoneticMatch] = None
+        tokens = TOKEN_PATTERN.findall(text)
+        keys = [phonetic_key(token) for token in tokens]
+
+        for token, key in zip(tokens, keys):
+            if key in self._variants:
+                return PhoneticMatch(self.EXACT_CONFIDENCE, self._variants[key], token)
+            match = self._fuzzy(token, key)
+            if match is not None and (best is None or match.confidence > best.confidence):
+                best = match
+
+        if best is None or best.confidence < self.PARTIAL_CONFIDENCE:
+            for token, key in zip(tokens, keys):
+                found = next(self._substrings.find_all(key), None)
+                if found is not None:
+                    return PhoneticMatch(self.PARTIAL_CONFIDENCE, self._variants[found[1]], token)
+        return best
+
+    def allowed_cost(self, key: str) -> float:
+        """Largest edit cost accepted for a fuzzy match against ``key``."""
+        return min(self.max_cost, self.cost_per_symbol * len(key))
+
+    def _fuzzy(self, token: str, key: str) -> Optional[PhoneticMatch]:
+        candidates = set()
+        for deleted in _deletions(key, self.max_deletions):
+            candidates.update(self._deletes.get(deleted, ()))
+        best_cost, best_key = None, None
+        for candidate in candidates:
+            cost = weighted_distance(key, candidate)
+            if cost <= self.allowed_cost(candidate) and (best_cost is None or cost < best_cost):
+                best_cost, best_key = cost, candidate
+        if best_key is None:
+            return None
+        confidence = self.EXACT_CONFIDENCE - self.COST_PENALTY * best_cost
+        return PhoneticMatch(round(confidence, 3), self._variants[best_key], token)
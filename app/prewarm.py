@@ -0,0 +1,85 @@
+"""Background pre-synthesis of the assistant's fixed spoken responses."""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+from .inference import InferenceSaturatedError
+from .skills import skill_manager
+from .wake_word import WAKE_RESPONSE
+
+
+def collect_phrases() -> List[str]:
+    """Every static phrase the assistant can speak, without duplicates."""
+    phrases = skill_manager.static_phrases()
+    if WAKE_RESPONSE not in phrases:
+        phrases.insert(0, WAKE_RESPONSE)
+    return phrases
+
+
+class TTSPrewarmer:
+    """Fills the TTS cache with skill responses without blocking startup.
+
+    Phrases are synthesised one at a time in a background task so user
+    requests keep most of the inference executor; when the executor is
+    saturated the prewarmer backs off and retries.
+    """
+
+    def __init__(self, retry_delay: float = 1.0):
+        self.retry_delay = retry_delay
+        self.state = "idle"
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, tts_service, phrases: List[str] = None) -> asyncio.Task:
+        """Schedule pre-warming on the running event loop."""
+        if phrases is None:
+            phrases = collect_phrases()
+        self._task = asyncio.ensure_future(self.run(tts_service, phrases))
+        return self._task
+
+    async def run(self, tts_service, phrases: List[str]):
+        self.state = "running"
+        self.total = len(phrases)
+        self.done = 0
+        self.failed = 0
+        self.started_at = time.time()
+        for phrase in phrases:
+            while True:
+                try:
+                    await tts_service.prewarm(phrase)
+                    self.done += 1
+                except InferenceSaturatedError:
+                    await asyncio.sleep(self.retry_delay)
+                    continue
+                except Exception as e:
+                    print(f"TTS pre-warm failed for {phrase!r}: {e}")
+                    self.failed += 1
+                break
+        self.finished_at = time.time()
+        self.state = "finished"
+
+    def stop(self):
+        """Cancel pre-warming if it is still running."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            self.state = "cancelled"
+
+    def progress(self) -> Dict[str, Any]:
+        """Progress report for monitoring endpoints."""
+        return {
+            "state": self.state,
+            "total": self.total,
+            "done": self.done,
+            "failed": self.failed,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+# Global TTS pre-warmer instance
+tts_prewarmer = TTSPrewarmer()
@@ -0,0 +1,314 @@
+"""Registry of resident ASR/TTS models with LRU eviction and hot-swap."""
+
+import asyncio
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import ModelConfig
+from .startup import startup_timer
+
+
+class UnknownModelError(KeyError):
+    """Raised when a request names a model that is not configured."""
+
+    def __init__(self, kind: str, name: str):
+        super().__init__(name)
+        self.kind = kind
+        self.name = name
+
+    def __str__(self):
+        return f"Unknown {self.kind} model '{self.name}'"
+
+
+def module_memory_bytes(module: Any) -> int:
+    """Bytes held by the parameters and buffers of a torch module (0 otherwise)."""
+    total = 0
+    for attr in ("parameters", "buffers"):
+        tensors = getattr(module, attr, None)
+        if callable(tensors):
+            try:
+                total += sum(t.numel() * t.element_size() for t in tensors())
+            except Exception:
+                pass
+    return total
+
+
+def state_dict_bytes(module: Any) -> int:
+    """Bytes held by a module's state dict, including packed int8 weights.
+
+    Dynamically quantized layers keep their weights outside ``parameters()``,
+    so ``module_memory_bytes`` undercounts them.
+    """
+    total = 0
+    for value in module.state_dict().values():
+        for tensor in value if isinstance(value, tuple) else (value,):
+            if hasattr(tensor, "element_size"):
+                total += tensor.numel() * tensor.element_size()
+    return total
+
+
+class _Entry:
+    __slots__ = ("name", "model", "config", "memory_bytes", "in_flight", "loaded_at", "last_used")
+
+    def __init__(self, name: str, model: Any, config: ModelConfig, memory_bytes: int):
+        self.name = name
+        self.model = model
+        self.config = config
+        self.memory_bytes = memory_bytes
+        self.in_flight = 0
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+
+
+class ModelRegistry:
+    """Keeps several models of one kind resident under a memory budget.
+
+    Models are built on first use by ``factory(config)``. When the summed
+    size of resident models exceeds ``memory_budget_bytes`` the least
+    recently used idle models are unloaded; models with requests in flight
+    are never evicted. :meth:`swap` loads a replacement next to the current
+    model and switches new requests over atomically, while requests that
+    already hold the old model finish on it.
+
+    A model that is dropped and no longer used has its ``close()`` method
+    called, if it has one; models living in worker processes use it to
+    free the copies held there.
+
+    Before a model is built, idle models are evicted to leave room for it,
+    so peak usage stays within the budget. The size of a model is only
+    known once it has been loaded, so the budget is soft for the first load
+    of each model; a swap also holds the old and new copies side by side
+    until the old one drains.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        factory: Callable[[ModelConfig], Any],
+        models: Dict[str, ModelConfig],
+        default: str,
+        memory_budget_bytes: int = 0,
+    ):
+        self.kind = kind
+        self.factory = factory
+        self.models = dict(models)
+        self.default = default
+        self.memory_budget_bytes = memory_budget_bytes
+
+        self._resident: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._retired: List[_Entry] = []
+        self._lock = threading.RLock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        # Last measured size of each model, to make room before reloading it
+        self._sizes: Dict[str, int] = {}
+
+    def resolve(self, name: Optional[str]) -> str:
+        """Map ``None`` to the default model and validate the name."""
+        name = name or self.default
+        if name not in self.models:
+            raise UnknownModelError(self.kind, name)
+        return name
+
+    def is_loaded(self, name: str = None) -> bool:
+        return self.resolve(name) in self._resident
+
+    def peek(self, name: str = None) -> Optional[Any]:
+        """Return a resident model without loading it."""
+        entry = self._resident.get(self.resolve(name))
+        return entry.model if entry is not None else None
+
+    def add(self, name: str, model: Any):
+        """Register an already constructed model as resident."""
+        with self._lock:
+            self._resident[name] = self._entry(name, model, self.models[name])
+            dropped = self._evict(keep=name)
+        self._close(dropped)
+
+    def get(self, name: str = None) -> Any:
+        """Return the model, loading it if needed (blocking)."""
+        return self._load(self.resolve(name)).model
+
+    def _load(self, name: str) -> _Entry:
+        with self._lock:
+            entry = self._resident.get(name)
+            if entry is not None:
+                self._resident.move_to_end(name)
+                return entry
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # Build outside the registry lock so other models stay usable
+        with load_lock:
+            with self._lock:
+                entry = self._resident.get(name)
+                if entry is not None:
+                    return entry
+                config = self.models[name]
+                dropped = self._evict(keep=name, reserve=self._sizes.get(name, 0))
+            self._close(dropped)
+            model = self._build(name, config)
+            with self._lock:
+                entry = self._entry(name, model, config)
+                self._resident[name] = entry
+                dropped = self._evict(keep=name)
+            self._close(dropped)
+            return entry
+
+    def _build(self, name: str, config: ModelConfig) -> Any:
+        with startup_timer.phase(f"load_{self.kind}:{name}"):
+            return self.factory(config)
+
+    @staticmethod
+    def _estimate(model: Any) -> int:
+        memory_bytes = getattr(model, "memory_bytes", None)
+        return memory_bytes() if callable(memory_bytes) else 0
+
+    def _entry(self, name: str, model: Any, config: ModelConfig) -> _Entry:
+        entry = _Entry(name, model, config, self._estimate(model))
+        self._sizes[name] = entry.memory_bytes
+        return entry
+
+    def _evict(self, keep: str, reserve: int = 0) -> List[_Entry]:
+        """Unload idle least-recently-used models until under budget.
+
+        With ``reserve`` room is left for a model about to be built. Returns
+        the evicted entries, to be closed once the lock is released.
+        """
+        evicted = []
+        if not self.memory_budget_bytes:
+            return evicted
+        for name in list(self._resident):
+            if self._resident_bytes() + reserve <= self.memory_budget_bytes:
+                break
+            entry = self._resident[name]
+            if name == keep or entry.in_flight:
+                continue
+            del self._resident[name]
+            evicted.append(entry)
+            print(f"Evicted {self.kind} model '{name}' to stay within the memory budget")
+        return evicted
+
+    @staticmethod
+    def _close(entries: List[_Entry]):
+        """Release models that were dropped and are no longer in use (blocking)."""
+        for entry in entries:
+            close = getattr(entry.model, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    print(f"Failed to release model '{entry.name}': {e}")
+
+    def _resident_bytes(self) -> int:
+        return sum(e.memory_bytes for e in self._resident.values()) + sum(
+            e.memory_bytes for e in self._retired
+        )
+
+    async def ensure_loaded(self, name: str = None):
+        """Load a model in a worker thread without blocking the event loop."""
+        name = self.resolve(name)
+        if name not in self._resident:
+            await asyncio.to_thread(self._load, name)
+
+    @asynccontextmanager
+    async def use(self, name: str = None):
+        """Hold a model for the duration of one request."""
+        name = self.resolve(name)
+        while True:
+            entry = self._resident.get(name)
+            if entry is None:
+                entry = await asyncio.to_thread(self._load, name)
+            with self._lock:
+                # Evicted, unloaded or swapped out since it was looked up, and
+                # possibly closed already: look it up again
+                if self._resident.get(name) is not entry:
+                    continue
+                entry.in_flight += 1
+                entry.last_used = time.time()
+                self._resident.move_to_end(name)
+                break
+        try:
+            yield entry.model
+        finally:
+            with self._lock:
+                entry.in_flight -= 1
+                drained = entry in self._retired and entry.in_flight == 0
+                if drained:
+                    self._retired.remove(entry)
+            if drained:
+                # The last request on a swapped-out or unloaded model
+                await asyncio.to_thread(self._close, [entry])
+
+    def swap(self, name: str, path: str = None, backend: str = None) -> Any:
+        """Replace a model with a freshly loaded one (blocking).
+
+        With ``path`` the model is switched to a new checkpoint, e.g. a
+        fine-tuned model to A/B against the base one, and with ``backend``
+        to another runtime (e.g. an exported ONNX model). Requests already
+        holding the previous model complete on it.
+        """
+        name = self.resolve(name)
+        with self._lock:
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        # One load or swap of a model at a time, so none of them is lost
+        with load_lock:
+            config = self.models[name]
+            if path:
+                config = dataclasses.replace(config, path=path)
+            if backend:
+                config = dataclasses.replace(config, backend=backend)
+            with self._lock:
+                dropped = self._evict(keep=name, reserve=self._sizes.get(name, 0))
+            self._close(dropped)
+            model = self._build(name, config)
+            with self._lock:
+                self.models[name] = config
+                previous = self._resident.get(name)
+                dropped = []
+                if previous is not None:
+                    if previous.in_flight:
+                        self._retired.append(previous)
+                    else:
+                        dropped.append(previous)
+                self._resident[name] = self._entry(name, model, config)
+                dropped += self._evict(keep=name)
+            self._close(dropped)
+            return model
+
+    def unload(self, name: str) -> bool:
+        """Drop a resident model; returns False if it was not loaded (blocking)."""
+        name = self.resolve(name)
+        with self._lock:
+            entry = self._resident.pop(name, None)
+            if entry is None:
+                return False
+            if entry.in_flight:
+                # Closed when its last request finishes
+                self._retired.append(entry)
+                return True
+        self._close([entry])
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        """Configured models and their residency."""
+        with self._lock:
+            return {
+                "default": self.default,
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "resident_bytes": self._resident_bytes(),
+                "models": {
+                    name: {
+                        "path": config.path,
+                        "backend": config.backend,
+                        "loaded": name in self._resident,
+                        "memory_bytes": self._resident[name].memory_bytes if name in self._resident else 0,
+                        "in_flight": self._resident[name].in_flight if name in self._resident else 0,
+                    }
+                    for name, config in self.models.items()
+                },
+                "draining": len(self._retired),
+            }
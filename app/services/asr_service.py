@@ -1,20 +1,118 @@
 from ..models.asr import ASRModel
-from ..config import config
+from ..config import ModelConfig, config
+from ..longform import LongFormTranscriber
+from ..registry import ModelRegistry
+from ..streaming import StreamingTranscriber
+from ..vad import create_vad
+from ..workers import RemoteASRModel, worker_pool
+
+
+def _build_asr_model(model_config: ModelConfig) -> ASRModel:
+    if worker_pool.enabled:
+        return RemoteASRModel(model_config, worker_pool)
+    return ASRModel(
+        model=model_config.path,
+        language=model_config.language,
+        sample_rate=model_config.sample_rate,
+        backend=model_config.backend,
+    )
+
 
 class ASRService:
     def __init__(self, model: ASRModel = None):
-        if model is None:
-            # Use configured default Amharic model
-            model = ASRModel()
-        self.model = model
+        # Models are built on first use so importing the app stays cheap
+        self.registry = ModelRegistry(
+            "asr",
+            _build_asr_model,
+            config.asr_models,
+            config.default_asr_model,
+            memory_budget_bytes=config.model_memory_budget_mb * 1024 * 1024,
+        )
+        if model is not None:
+            self.registry.add(config.default_asr_model, model)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.registry.is_loaded()
+
+    @property
+    def model(self) -> ASRModel:
+        """The default model (loaded on access)."""
+        return self.registry.get()
+
+    def load(self, model: str = None):
+        """Build a configured model (blocking)."""
+        self.registry.get(model)
+
+    async def ensure_loaded(self, model: str = None):
+        """Load a model in a worker thread without blocking the event loop."""
+        await self.registry.ensure_loaded(model)
+
+    def sample_rate_for(self, model: str = None) -> int:
+        loaded = self.registry.peek(model)
+        if loaded is not None:
+            return loaded.sample_rate
+        return self.registry.models[self.registry.resolve(model)].sample_rate
+
+    @property
+    def sample_rate(self) -> int:
+        return self.sample_rate_for()
+
+    async def transcribe(self, file, model: str = None):
+        async with self.registry.use(model) as asr:
+            return await asr.transcribe(file)
+
+    async def transcribe_bytes(self, data: bytes, model: str = None) -> str:
+        async with self.registry.use(model) as asr:
+            return await asr.transcribe_bytes(data)
+
+    async def transcribe_array(self, audio, model: str = None) -> str:
+        async with self.registry.use(model) as asr:
+            return await asr.transcribe_array(audio)
+
+    async def transcribe_long(self, file, model: str = None, encoding: str = None):
+        """Transcribe a long upload window by window; returns text and segments."""
+        model = self.registry.resolve(model)
+
+        async def transcribe(audio):
+            return await self.transcribe_array(audio, model)
+
+        sample_rate = self.sample_rate_for(model)
+        session = LongFormTranscriber(
+            transcribe,
+            sample_rate=sample_rate,
+            encoding=encoding,
+            window_s=config.long_form_window_s,
+            overlap_s=config.long_form_overlap_s,
+            max_in_flight=config.long_form_parallelism,
+            vad=create_vad(sample_rate) if config.vad_enabled else None,
+        )
+        return await session.transcribe_file(file)
+
+    def create_stream(self, encoding: str = None, model: str = None) -> StreamingTranscriber:
+        """Open a streaming transcription session."""
+        model = self.registry.resolve(model)
+
+        async def transcribe(audio):
+            return await self.transcribe_array(audio, model)
 
-    async def transcribe(self, file):
-        return await self.model.transcribe(file)
+        sample_rate = self.sample_rate_for(model)
+        return StreamingTranscriber(
+            transcribe,
+            sample_rate=sample_rate,
+            encoding=encoding,
+            vad=create_vad(sample_rate) if config.vad_enabled else None,
+        )
 
-    async def transcribe_bytes(self, data: bytes) -> str:
-        return await self.model.transcribe_bytes(data)
+    def stats(self):
+        """Batching statistics of every resident model."""
+        stats = {}
+        for name in self.registry.models:
+            loaded = self.registry.peek(name)
+            if loaded is not None:
+                stats[name] = loaded.batcher.stats()
+        return stats
 
 
-# Initialize with Amharic-optimized model
-asr_model = ASRModel()
-asr_service = ASRService(asr_model)
+# Amharic-optimized model, loaded lazily on first use
+asr_service = ASRService()
@@ -1,17 +1,104 @@
 from ..models.tts import TTSModel
-from ..config import config
+from ..models.xtts import QuantizedXTTSModel
+from ..config import ModelConfig, config
+from ..registry import ModelRegistry
+from ..speakers import speaker_registry
+from ..workers import RemoteTTSModel, worker_pool
+
+
+def _build_tts_model(model_config: ModelConfig) -> TTSModel:
+    if worker_pool.enabled:
+        return RemoteTTSModel(model_config, worker_pool)
+    model_class = QuantizedXTTSModel if model_config.backend == "int8" else TTSModel
+    return model_class(
+        model_name=model_config.path,
+        language=model_config.language,
+        sample_rate=model_config.sample_rate,
+    )
+
 
 class TTSService:
     def __init__(self, model: TTSModel = None):
-        if model is None:
-            # Use configured default Amharic model
-            model = TTSModel()
-        self.model = model
+        # Models are built on first use so importing the app stays cheap
+        self.registry = ModelRegistry(
+            "tts",
+            _build_tts_model,
+            config.tts_models,
+            config.default_tts_model,
+            memory_budget_bytes=config.model_memory_budget_mb * 1024 * 1024,
+        )
+        if model is not None:
+            self.registry.add(config.default_tts_model, model)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.registry.is_loaded()
+
+    @property
+    def model(self) -> TTSModel:
+        """The default model (loaded on access)."""
+        return self.registry.get()
+
+    def load(self, model: str = None):
+        """Build a configured model (blocking)."""
+        self.registry.get(model)
+
+    async def ensure_loaded(self, model: str = None):
+        """Load a model in a worker thread without blocking the event loop."""
+        await self.registry.ensure_loaded(model)
+
+    async def synthesize(self, text: str, speaker: str = None, model: str = None) -> str:
+        async with self.registry.use(model) as tts:
+            return await tts.synthesize(text, speaker)
+
+    async def prewarm(self, text: str, speaker: str = None, model: str = None):
+        async with self.registry.use(model) as tts:
+            await tts.prewarm(text, speaker)
+
+    async def synthesize_stream(self, text: str, speaker: str = None, model: str = None):
+        """Stream 16-bit PCM chunks, one per sentence."""
+        async with self.registry.use(model) as tts:
+            async for chunk in tts.synthesize_stream(text, speaker):
+                yield chunk
+
+    async def synthesize_encoded(self, text: str, fmt: str, speaker: str = None, model: str = None,
+                                 sample_rate: int = None) -> bytes:
+        async with self.registry.use(model) as tts:
+            return await tts.synthesize_encoded(text, fmt, speaker, sample_rate)
+
+    async def synthesize_encoded_stream(self, text: str, fmt: str, speaker: str = None, model: str = None,
+                                        sample_rate: int = None):
+        """Stream ``text`` encoded as ``fmt``, sentence by sentence."""
+        async with self.registry.use(model) as tts:
+            async for chunk in tts.synthesize_encoded_stream(text, fmt, speaker, sample_rate):
+                yield chunk
+
+    async def register_speaker(self, name: str, audio_paths: list, model: str = None):
+        """Compute a voice's conditioning from reference recordings and store it."""
+        async with self.registry.use(model) as tts:
+            await tts.register_speaker(name, audio_paths)
+
+    def list_speakers(self, model: str = None) -> list:
+        return speaker_registry.names(self._model_path(model))
+
+    def remove_speaker(self, name: str, model: str = None) -> bool:
+        return speaker_registry.remove(self._model_path(model), name)
+
+    def _model_path(self, model: str = None) -> str:
+        """Checkpoint path; registered speakers belong to a checkpoint, not a model name."""
+        return self.registry.models[self.registry.resolve(model)].path
+
+    def sample_rate_for(self, model: str = None) -> int:
+        """Output sample rate (the model's own once it is loaded)."""
+        loaded = self.registry.peek(model)
+        if loaded is not None:
+            return loaded.sample_rate
+        return self.registry.models[self.registry.resolve(model)].sample_rate
 
-    async def synthesize(self, text: str, speaker: str = None) -> str:
-        return await self.model.synthesize(text, speaker)
+    @property
+    def sample_rate(self) -> int:
+        return self.sample_rate_for()
 
 
-# Initialize with Amharic-optimized model
-tts_model = TTSModel()
-tts_service = TTSService(tts_model)
+# Amharic-optimized model, loaded lazily on first use
+tts_service = TTSService()
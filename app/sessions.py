@@ -0,0 +1,317 @@
+"""Per-session conversation state with TTL expiry and pluggable storage."""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Set
+
+from .config import config
+
+# Session used when a caller does not identify itself
+DEFAULT_SESSION_ID = "default"
+
+
+class ConversationState:
+    """Manages conversation state and flow."""
+
+    __slots__ = ("is_active", "last_interaction", "context", "session_id")
+
+    def __init__(self, session_id: str = None):
+        self.is_active = False
+        self.last_interaction = None
+        self.context = {}
+        self.session_id = session_id
+
+    def start_conversation(self, session_id: str = None):
+        """Start a new conversation session."""
+        now = time.time()
+        self.is_active = True
+        self.session_id = session_id or self.session_id or f"session_{now}"
+        self.context = {"session_start": now}
+        self.last_interaction = now
+
+    def end_conversation(self):
+        """End the current conversation session."""
+        self.is_active = False
+        self.context = {}
+        self.last_interaction = None
+
+    def update_context(self, key: str, value):
+        """Update conversation context."""
+        self.context[key] = value
+        self.last_interaction = time.time()
+
+    def is_conversation_timeout(self, timeout_seconds: int = 30) -> bool:
+        """Check if conversation has timed out."""
+        if not self.is_active or self.last_interaction is None:
+            return False
+
+        return (time.time() - self.last_interaction) > timeout_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "is_active": self.is_active,
+            "last_interaction": self.last_interaction,
+            "context": self.context,
+            "session_id": self.session_id,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversationState":
+        state = cls(data.get("session_id"))
+        state.is_active = data.get("is_active", False)
+        state.last_interaction = data.get("last_interaction")
+        state.context = data.get("context") or {}
+        return state
+
+
+class ConversationSnapshot(ConversationState):
+    """Read-only copy of a conversation state.
+
+    Changing it raises rather than being silently lost; conversations are
+    changed through :class:`~app.wake_word.VoiceAssistantCore`.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, state: ConversationState) -> "ConversationSnapshot":
+        snapshot = cls.__new__(cls)
+        for name in ConversationState.__slots__:
+            object.__setattr__(snapshot, name, getattr(state, name))
+        object.__setattr__(snapshot, "context", MappingProxyType(dict(state.context)))
+        return snapshot
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError("conversation snapshots are read-only")
+
+
+class TimerWheel:
+    """Hashed timing wheel for session expiry.
+
+    Deadlines are bucketed into ``slots`` slots of ``tick`` seconds, so
+    scheduling and each tick cost O(1) amortised however many sessions
+    exist. Re-scheduling a key simply records the new deadline; stale
+    bucket entries are re-filed when their slot comes round.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 512):
+        self.tick = tick
+        self.slots = slots
+        self._buckets: List[Set[str]] = [set() for _ in range(slots)]
+        self._deadlines: Dict[str, float] = {}
+        self._current = int(time.time() / tick)
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, key: str, deadline: float):
+        """Expire ``key`` at ``deadline`` (replacing any earlier deadline)."""
+        self._deadlines[key] = deadline
+        slot = max(int(deadline / self.tick), self._current + 1)
+        self._buckets[slot % self.slots].add(key)
+
+    def cancel(self, key: str):
+        self._deadlines.pop(key, None)
+
+    def deadline(self, key: str) -> Optional[float]:
+        return self._deadlines.get(key)
+
+    def advance(self, now: float = None) -> List[str]:
+        """Move the wheel to ``now`` and return the keys that expired."""
+        now = time.time() if now is None else now
+        target = int(now / self.tick)
+        expired = []
+        # A full turn visits every bucket, so longer gaps need no more work
+        steps = min(target - self._current, self.slots)
+        for offset in range(1, steps + 1):
+            bucket = self._buckets[(self._current + offset) % self.slots]
+            pending, bucket_keys = [], list(bucket)
+            bucket.clear()
+            for key in bucket_keys:
+                deadline = self._deadlines.get(key)
+                if deadline is None:
+                    continue
+                if deadline <= now:
+                    del self._deadlines[key]
+                    expired.append(key)
+                else:
+                    pending.append((key, deadline))
+            for key, deadline in pending:
+                slot = max(int(deadline / self.tick), target + 1)
+                self._buckets[slot % self.slots].add(key)
+        self._current = max(self._current, target)
+        return expired
+
+
+class SessionStore(ABC):
+    """Storage backend for conversation sessions.
+
+    Event-loop code uses the ``a``-prefixed methods, which run the store
+    in a worker thread when it does blocking I/O.
+    """
+
+    # Whether get/save/delete/expire/count block on I/O
+    blocking = False
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._task: Optional[asyncio.Task] = None
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[ConversationState]:
+        """Return the stored state or None."""
+        pass
+
+    @abstractmethod
+    def save(self, state: ConversationState):
+        """Store ``state`` and push its expiry ``ttl`` seconds into the future."""
+        pass
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        pass
+
+    @abstractmethod
+    def expire(self, now: float = None) -> int:
+        """Drop expired sessions; return how many were removed."""
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        pass
+
+    async def aget(self, session_id: str) -> Optional[ConversationState]:
+        return await self._call(self.get, session_id)
+
+    async def asave(self, state: ConversationState):
+        await self._call(self.save, state)
+
+    async def adelete(self, session_id: str):
+        await self._call(self.delete, session_id)
+
+    async def acount(self) -> int:
+        return await self._call(self.count)
+
+    async def _call(self, function, *args):
+        if not self.blocking:
+            return function(*args)
+        return await asyncio.to_thread(function, *args)
+
+    def start(self, interval: float = 1.0):
+        """Run expiry from a single background ticker on the running loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(interval))
+
+    async def _run(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._call(self.expire)
+            except Exception as e:
+                print(f"Session expiry failed: {e}")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+class MemorySessionStore(SessionStore):
+    """In-process session store (one worker process)."""
+
+    def __init__(self, ttl: float = 30.0, tick: float = 1.0):
+        super().__init__(ttl)
+        self._sessions: Dict[str, ConversationState] = {}
+        self._wheel = TimerWheel(tick=tick)
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[ConversationState]:
+        deadline = self._wheel.deadline(session_id)
+        if deadline is None or deadline <= time.time():
+            # Not stored, or expired before the next wheel tick removed it
+            return None
+        return self._sessions.get(session_id)
+
+    def save(self, state: ConversationState):
+        with self._lock:
+            self._sessions[state.session_id] = state
+            self._wheel.schedule(state.session_id, time.time() + self.ttl)
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._wheel.cancel(session_id)
+
+    def expire(self, now: float = None) -> int:
+        with self._lock:
+            expired = self._wheel.advance(now)
+            for session_id in expired:
+                self._sessions.pop(session_id, None)
+        return len(expired)
+
+    def count(self) -> int:
+        return len(self._sessions)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Session store in a local SQLite file, shared by worker processes."""
+
+    # Queries run on a per-thread connection, off the event loop
+    blocking = True
+
+    def __init__(self, path: str, ttl: float = 30.0):
+        super().__init__(ttl)
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, state TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5.0)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+        return db
+
+    def get(self, session_id: str) -> Optional[ConversationState]:
+        row = self._connection().execute(
+            "SELECT state FROM sessions WHERE session_id = ? AND expires_at > ?",
+            (session_id, time.time()),
+        ).fetchone()
+        return ConversationState.from_dict(json.loads(row[0])) if row else None
+
+    def save(self, state: ConversationState):
+        with self._connection() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, state, expires_at) VALUES (?, ?, ?)",
+                (state.session_id, json.dumps(state.to_dict(), default=str), time.time() + self.ttl),
+            )
+
+    def delete(self, session_id: str):
+        with self._connection() as db:
+            db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def expire(self, now: float = None) -> int:
+        now = time.time() if now is None else now
+        with self._connection() as db:
+            return db.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,)).rowcount
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+def create_session_store() -> SessionStore:
+    """Build the session store selected in the configuration."""
+    if config.session_backend == "sqlite":
+        return SQLiteSessionStore(config.session_db_path, ttl=config.session_ttl)
+    return MemorySessionStore(ttl=config.session_ttl)
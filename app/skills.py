@@ -1,10 +1,12 @@
 """Base skill framework for Saba voice assistant."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Pattern, Sequence
 from dataclasses import dataclass
 import re
 
+from .intents import IntentIndex
+
 
 @dataclass
 class SkillResponse:
@@ -16,15 +18,36 @@ class SkillResponse:
 
 
 class Skill(ABC):
-    """Base class for all Saba skills."""
+    """Base class for all Saba skills.
+
+    Skills declare their triggers in ``keywords`` (substrings) and
+    ``patterns`` (regexes), both matched against the lowercased input, so
+    that SkillManager can compile every skill's triggers into one index.
+    Skills that need the conversation context override ``can_handle``
+    instead and are checked individually.
+    """
+    
+    keywords: Sequence[str] = ()
+    patterns: Sequence[str] = ()
     
     def __init__(self, name: str):
         self.name = name
+        self._compiled_patterns: Optional[Pattern] = None
         
-    @abstractmethod
     def can_handle(self, text: str, context: Dict[str, Any]) -> bool:
         """Check if this skill can handle the given input."""
-        pass
+        text_lower = text.lower()
+        if any(keyword.lower() in text_lower for keyword in self.keywords):
+            return True
+        if not self.patterns:
+            return False
+        if self._compiled_patterns is None:
+            self._compiled_patterns = re.compile("|".join(f"(?:{p})" for p in self.patterns))
+        return self._compiled_patterns.search(text_lower) is not None
+        
+    def is_declarative(self) -> bool:
+        """True if routing only depends on ``keywords`` and ``patterns``."""
+        return type(self).can_handle is Skill.can_handle
         
     @abstractmethod
     async def handle(self, text: str, context: Dict[str, Any]) -> SkillResponse:
@@ -36,65 +59,70 @@ class Skill(ABC):
     def description(self) -> str:
         """Description of what this skill does."""
         pass
+        
+    def static_responses(self) -> List[SkillResponse]:
+        """Fixed responses this skill can return (used to pre-warm TTS)."""
+        return []
 
 
 class WeatherSkill(Skill):
     """Skill for weather-related queries in Amharic."""
     
+    PLACEHOLDER_RESPONSE = SkillResponse(
+        text="ይቅርታ፣ የሰማይ ሁኔታ አገልግሎት አሁንም እየተገነባ ነው። Weather service is still under development.",
+        speech="ይቅርታ፣ የሰማይ ሁኔታ አገልግሎት አሁንም እየተገነባ ነው።"
+    )
+    
+    # Amharic weather keywords
+    keywords = (
+        "ሰማይ", "ዝናብ", "ፀሐይ", "ንፋስ", "ሙቀት", "ቅዝቃዜ",  # weather terms
+        "weather", "rain", "sun", "wind", "temperature", "cold", "hot"
+    )
+    
     def __init__(self):
         super().__init__("weather")
-        # Amharic weather keywords
-        self.weather_keywords = [
-            "ሰማይ", "ዝናብ", "ፀሐይ", "ንፋስ", "ሙቀት", "ቅዝቃዜ",  # weather terms
-            "weather", "rain", "sun", "wind", "temperature", "cold", "hot"
-        ]
-        
-    def can_handle(self, text: str, context: Dict[str, Any]) -> bool:
-        """Check if input is weather-related."""
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in self.weather_keywords)
         
     async def handle(self, text: str, context: Dict[str, Any]) -> SkillResponse:
         """Handle weather queries."""
         # Simple placeholder response in Amharic
-        return SkillResponse(
-            text="ይቅርታ፣ የሰማይ ሁኔታ አገልግሎት አሁንም እየተገነባ ነው። Weather service is still under development.",
-            speech="ይቅርታ፣ የሰማይ ሁኔታ አገልግሎት አሁንም እየተገነባ ነው።"
-        )
+        return self.PLACEHOLDER_RESPONSE
         
     @property
     def description(self) -> str:
         return "Provides weather information in Amharic"
+        
+    def static_responses(self) -> List[SkillResponse]:
+        return [self.PLACEHOLDER_RESPONSE]
 
 
 class GreetingSkill(Skill):
     """Skill for handling greetings in Amharic."""
     
+    RESPONSES = [
+        "ሰላም! እንዴት ነህ? ሳባ እኔ ነኝ፣ የአማርኛ ድምጽ ረዳት። Hello! I'm Saba, your Amharic voice assistant.",
+        "ጤና ይስጥልኝ! ምን ልረዳሽ? Good day! How can I help you?",
+        "ውብ ጠዋት! ሳባ ለአገልግሎትሽ ዝግጁ ነች። Good morning! Saba is ready to serve you."
+    ]
+    
+    patterns = (
+        r"(ሰላም|hello|hi|hey)",
+        r"(እንዴት\s*ነህ|እንዴት\s*ነሽ|how\s*are\s*you)",
+        r"(ጤና\s*ይስጥልኝ|good\s*morning|good\s*afternoon|good\s*evening)",
+        r"(ውብ\s*ጠዋት|good\s*day)",
+    )
+    
     def __init__(self):
         super().__init__("greeting")
-        self.greeting_patterns = [
-            r"(ሰላም|hello|hi|hey)",
-            r"(እንዴት\s*ነህ|እንዴት\s*ነሽ|how\s*are\s*you)",
-            r"(ጤና\s*ይስጥልኝ|good\s*morning|good\s*afternoon|good\s*evening)",
-            r"(ውብ\s*ጠዋት|good\s*day)",
-        ]
-        
-    def can_handle(self, text: str, context: Dict[str, Any]) -> bool:
-        """Check if input is a greeting."""
-        text_lower = text.lower()
-        return any(re.search(pattern, text_lower) for pattern in self.greeting_patterns)
         
     async def handle(self, text: str, context: Dict[str, Any]) -> SkillResponse:
         """Handle greetings."""
-        responses = [
-            "ሰላም! እንዴት ነህ? ሳባ እኔ ነኝ፣ የአማርኛ ድምጽ ረዳት። Hello! I'm Saba, your Amharic voice assistant.",
-            "ጤና ይስጥልኝ! ምን ልረዳሽ? Good day! How can I help you?",
-            "ውብ ጠዋት! ሳባ ለአገልግሎትሽ ዝግጁ ነች። Good morning! Saba is ready to serve you."
-        ]
-        
         # Simple response selection based on time or random
-        response = responses[0]  # Default to first response
+        response = self.RESPONSES[0]  # Default to first response
         
+        return self._make_response(response)
+        
+    @staticmethod
+    def _make_response(response: str) -> SkillResponse:
         return SkillResponse(
             text=response,
             speech=response.split('.')[0]  # Use only Amharic part for speech
@@ -103,53 +131,66 @@ class GreetingSkill(Skill):
     @property
     def description(self) -> str:
         return "Handles greetings and introductions in Amharic"
+        
+    def static_responses(self) -> List[SkillResponse]:
+        return [self._make_response(response) for response in self.RESPONSES]
 
 
 class QuestionAnsweringSkill(Skill):
     """Basic Q&A skill for Amharic."""
     
+    WHO_RESPONSE = SkillResponse(
+        text="ሳባ እኔ ነኝ፣ የአማርኛ ድምጽ ረዳት። I am Saba, an Amharic voice assistant.",
+        speech="ሳባ እኔ ነኝ፣ የአማርኛ ድምጽ ረዳት።"
+    )
+    WHAT_RESPONSE = SkillResponse(
+        text="እኔ የአማርኛ ሰዎችን ድምጽ በመጠቀም ለመርዳት የተሰራሁ ረዳት ነኝ። I am an assistant built to help Amharic speakers using voice.",
+        speech="እኔ የአማርኛ ሰዎችን ድምጽ በመጠቀም ለመርዳት የተሰራሁ ረዳት ነኝ።"
+    )
+    UNKNOWN_RESPONSE = SkillResponse(
+        text="ይቅርታ፣ ያንን ጥያቄ መመለስ አልችልም። እባክሽ እንደገና ሞክሪ። Sorry, I cannot answer that question. Please try again.",
+        speech="ይቅርታ፣ ያንን ጥያቄ መመለስ አልችልም።"
+    )
+    
+    keywords = (
+        "ማን", "ምን", "መቼ", "የት", "እንዴት", "ለምን",  # Amharic question words
+        "what", "who", "when", "where", "how", "why"
+    )
+    # Anything ending in a question mark
+    patterns = (r"\?\s*$",)
+    
     def __init__(self):
         super().__init__("qa")
-        self.qa_keywords = [
-            "ማን", "ምን", "መቼ", "የት", "እንዴት", "ለምን",  # Amharic question words
-            "what", "who", "when", "where", "how", "why"
-        ]
-        
-    def can_handle(self, text: str, context: Dict[str, Any]) -> bool:
-        """Check if input is a question."""
-        text_lower = text.lower()
-        return (any(keyword in text_lower for keyword in self.qa_keywords) or 
-                text.strip().endswith('?'))
         
     async def handle(self, text: str, context: Dict[str, Any]) -> SkillResponse:
         """Handle basic questions."""
         # Simple responses for common questions
         if "ማን" in text or "who" in text.lower():
-            return SkillResponse(
-                text="ሳባ እኔ ነኝ፣ የአማርኛ ድምጽ ረዳት። I am Saba, an Amharic voice assistant.",
-                speech="ሳባ እኔ ነኝ፣ የአማርኛ ድምጽ ረዳት።"
-            )
+            return self.WHO_RESPONSE
         elif "ምን" in text or "what" in text.lower():
-            return SkillResponse(
-                text="እኔ የአማርኛ ሰዎችን ድምጽ በመጠቀም ለመርዳት የተሰራሁ ረዳት ነኝ። I am an assistant built to help Amharic speakers using voice.",
-                speech="እኔ የአማርኛ ሰዎችን ድምጽ በመጠቀም ለመርዳት የተሰራሁ ረዳት ነኝ።"
-            )
+            return self.WHAT_RESPONSE
         else:
-            return SkillResponse(
-                text="ይቅርታ፣ ያንን ጥያቄ መመለስ አልችልም። እባክሽ እንደገና ሞክሪ። Sorry, I cannot answer that question. Please try again.",
-                speech="ይቅርታ፣ ያንን ጥያቄ መመለስ አልችልም።"
-            )
+            return self.UNKNOWN_RESPONSE
             
     @property
     def description(self) -> str:
         return "Answers basic questions in Amharic"
+        
+    def static_responses(self) -> List[SkillResponse]:
+        return [self.WHO_RESPONSE, self.WHAT_RESPONSE, self.UNKNOWN_RESPONSE]
 
 
 class SkillManager:
     """Manages all available skills."""
     
+    FALLBACK_RESPONSE = SkillResponse(
+        text="ይቅርታ፣ ያንን አልተረዳሁም። እባክሽ እንደገና ሞክሪ። Sorry, I didn't understand that. Please try again.",
+        speech="ይቅርታ፣ ያንን አልተረዳሁም።"
+    )
+    
     def __init__(self):
         self.skills: List[Skill] = []
+        self._index: Optional[IntentIndex] = None
         self._register_default_skills()
         
     def _register_default_skills(self):
@@ -163,22 +204,40 @@ class SkillManager:
     def register_skill(self, skill: Skill):
         """Register a new skill."""
         self.skills.append(skill)
+        self._index = None
+        
+    def _get_index(self) -> IntentIndex:
+        """Compile the skills' triggers, rebuilding after registrations."""
+        if self._index is None or self._index.size != len(self.skills):
+            self._index = IntentIndex(self.skills)
+        return self._index
+        
+    def route(self, text: str, context: Optional[Dict[str, Any]] = None) -> Optional[Skill]:
+        """Return the first skill (in registration order) that can handle ``text``."""
+        if context is None:
+            context = {}
+            
+        index = self._get_index()
+        best = index.match(text)
+        # Skills with their own can_handle only matter if they come earlier
+        for position in index.imperative:
+            if best is not None and position > best:
+                break
+            if self.skills[position].can_handle(text, context):
+                return self.skills[position]
+        return self.skills[best] if best is not None else None
         
     async def handle_input(self, text: str, context: Optional[Dict[str, Any]] = None) -> SkillResponse:
         """Find appropriate skill and handle input."""
         if context is None:
             context = {}
             
-        # Try each skill in order
-        for skill in self.skills:
-            if skill.can_handle(text, context):
-                return await skill.handle(text, context)
+        skill = self.route(text, context)
+        if skill is not None:
+            return await skill.handle(text, context)
                 
         # Fallback response
-        return SkillResponse(
-            text="ይቅርታ፣ ያንን አልተረዳሁም። እባክሽ እንደገና ሞክሪ። Sorry, I didn't understand that. Please try again.",
-            speech="ይቅርታ፣ ያንን አልተረዳሁም።"
-        )
+        return self.FALLBACK_RESPONSE
         
     def list_skills(self) -> List[Dict[str, str]]:
         """List all available skills."""
@@ -186,6 +245,15 @@ class SkillManager:
             {"name": skill.name, "description": skill.description}
             for skill in self.skills
         ]
+        
+    def static_phrases(self) -> List[str]:
+        """Every fixed text/speech string the registered skills can return."""
+        phrases = []
+        for response in [r for skill in self.skills for r in skill.static_responses()] + [self.FALLBACK_RESPONSE]:
+            for phrase in (response.text, response.speech):
+                if phrase and phrase not in phrases:
+                    phrases.append(phrase)
+        return phrases
 
 
 # Global skill manager instance
@@ -0,0 +1,128 @@
+"""Registry of XTTS speaker conditioning, computed once and kept on disk."""
+
+import hashlib
+import io
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import config
+
+# Letters (any script), digits, spaces, "-" and "_"; also keeps names safe as file names
+SPEAKER_NAME_PATTERN = re.compile(r"^[\w\- ]{1,64}$")
+
+
+class SpeakerLatents:
+    """Conditioning of one voice: the GPT latent and the speaker embedding."""
+
+    __slots__ = ("gpt_cond_latent", "speaker_embedding", "digest")
+
+    def __init__(self, gpt_cond_latent: Any, speaker_embedding: Any):
+        # Torch tensors from the model are stored as float32 NumPy arrays
+        self.gpt_cond_latent = _to_numpy(gpt_cond_latent)
+        self.speaker_embedding = _to_numpy(speaker_embedding)
+        # Identifies this version of the voice, e.g. in audio cache keys
+        self.digest = hashlib.sha256(
+            self.gpt_cond_latent.tobytes() + self.speaker_embedding.tobytes()
+        ).hexdigest()[:16]
+
+
+def _to_numpy(value: Any) -> np.ndarray:
+    if hasattr(value, "detach"):
+        value = value.detach().cpu().numpy()
+    return np.ascontiguousarray(value, dtype=np.float32)
+
+
+class SpeakerRegistry:
+    """Speaker conditioning latents per model checkpoint.
+
+    Latents are stored as ``<directory>/<model hash>/<name>.npz`` and cached
+    in memory. Each lookup checks the file's modification time, so voices
+    registered or replaced by another process (e.g. a model worker) are
+    picked up without a restart.
+    """
+
+    def __init__(self, directory: str = None):
+        directory = config.speaker_dir if directory is None else directory
+        self.directory = Path(directory).expanduser()
+        # (model, name) -> (mtime, latents)
+        self._entries: Dict[Tuple[str, str], Tuple[float, SpeakerLatents]] = {}
+        self._lock = threading.Lock()
+
+    def _model_dir(self, model: str) -> Path:
+        return self.directory / hashlib.sha256(model.encode("utf-8")).hexdigest()[:16]
+
+    def _path(self, model: str, name: str) -> Path:
+        return self._model_dir(model) / f"{name}.npz"
+
+    @staticmethod
+    def validate_name(name: str) -> str:
+        name = (name or "").strip()
+        if not SPEAKER_NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid speaker name '{name}'")
+        return name
+
+    def put(self, model: str, name: str, gpt_cond_latent: Any, speaker_embedding: Any) -> SpeakerLatents:
+        """Store (or replace) the conditioning of ``name`` for ``model``."""
+        name = self.validate_name(name)
+        latents = SpeakerLatents(gpt_cond_latent, speaker_embedding)
+        buffer = io.BytesIO()
+        np.savez(buffer, gpt_cond_latent=latents.gpt_cond_latent, speaker_embedding=latents.speaker_embedding)
+
+        path = self._path(model, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(buffer.getvalue())
+        os.replace(tmp, path)
+        with self._lock:
+            self._entries[(model, name)] = (path.stat().st_mtime, latents)
+        return latents
+
+    def get(self, model: str, name: str) -> Optional[SpeakerLatents]:
+        """Latents of a registered speaker, or None."""
+        if not name or not SPEAKER_NAME_PATTERN.match(name):
+            return None
+        key = (model, name)
+        path = self._path(model, name)
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with np.load(path) as data:
+            latents = SpeakerLatents(data["gpt_cond_latent"], data["speaker_embedding"])
+        with self._lock:
+            self._entries[key] = (mtime, latents)
+        return latents
+
+    def remove(self, model: str, name: str) -> bool:
+        """Forget a speaker; returns False if it was not registered."""
+        name = self.validate_name(name)
+        with self._lock:
+            self._entries.pop((model, name), None)
+        try:
+            self._path(model, name).unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def names(self, model: str) -> List[str]:
+        """Registered speakers of ``model``."""
+        directory = self._model_dir(model)
+        if not directory.exists():
+            return []
+        return sorted(path.stem for path in directory.glob("*.npz"))
+
+
+# Global speaker registry instance
+speaker_registry = SpeakerRegistry()
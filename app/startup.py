@@ -0,0 +1,65 @@
+"""Startup-time instrumentation for Saba processes.
+
+Run ``python -m app.startup`` to see how importing ``app.main`` breaks down
+by module (using the interpreter's ``-X importtime`` report).
+"""
+
+import re
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+# Recorded when this module is first imported, which app.main does first
+PROCESS_START = time.perf_counter()
+
+
+class StartupTimer:
+    """Records how long each startup phase took."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    def record(self, name: str, seconds: float):
+        self.phases[name] = round(seconds, 4)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the body of a ``with`` block as phase ``name``."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def report(self) -> Dict[str, float]:
+        return dict(self.phases)
+
+
+def import_breakdown(module: str = "app.main", top: int = 15) -> List[Tuple[str, float]]:
+    """Import ``module`` in a fresh interpreter and return the slowest imports.
+
+    Returns ``(module, cumulative_seconds)`` pairs, slowest first.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+\s+\|\s+(\d+)\s+\|\s+(.*)$", line)
+        if match:
+            timings.append((match.group(2).strip(), int(match.group(1)) / 1e6))
+    timings.sort(key=lambda item: item[1], reverse=True)
+    return timings[:top]
+
+
+# Global startup timer instance
+startup_timer = StartupTimer()
+
+
+if __name__ == "__main__":
+    for name, seconds in import_breakdown(*sys.argv[1:2]):
+        print(f"{seconds * 1000:10.1f} ms  {name}")
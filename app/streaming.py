@@ -0,0 +1,182 @@
+"""Streaming speech recognition over a rolling PCM window."""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .audio import PCMRingBuffer, RawPCMDecoder, StreamDecoder, run_decoder
+from .vad import EnergyVAD
+
+# Encodings a client may stream; None lets ffmpeg detect the container
+STREAM_ENCODINGS = ("webm", "ogg", "pcm_s16le")
+
+
+def overlap_length(committed: List[str], words: List[str], max_words: int) -> int:
+    """Length of the longest tail of ``committed`` that starts ``words``."""
+    for n in range(min(max_words, len(committed), len(words)), 0, -1):
+        if committed[-n:] == words[:n]:
+            return n
+    return 0
+
+
+class LocalAgreement:
+    """LocalAgreement-2 stabilisation of successive ASR hypotheses.
+
+    A word is committed once two consecutive hypotheses over the growing
+    window agree on it (longest common prefix). After the window is moved
+    forward the new hypothesis starts inside already committed audio, so
+    the words it shares with the committed tail are skipped.
+    """
+
+    def __init__(self, max_overlap_words: int = 5):
+        self.max_overlap_words = max_overlap_words
+        self.committed: List[str] = []
+        self.unstable: List[str] = []
+        self._previous: List[str] = []
+        self._offset = 0
+        self._fresh_window = True
+
+    def insert(self, words: List[str]) -> List[str]:
+        """Add a hypothesis for the current window; return newly committed words."""
+        if self._fresh_window:
+            self._offset = overlap_length(self.committed, words, self.max_overlap_words)
+            self._previous = []
+            self._fresh_window = False
+
+        new_tail = words[self._offset:]
+        previous_tail = self._previous[self._offset:]
+        agreed = 0
+        for new, old in zip(new_tail, previous_tail):
+            if new != old:
+                break
+            agreed += 1
+
+        newly_committed = new_tail[:agreed]
+        self.committed.extend(newly_committed)
+        self._offset += agreed
+        self._previous = words
+        self.unstable = new_tail[agreed:]
+        return newly_committed
+
+    def new_window(self):
+        """Signal that the audio window has been moved forward."""
+        self._fresh_window = True
+
+    def finish(self) -> List[str]:
+        """Commit whatever is still unstable (end of stream)."""
+        remaining = self.unstable
+        self.committed.extend(remaining)
+        self.unstable = []
+        self._previous = []
+        return remaining
+
+
+class StreamingTranscriber:
+    """Incremental transcription session for one audio stream.
+
+    Encoded chunks are decoded into a PCM ring buffer; every ``step_s`` of
+    new audio the current window (at most ``window_s`` long) is transcribed
+    and stabilised with :class:`LocalAgreement`. When the window is full a
+    ``final`` message is emitted and only the last ``overlap_s`` seconds are
+    kept, so the cost of each decode is bounded by the window size rather
+    than by how long the utterance has run. With a ``vad``, steps whose new
+    audio holds no speech are skipped without calling the model.
+
+    Messages are dictionaries of the form::
+
+        {"type": "partial", "text": "...", "stable": "..."}
+        {"type": "final", "text": "..."}
+    """
+
+    def __init__(
+        self,
+        transcribe: Callable[[np.ndarray], Awaitable[str]],
+        sample_rate: int = 16000,
+        encoding: str = None,
+        step_s: float = 0.5,
+        window_s: float = 15.0,
+        overlap_s: float = 2.0,
+        vad: Optional[EnergyVAD] = None,
+    ):
+        self.transcribe = transcribe
+        self.sample_rate = sample_rate
+        self.step = int(step_s * sample_rate)
+        self.window = int(window_s * sample_rate)
+        self.overlap = int(overlap_s * sample_rate)
+        self.vad = vad
+
+        if encoding == "pcm_s16le":
+            self.decoder = RawPCMDecoder()
+        else:
+            self.decoder = StreamDecoder(sample_rate, input_format=encoding)
+
+        self.buffer = PCMRingBuffer(self.window)
+        self.agreement = LocalAgreement()
+        self._undecoded = 0
+        self._final_index = 0
+
+    async def feed(self, data: bytes) -> List[Dict[str, Any]]:
+        """Add an encoded chunk and return any messages it produced."""
+        await run_decoder(self.decoder, "feed", data)
+        return await self._consume(self.decoder.read())
+
+    async def close(self) -> List[Dict[str, Any]]:
+        """Flush the decoder and emit the last final transcript."""
+        messages = await self._consume(await run_decoder(self.decoder, "close"), force=True)
+        self.agreement.finish()
+        final = self._final_message()
+        if final is not None:
+            messages.append(final)
+        return messages
+
+    async def discard(self):
+        """Stop the decoder without transcribing what is left (client went away)."""
+        await run_decoder(self.decoder, "close")
+
+    async def _consume(self, samples: np.ndarray, force: bool = False) -> List[Dict[str, Any]]:
+        messages = []
+        position = 0
+        while position < len(samples):
+            # Never let a single append overwrite audio that was not decoded yet
+            room = self.window - len(self.buffer)
+            take = samples[position:position + max(room, 1)]
+            position += len(take)
+            self.buffer.append(take)
+            self._undecoded += len(take)
+
+            if len(self.buffer) >= self.window:
+                messages.extend(await self._decode())
+                final = self._final_message()
+                if final is not None:
+                    messages.append(final)
+                self.buffer.discard(len(self.buffer) - self.overlap)
+                self.agreement.new_window()
+            elif self._undecoded >= self.step:
+                messages.extend(await self._decode())
+
+        if force and self._undecoded:
+            messages.extend(await self._decode())
+        return messages
+
+    async def _decode(self) -> List[Dict[str, Any]]:
+        window = self.buffer.get()
+        new_audio = window[len(window) - min(self._undecoded, len(window)):]
+        self._undecoded = 0
+        if self.vad is not None and not self.vad.is_speech(new_audio):
+            # Nothing new was said; the previous hypothesis stands
+            return []
+        text = await self.transcribe(window)
+        self.agreement.insert(text.split())
+        stable = self.agreement.committed[self._final_index:]
+        return [{
+            "type": "partial",
+            "text": " ".join(stable + self.agreement.unstable),
+            "stable": " ".join(stable),
+        }]
+
+    def _final_message(self):
+        words = self.agreement.committed[self._final_index:]
+        if not words:
+            return None
+        self._final_index = len(self.agreement.committed)
+        return {"type": "final", "text": " ".join(words)}
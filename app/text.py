@@ -0,0 +1,291 @@
+"""Amharic text utilities shared by the ASR and TTS paths."""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Ethiopic full stop, question mark and the "!" mapped to ፤ by the TTS
+# preprocessing, plus their Latin counterparts for mixed-language text.
+SENTENCE_END_PATTERN = re.compile(r"(?<=[።፧፤?!.])\s+|(?<=[።፧፤])(?=\S)")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences at Amharic (and Latin) sentence punctuation.
+
+    The punctuation stays attached to its sentence so each piece can be
+    synthesised on its own with natural prosody.
+    """
+    return [part.strip() for part in SENTENCE_END_PATTERN.split(text) if part.strip()]
+
+
+ONES = ["", "አንድ", "ሁለት", "ሦስት", "አራት", "አምስት", "ስድስት", "ሰባት", "ስምንት", "ዘጠኝ"]
+TENS = ["", "አስር", "ሃያ", "ሠላሳ", "አርባ", "ሃምሳ", "ስልሳ", "ሰባ", "ሰማንያ", "ዘጠና"]
+SCALES = [(10 ** 12, "ትሪሊዮን"), (10 ** 9, "ቢሊዮን"), (10 ** 6, "ሚሊዮን"), (1000, "ሺህ")]
+
+# Ge'ez numerals: ፩-፱ (1-9), ፲-፺ (10-90), ፻ (100) and ፼ (10,000)
+GEEZ_DIGITS = {chr(0x1369 + i): i + 1 for i in range(9)}
+GEEZ_DIGITS.update({chr(0x1372 + i): (i + 1) * 10 for i in range(9)})
+
+# Arabic digits with optional thousands separators and decimals, or Ge'ez
+# numerals, after their first character: the lookbehind tells which it was.
+NUMBER_REST = r"(?<=[0-9])[0-9]*(?:,[0-9]{3})*(?:\.[0-9]+)?|(?<=[\u1369-\u137C])[\u1369-\u137C]*"
+# Starting with a single character class lets ``re`` jump to candidate
+# positions instead of trying each alternative at every offset. The group
+# makes ``split`` return the numbers at the odd indices.
+NUMBER_PATTERN = re.compile(rf"([0-9\u1369-\u137C](?:{NUMBER_REST}))")
+
+
+def _spell_below_thousand(n: int) -> List[str]:
+    words = []
+    hundreds, rest = divmod(n, 100)
+    if hundreds:
+        words.append("መቶ" if hundreds == 1 else f"{ONES[hundreds]} መቶ")
+    tens, ones = divmod(rest, 10)
+    if tens:
+        # 11-19 are "አስራ" followed by the unit
+        words.append("አስራ" if tens == 1 and ones else TENS[tens])
+    if ones:
+        words.append(ONES[ones])
+    return words
+
+
+# Words of 0-999, the building block of every other number
+BELOW_THOUSAND = [_spell_below_thousand(n) for n in range(1000)]
+
+
+DIGIT_WORDS = {str(d): ONES[d] if d else "ዜሮ" for d in range(10)}
+
+
+def _read_digits(digits: str) -> str:
+    return " ".join(map(DIGIT_WORDS.__getitem__, digits))
+
+
+def number_to_words(n: int) -> str:
+    """Spell out a non-negative integer in Amharic."""
+    if n == 0:
+        return "ዜሮ"
+    if n >= 1000 * SCALES[0][0]:
+        return _read_digits(str(n))
+    words = []
+    for scale, name in SCALES:
+        count, n = divmod(n, scale)
+        if count:
+            words += BELOW_THOUSAND[count] + [name]
+    return " ".join(words + BELOW_THOUSAND[n])
+
+
+def parse_geez_number(numeral: str) -> int:
+    """Value of a Ge'ez numeral such as ``፲፪፼፴፬፻፶፮`` (123456)."""
+    total = myriad = group = 0
+    for char in numeral:
+        if char == "፻":
+            myriad += (group or 1) * 100
+            group = 0
+        elif char == "፼":
+            value = myriad + group
+            total = total * 10000 if value == 0 and total else (total + (value or 1)) * 10000
+            myriad = group = 0
+        else:
+            group += GEEZ_DIGITS[char]
+    return total + myriad + group
+
+
+@lru_cache(maxsize=16384)
+def _spell_integer(integer: str) -> str:
+    # Leading zeros (phone numbers, codes) are read digit by digit
+    if len(integer) > 1 and integer[0] == "0":
+        return _read_digits(integer)
+    return number_to_words(int(integer))
+
+
+@lru_cache(maxsize=16384)
+def spell_number(number: str) -> str:
+    """Amharic words of one number token matched by ``NUMBER_PATTERN``.
+
+    Cached: years, times and prices recur across texts. Decimals are
+    spelled from the cached integer part, so a new price costs little.
+    """
+    if number[0] not in DIGIT_WORDS:
+        return number_to_words(parse_geez_number(number))
+    integer, _, fraction = number.replace(",", "").partition(".")
+    words = _spell_integer(integer)
+    return f"{words} ነጥብ {_read_digits(fraction)}" if fraction else words
+
+
+def expand_numbers(text: str) -> str:
+    """Replace every number in ``text`` with its Amharic words.
+
+    Splitting and mapping the cached ``spell_number`` over the pieces
+    avoids a Python callback per match, which ``re.sub`` would need.
+    """
+    parts = NUMBER_PATTERN.split(text)
+    if len(parts) == 1:
+        return text
+    parts[1::2] = map(spell_number, parts[1::2])
+    return "".join(parts)
+
+
+def _is_word(char: str) -> bool:
+    """Whether ``re`` counts ``char`` as a word character (``\\w``)."""
+    return char.isalnum() or char == "_"
+
+
+# Separates texts joined for batch normalisation; not whitespace, a letter or punctuation
+BATCH_SEPARATOR = "\x00"
+
+# Words mistranscribed in Latin script by multilingual ASR models
+ASR_LEXICON = {
+    "saba": "ሳባ",
+    "ethiopia": "ኢትዮጵያ",
+    "amharic": "አማርኛ",
+}
+
+# Common abbreviations, expanded before "." becomes a full stop
+TTS_LEXICON = {
+    "ዓ.ም": "ዓመተ ምሕረት",
+    "ዓ.ዓ": "ዓመተ ዓለም",
+    "አ.አ": "አዲስ አበባ",
+    "ት/ቤት": "ትምህርት ቤት",
+    "ዶ/ር": "ዶክተር",
+    "ወ/ሮ": "ወይዘሮ",
+    "ወ/ሪት": "ወይዘሪት",
+    "ጠ/ሚ": "ጠቅላይ ሚኒስትር",
+}
+
+# Latin sentence punctuation read with Ethiopic prosody
+TTS_PUNCTUATION = {".": "።", "?": "፧", "!": "፤"}
+
+
+class TextNormalizer:
+    """Compiled Amharic text normalisation.
+
+    Whitespace is collapsed, numbers (Arabic digits and Ge'ez numerals)
+    are optionally spelled out, lexicon entries are replaced where they are
+    whole words (matched case-insensitively) and punctuation is mapped
+    character by character. ``normalize_batch`` runs the whole batch
+    through each step at once.
+
+    Numbers and lexicon entries are found by one ``split`` (or ``sub``,
+    when there are only entries to replace) with a pattern that starts with
+    a single character class, which is the only kind of regex scan that is
+    cheap on Ethiopic text. An entry is located by its first non-word
+    character (or its first letter), so "ዶ/ር" is only tried at a "/", and a
+    lookbehind checks the letters before it. Everything else uses the
+    substring search of ``str``: text without whitespace other than " "
+    (``str.isprintable``) only has runs of spaces replaced, and punctuation
+    uses one ``str.replace`` per mapped character rather than
+    ``str.translate``, which is an order of magnitude slower on non-Latin
+    text.
+    """
+
+    def __init__(self, lexicon: Dict[str, str] = None, punctuation: Dict[str, str] = None,
+                 expand_numbers: bool = False):
+        self.lexicon = {source.lower(): target for source, target in (lexicon or {}).items()}
+        self.expand_numbers = expand_numbers
+        self.punctuation = dict(punctuation or {})
+        self._punctuation = tuple(self.punctuation.items())
+        # Lexicon entry ending of each token, with the letters that precede it and the replacement
+        self._endings: Dict[str, List[Tuple[str, str]]] = {}
+        first, branches = "", []
+        if expand_numbers:
+            first, branches = "0-9\u1369-\u137C", [NUMBER_REST]
+        # Entries by the character they are located by
+        anchored: Dict[str, List[str]] = {}
+        # Longest first so that no entry shadows a longer one sharing its prefix
+        for entry in sorted(self.lexicon, key=len, reverse=True):
+            # Located by its first non-word character, unless its first word is an entry itself,
+            # which would then be found first; an entry of one word by its first letter
+            split = next((index for index, char in enumerate(entry) if not _is_word(char)), 0)
+            if entry[:split] in self.lexicon:
+                split = 0
+            prefix, ending = entry[:split], entry[split:]
+            # Starting with a literal lets ``re`` reject most candidates at once;
+            # the lookbehind then checks the whole entry and the word boundary
+            anchored.setdefault(ending[0], []).append(rf"{re.escape(ending[1:])}(?<=(?<!\w){re.escape(entry)})")
+            self._endings.setdefault(ending, []).append((prefix, self.lexicon[entry]))
+        if anchored:
+            first += "".join(re.escape(char) for anchor in anchored for char in sorted({anchor, anchor.upper()}))
+            branches.append("(?i:{})(?!\\w)".format("|".join(
+                f"(?<={re.escape(anchor)})(?:{'|'.join(entries)})" for anchor, entries in anchored.items()
+            )))
+        # Cached per normaliser, as the lexicon endings differ; numbers recur across texts
+        self._token_words = lru_cache(maxsize=16384)(self._spell_token)
+        self._whole_entries = bool(self._endings) and not expand_numbers and all(
+            prefix == "" for candidates in self._endings.values() for prefix, _ in candidates
+        )
+        self._fold_case = any(ending != ending.upper() for ending in self._endings)
+        self._token_pattern = re.compile(f"([{first}](?:{'|'.join(branches)}))") if branches else None
+
+    def _replace_entry(self, match: "re.Match") -> str:
+        return self.lexicon[match.group().lower()]
+
+    def _spell_token(self, token: str) -> Optional[str]:
+        """Words of a number token, or None for the ending of a lexicon entry."""
+        if (token.lower() if self._fold_case else token) in self._endings:
+            return None
+        return spell_number(token)
+
+    def _join_tokens(self, parts: List[str]) -> str:
+        """Join text ``split`` by the token pattern, replacing the tokens at its odd indices."""
+        tokens = parts[1::2]
+        if self.expand_numbers:
+            parts[1::2] = map(self._token_words, tokens)
+            try:
+                return "".join(parts)
+            except TypeError:
+                # A None among the words: the text has lexicon entries
+                pass
+        for index in range(1, len(parts), 2):
+            ending = tokens[index // 2]
+            candidates = self._endings.get(ending.lower() if self._fold_case else ending)
+            if candidates is None:
+                continue
+            parts[index] = ending
+            before = parts[index - 1]
+            for prefix, target in candidates:
+                # The pattern matched one of these entries; a longer prefix comes first
+                start = len(before) - len(prefix)
+                if before[start:].lower() == prefix:
+                    parts[index - 1], parts[index] = before[:start], target
+                    break
+        return "".join(parts)
+
+    def _apply(self, text: str, printable: bool) -> str:
+        if not printable:
+            text = " ".join(text.split())
+        else:
+            # Printable text has no whitespace but " ", so only runs of it need collapsing
+            while "  " in text:
+                text = text.replace("  ", " ")
+        if self._whole_entries:
+            # Every token is a whole lexicon entry, which ``sub`` replaces faster than a split and join
+            if self._token_pattern.search(text):
+                text = self._token_pattern.sub(self._replace_entry, text)
+        elif self._token_pattern is not None:
+            parts = self._token_pattern.split(text)
+            if len(parts) > 1:
+                text = self._join_tokens(parts)
+        for source, target in self._punctuation:
+            text = text.replace(source, target)
+        return text
+
+    def normalize(self, text: str) -> str:
+        if not text:
+            return text
+        return self._apply(text, text.isprintable()).strip()
+
+    def normalize_batch(self, texts: List[str]) -> List[str]:
+        """Normalise many strings with one pass of each step over all of them."""
+        if not texts:
+            return []
+        joined = BATCH_SEPARATOR.join(texts)
+        if joined.count(BATCH_SEPARATOR) != len(texts) - 1:
+            # A text contains the separator itself
+            return [self.normalize(text) for text in texts]
+        printable = all(map(str.isprintable, texts))
+        return [text.strip() for text in self._apply(joined, printable).split(BATCH_SEPARATOR)]
+
+
+# Global normaliser instances: transcripts, and text before synthesis
+asr_normalizer = TextNormalizer(lexicon=ASR_LEXICON)
+tts_normalizer = TextNormalizer(lexicon=TTS_LEXICON, punctuation=TTS_PUNCTUATION, expand_numbers=True)
@@ -1,6 +1,25 @@
 import argparse
+import hashlib
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
-from datasets import load_dataset, Audio
+import numpy as np
+import torch
+from datasets import (
+    Array2D,
+    Audio,
+    DatasetDict,
+    Features,
+    IterableDatasetDict,
+    Sequence,
+    Value,
+    load_dataset,
+    load_from_disk,
+)
 from transformers import (
     WhisperForConditionalGeneration,
     WhisperProcessor,
@@ -8,6 +27,11 @@ from transformers import (
     Trainer,
 )
 
+# Bump when prepare_batch changes so stale feature caches are not reused
+PREPROCESS_VERSION = 1
+
+DEFAULT_CACHE_DIR = "~/.cache/saba/asr_features"
+
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Fine-tune a Whisper ASR model")
@@ -18,43 +42,366 @@ def parse_args():
         default="openai/whisper-base",
         help="Model name or path to the base checkpoint",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--num-proc",
+        type=int,
+        default=os.cpu_count(),
+        help="Processes used for feature extraction",
+    )
+    parser.add_argument(
+        "--preprocess-batch-size",
+        type=int,
+        default=32,
+        help="Clips passed to the feature extractor at once",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="Where extracted features are kept between runs",
+    )
+    parser.add_argument(
+        "--overwrite-cache",
+        action="store_true",
+        help="Extract features again even if a cached copy exists",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Stream the dataset and extract features on the fly (requires --max-steps)",
+    )
+    parser.add_argument(
+        "--max-steps",
+        type=int,
+        default=-1,
+        help="Stop after this many optimizer steps (overrides epochs)",
+    )
+    parser.add_argument("--epochs", type=float, default=1, help="Number of training epochs")
+    parser.add_argument("--batch-size", type=int, default=8, help="Clips per device per step")
+    parser.add_argument(
+        "--gradient-accumulation-steps",
+        type=int,
+        default=1,
+        help="Steps whose gradients are summed before each optimizer update",
+    )
+    parser.add_argument("--learning-rate", type=float, default=1e-5)
+    parser.add_argument("--warmup-steps", type=int, default=0)
+    parser.add_argument(
+        "--precision",
+        choices=["auto", "bf16", "fp16", "fp32"],
+        default="auto",
+        help="Mixed precision mode; auto uses bf16 where the GPU or CPU supports it",
+    )
+    parser.add_argument(
+        "--gradient-checkpointing",
+        action="store_true",
+        help="Recompute activations in the backward pass to save memory",
+    )
+    parser.add_argument(
+        "--no-group-by-length",
+        action="store_true",
+        help="Sample batches randomly instead of grouping clips of similar length",
+    )
+    parser.add_argument(
+        "--pad-to-multiple-of",
+        type=int,
+        default=8,
+        help="Round padded label length up to a multiple of this (0 disables)",
+    )
+    parser.add_argument("--threads", type=int, default=0, help="Torch CPU threads (0 = default)")
+    parser.add_argument("--logging-steps", type=int, default=10)
+    args = parser.parse_args()
+    if args.streaming and args.max_steps <= 0:
+        parser.error("--streaming needs --max-steps, the dataset length is unknown")
+    return args
+
+
+def feature_cache_key(dataset_id: str, fingerprints: Dict[str, str], processor: Any, model_name: str) -> str:
+    """Key of a preprocessed dataset.
+
+    Changes whenever the source data (per-split fingerprints), the base
+    model, the feature extractor settings, the tokenizer or the
+    preprocessing code change.
+    """
+    tokenizer = processor.tokenizer
+    parts = [
+        f"v{PREPROCESS_VERSION}",
+        dataset_id,
+        model_name,
+        processor.feature_extractor.to_json_string(),
+        getattr(tokenizer, "name_or_path", ""),
+        str(len(tokenizer)),
+    ]
+    parts.extend(f"{split}={fingerprint}" for split, fingerprint in sorted(fingerprints.items()))
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:32]
+
+
+def feature_schema(processor: Any) -> Features:
+    """Arrow schema of the extracted columns.
+
+    Fixed-shape log-mel arrays are stored as ``Array2D`` so they are read
+    back as NumPy without per-row conversion.
+    """
+    extractor = processor.feature_extractor
+    return Features({
+        "input_features": Array2D(shape=(extractor.feature_size, extractor.nb_max_frames), dtype="float32"),
+        "labels": Sequence(Value("int32")),
+        "input_length": Value("int32"),
+    })
+
+
+def prepare_batch(batch: Dict[str, List], processor: Any) -> Dict[str, Any]:
+    """Extract log-mel features and label IDs for a batch of clips."""
+    audio = batch["audio"]
+    arrays = [clip["array"] for clip in audio]
+    inputs = processor.feature_extractor(
+        arrays, sampling_rate=audio[0]["sampling_rate"], return_tensors="np"
+    )
+    return {
+        "input_features": inputs.input_features.astype("float32"),
+        "labels": processor.tokenizer(batch["text"]).input_ids,
+        "input_length": [len(array) for array in arrays],
+    }
+
+
+def preprocess_dataset(
+    ds,
+    processor: Any,
+    model_name: str,
+    dataset_id: str,
+    num_proc: int = None,
+    batch_size: int = 32,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    overwrite_cache: bool = False,
+):
+    """Turn raw audio/text splits into Whisper training features.
+
+    Streaming datasets are mapped lazily as training consumes them. Other
+    datasets are processed in batches on ``num_proc`` processes and saved
+    under ``cache_dir``; later runs with the same data, model and processor
+    load that copy (memory-mapped) and skip feature extraction.
+    """
+    fn_kwargs = {"processor": processor}
+    if isinstance(ds, IterableDatasetDict):
+        return IterableDatasetDict({
+            name: split.map(
+                prepare_batch,
+                batched=True,
+                batch_size=batch_size,
+                remove_columns=split.column_names or ["audio", "text"],
+                fn_kwargs=fn_kwargs,
+            )
+            for name, split in ds.items()
+        })
+
+    fingerprints = {name: split._fingerprint for name, split in ds.items()}
+    key = feature_cache_key(dataset_id, fingerprints, processor, model_name)
+    path = Path(cache_dir).expanduser() / key
+    if path.exists() and not overwrite_cache:
+        print(f"Loading cached features from {path}")
+        return load_from_disk(str(path))
+
+    features = feature_schema(processor)
+    processed = DatasetDict({
+        name: split.map(
+            prepare_batch,
+            batched=True,
+            batch_size=batch_size,
+            # Rows are ~1 MB of features each; flush to disk per batch
+            writer_batch_size=batch_size,
+            num_proc=num_proc if num_proc and num_proc > 1 else None,
+            remove_columns=split.column_names,
+            features=features,
+            fn_kwargs=fn_kwargs,
+            desc=f"Extracting features ({name})",
+        )
+        for name, split in ds.items()
+    })
+
+    # Write next to the final location and rename, so an interrupted run
+    # never leaves a partial cache behind
+    tmp = path.with_name(f"{key}.{os.getpid()}.tmp")
+    processed.save_to_disk(str(tmp))
+    if path.exists():
+        shutil.rmtree(path)
+    os.replace(tmp, path)
+    print(f"Cached features in {path}")
+    return load_from_disk(str(path))
+
+
+@dataclass
+class SpeechSeq2SeqCollator:
+    """Collates preprocessed clips into a Whisper training batch.
+
+    Log-mel features have a fixed shape and are stacked as is; labels are
+    padded only to the longest sequence in the batch (rounded up to
+    ``pad_to_multiple_of``) with -100 so padding is ignored by the loss.
+    The decoder start token is dropped because the model prepends it when
+    shifting labels right.
+    """
+
+    decoder_start_token_id: int
+    pad_to_multiple_of: Optional[int] = None
+
+    def __call__(self, features: List[Dict[str, Any]]) -> Dict[str, torch.Tensor]:
+        input_features = np.stack([np.asarray(f["input_features"], dtype=np.float32) for f in features])
+
+        labels = [np.asarray(f["labels"], dtype=np.int64) for f in features]
+        if all(len(ids) and ids[0] == self.decoder_start_token_id for ids in labels):
+            labels = [ids[1:] for ids in labels]
+        width = max(len(ids) for ids in labels)
+        if self.pad_to_multiple_of:
+            width = -(-width // self.pad_to_multiple_of) * self.pad_to_multiple_of
+        padded = np.full((len(labels), width), -100, dtype=np.int64)
+        for row, ids in enumerate(labels):
+            padded[row, :len(ids)] = ids
+
+        return {
+            "input_features": torch.from_numpy(input_features),
+            "labels": torch.from_numpy(padded),
+        }
+
+
+def _cpu_supports_bf16() -> bool:
+    """True if the CPU has native bf16 instructions (AVX512-BF16 or AMX)."""
+    checks = ("_is_avx512_bf16_supported", "_is_amx_tile_supported")
+    return any(getattr(torch.cpu, name, lambda: False)() for name in checks)
+
+
+def precision_kwargs(precision: str) -> Dict[str, bool]:
+    """``TrainingArguments`` flags for a ``--precision`` choice.
+
+    ``auto`` picks bf16 on GPUs that support it (fp16 on older ones) and
+    CPU bf16 autocast on CPUs with native bf16 support, otherwise fp32.
+    """
+    cuda = torch.cuda.is_available()
+    if precision == "auto":
+        if cuda:
+            precision = "bf16" if torch.cuda.is_bf16_supported() else "fp16"
+        else:
+            precision = "bf16" if _cpu_supports_bf16() else "fp32"
+    if precision == "bf16":
+        # bf16 without a GPU means CPU autocast
+        return {"bf16": True, "use_cpu": not cuda}
+    if precision == "fp16":
+        return {"fp16": True}
+    return {}
+
+
+def schedule_kwargs(max_steps: int, has_eval: bool) -> Dict[str, Any]:
+    """``TrainingArguments`` evaluation and checkpoint schedule.
+
+    Runs bounded by ``--max-steps`` (always the case when streaming, where
+    there are no epochs to end) evaluate and save every tenth of the run;
+    others at the end of each epoch.
+    """
+    if max_steps > 0:
+        steps = max(1, max_steps // 10)
+        return {
+            "eval_strategy": "steps" if has_eval else "no",
+            "eval_steps": steps,
+            "save_strategy": "steps",
+            "save_steps": steps,
+        }
+    return {"eval_strategy": "epoch" if has_eval else "no", "save_strategy": "epoch"}
+
+
+class ThroughputTrainer(Trainer):
+    """Trainer that adds samples/s and label tokens/s to its training logs.
+
+    Rates cover the steps since the previous log; time spent evaluating is
+    left out.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._reset_throughput()
+
+    def _reset_throughput(self):
+        self._samples = 0
+        self._tokens = 0
+        self._since = time.perf_counter()
+
+    def training_step(self, model, inputs, *args, **kwargs):
+        labels = inputs.get("labels")
+        if labels is not None:
+            self._samples += labels.shape[0]
+            self._tokens += int((labels != -100).sum())
+        return super().training_step(model, inputs, *args, **kwargs)
+
+    def evaluate(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().evaluate(*args, **kwargs)
+        finally:
+            self._since += time.perf_counter() - started
+
+    def log(self, logs: Dict[str, float], *args, **kwargs):
+        if "loss" in logs and self._samples:
+            elapsed = max(time.perf_counter() - self._since, 1e-9)
+            logs["train_samples_per_second"] = round(self._samples / elapsed, 3)
+            logs["train_tokens_per_second"] = round(self._tokens / elapsed, 3)
+            self._reset_throughput()
+        super().log(logs, *args, **kwargs)
 
 
 def main():
     args = parse_args()
 
-    ds = load_dataset(args.dataset)
+    ds = load_dataset(args.dataset, streaming=args.streaming)
     ds = ds.cast_column("audio", Audio(sampling_rate=16000))
 
     processor = WhisperProcessor.from_pretrained(args.model_name)
     model = WhisperForConditionalGeneration.from_pretrained(args.model_name)
 
-    def preprocess(batch):
-        audio = batch["audio"]
-        inputs = processor(
-            audio["array"], sampling_rate=audio["sampling_rate"], return_tensors="pt"
-        )
-        batch["input_features"] = inputs.input_features[0]
-        with processor.as_target_processor():
-            batch["labels"] = processor(batch["text"]).input_ids
-        return batch
+    ds = preprocess_dataset(
+        ds,
+        processor,
+        args.model_name,
+        args.dataset,
+        num_proc=args.num_proc,
+        batch_size=args.preprocess_batch_size,
+        cache_dir=args.cache_dir,
+        overwrite_cache=args.overwrite_cache,
+    )
+    # Hand features to the collator as NumPy arrays instead of nested lists
+    ds = ds.with_format("numpy")
 
-    ds = ds.map(preprocess)
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    if args.gradient_checkpointing:
+        # The decoder cache is useless while training and conflicts with checkpointing
+        model.config.use_cache = False
 
+    has_eval = ds.get("validation") is not None
     training_args = TrainingArguments(
         output_dir=args.output,
-        per_device_train_batch_size=8,
-        per_device_eval_batch_size=8,
-        num_train_epochs=1,
-        evaluation_strategy="epoch",
-        save_strategy="epoch",
-        logging_steps=10,
+        per_device_train_batch_size=args.batch_size,
+        per_device_eval_batch_size=args.batch_size,
+        gradient_accumulation_steps=args.gradient_accumulation_steps,
+        learning_rate=args.learning_rate,
+        warmup_steps=args.warmup_steps,
+        num_train_epochs=args.epochs,
+        max_steps=args.max_steps,
+        gradient_checkpointing=args.gradient_checkpointing,
+        # Streaming datasets have no lengths to group by
+        train_sampling_strategy=(
+            "random" if args.streaming or args.no_group_by_length else "group_by_length"
+        ),
+        length_column_name="input_length",
+        # Keep input_length for the sampler; the collator ignores extra columns
+        remove_unused_columns=False,
+        logging_steps=args.logging_steps,
+        **schedule_kwargs(args.max_steps, has_eval),
+        **precision_kwargs(args.precision),
     )
 
-    trainer = Trainer(
+    trainer = ThroughputTrainer(
         model=model,
         args=training_args,
+        data_collator=SpeechSeq2SeqCollator(
+            decoder_start_token_id=model.config.decoder_start_token_id,
+            pad_to_multiple_of=args.pad_to_multiple_of or None,
+        ),
         train_dataset=ds.get("train"),
         eval_dataset=ds.get("validation"),
     )
@@ -0,0 +1,194 @@
+"""Content-addressed cache of synthesized speech."""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .config import config
+
+
+class TTSCache:
+    """Two-tier LRU cache of rendered PCM keyed on what was synthesised.
+
+    The memory tier holds the most recently used entries up to
+    ``memory_bytes``; the disk tier keeps a larger, size-capped set of
+    files under ``disk_dir`` that survive restarts. Disk hits are promoted
+    back into memory. Passing an empty ``disk_dir`` disables the disk tier.
+
+    ``get``/``put`` block on disk I/O. Event-loop callers use ``aget``/``aput``,
+    which answer from memory on the loop and run disk reads, writes and the
+    first-use index scan in a worker thread. Each tier has its own lock, so
+    the loop never waits for the disk.
+    """
+
+    def __init__(self, memory_bytes: int = None, disk_dir: str = None, disk_bytes: int = None):
+        self.memory_bytes = (
+            config.tts_cache_memory_mb * 1024 * 1024 if memory_bytes is None else memory_bytes
+        )
+        self.disk_bytes = (
+            config.tts_cache_disk_mb * 1024 * 1024 if disk_bytes is None else disk_bytes
+        )
+        disk_dir = config.tts_cache_dir if disk_dir is None else disk_dir
+        self.disk_dir = Path(disk_dir).expanduser() if disk_dir else None
+
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_size = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_size = 0
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+        self._disk_loaded = False
+
+    @staticmethod
+    def make_key(text: str, model: str, speaker: Optional[str], language: str, sample_rate: int) -> str:
+        """Content address for a synthesis request (text must already be normalised)."""
+        payload = json.dumps([text, model, speaker, language, sample_rate], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.pcm"
+
+    def _load_disk_index(self):
+        """Index existing cache files, oldest first, on first use."""
+        self._disk_loaded = True
+        if self.disk_dir is None or not self.disk_dir.exists():
+            return
+        entries = []
+        for path in self.disk_dir.glob("*/*.pcm"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_size += size
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached PCM for ``key`` or None."""
+        data = self._get_memory(key)
+        return data if data is not None else self._get_disk(key)
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        """``get`` for the event loop: a disk read runs in a worker thread."""
+        data = self._get_memory(key)
+        return data if data is not None else await self._off_loop(self._get_disk, key)
+
+    def put(self, key: str, data: bytes):
+        """Store PCM for ``key`` in both tiers."""
+        with self._lock:
+            self._put_memory(key, data)
+        self._put_disk(key, data)
+
+    async def aput(self, key: str, data: bytes):
+        """``put`` for the event loop: the disk write runs in a worker thread."""
+        with self._lock:
+            self._put_memory(key, data)
+        await self._off_loop(self._put_disk, key, data)
+
+    async def _off_loop(self, function, *args):
+        if self.disk_dir is None:
+            # No disk tier, nothing blocks
+            return function(*args)
+        return await asyncio.to_thread(function, *args)
+
+    def _get_memory(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+            return data
+
+    def _get_disk(self, key: str) -> Optional[bytes]:
+        data = None
+        with self._disk_lock:
+            if not self._disk_loaded:
+                self._load_disk_index()
+            if key in self._disk:
+                try:
+                    data = self._path(key).read_bytes()
+                except OSError:
+                    self._disk_size -= self._disk.pop(key)
+                else:
+                    self._disk.move_to_end(key)
+                    self._counters["disk_hits"] += 1
+            if data is None:
+                self._counters["misses"] += 1
+                return None
+        with self._lock:
+            self._put_memory(key, data)
+        return data
+
+    def _put_memory(self, key: str, data: bytes):
+        if len(data) > self.memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_size -= len(self._memory.pop(key))
+        self._memory[key] = data
+        self._memory_size += len(data)
+        while self._memory_size > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+            self._counters["memory_evictions"] += 1
+
+    def _put_disk(self, key: str, data: bytes):
+        if self.disk_dir is None or len(data) > self.disk_bytes:
+            return
+        with self._disk_lock:
+            if not self._disk_loaded:
+                self._load_disk_index()
+            if key not in self._disk:
+                self._write_disk(key, data)
+
+    def _write_disk(self, key: str, data: bytes):
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Failed to write TTS cache entry {key}: {e}")
+            return
+        self._disk[key] = len(data)
+        self._disk_size += len(data)
+        while self._disk_size > self.disk_bytes:
+            evicted, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            self._counters["disk_evictions"] += 1
+            try:
+                self._path(evicted).unlink()
+            except OSError:
+                pass
+
+    def clear(self):
+        """Drop every in-memory entry (disk files are kept)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and tier occupancy."""
+        # The disk figures are read without their lock, which disk I/O holds
+        with self._lock:
+            return dict(
+                self._counters,
+                memory_entries=len(self._memory),
+                memory_bytes=self._memory_size,
+                disk_entries=len(self._disk),
+                disk_bytes=self._disk_size,
+            )
+
+
+# Global TTS cache instance
+tts_cache = TTSCache()
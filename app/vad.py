@@ -0,0 +1,184 @@
+"""Voice activity detection in front of the ASR model.
+
+Most streamed audio is silence; the VAD lets the ASR path trim it, split long
+uploads at pauses and skip silent chunks without running the model.
+"""
+
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .config import config
+
+
+class VADStats:
+    """Counters shared by every VAD instance, reported on /metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checked_seconds = 0.0
+        self.speech_seconds = 0.0
+        self.skipped_chunks = 0
+
+    def record(self, checked_seconds: float, speech_seconds: float, skipped: bool = False):
+        with self._lock:
+            self.checked_seconds += checked_seconds
+            self.speech_seconds += speech_seconds
+            self.skipped_chunks += int(skipped)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Seconds of audio checked, how much was speech, and skipped chunks."""
+        with self._lock:
+            checked, speech, skipped = self.checked_seconds, self.speech_seconds, self.skipped_chunks
+        return {
+            "checked_seconds": round(checked, 3),
+            "speech_seconds": round(speech, 3),
+            "speech_ratio": round(speech / checked, 3) if checked else None,
+            "skipped_chunks": skipped,
+        }
+
+
+class EnergyVAD:
+    """Energy and zero-crossing voice activity detector.
+
+    Audio is cut into ``frame_ms`` frames and every frame is classified at
+    once with NumPy. A frame is speech when its RMS level is above
+    ``threshold_db`` (dBFS), or within ``fricative_margin_db`` of it with a
+    zero-crossing rate above ``zcr_threshold`` (soft fricatives such as
+    "s" or "ሽ" are quiet but noisy). Speech runs shorter than
+    ``min_speech_ms`` are dropped as clicks, and every remaining run is
+    extended by ``hangover_ms`` so word endings and short pauses are kept.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: float = 20.0,
+        threshold_db: float = -40.0,
+        zcr_threshold: float = 0.25,
+        fricative_margin_db: float = 10.0,
+        hangover_ms: float = 300.0,
+        min_speech_ms: float = 60.0,
+        stats: VADStats = None,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_length = max(1, int(sample_rate * frame_ms / 1000))
+        self.threshold_db = threshold_db
+        self.zcr_threshold = zcr_threshold
+        self.fricative_margin_db = fricative_margin_db
+        self.hangover_frames = int(round(hangover_ms / frame_ms))
+        self.min_speech_frames = max(1, int(round(min_speech_ms / frame_ms)))
+        self.stats = stats or VADStats()
+
+    def _frames(self, samples: np.ndarray) -> np.ndarray:
+        count = len(samples) // self.frame_length
+        return np.asarray(samples[:count * self.frame_length], dtype=np.float32).reshape(count, self.frame_length)
+
+    def raw_flags(self, samples: np.ndarray) -> np.ndarray:
+        """Per-frame speech decision before click removal and hangover."""
+        frames = self._frames(samples)
+        if len(frames) == 0:
+            return np.zeros(0, dtype=bool)
+        level_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        crossings = np.count_nonzero(np.diff(np.signbit(frames), axis=1), axis=1) / self.frame_length
+        loud = level_db > self.threshold_db
+        fricative = (level_db > self.threshold_db - self.fricative_margin_db) & (crossings > self.zcr_threshold)
+        return loud | fricative
+
+    def frame_flags(self, samples: np.ndarray) -> np.ndarray:
+        """Per-frame speech flags of ``samples`` (one per ``frame_ms``)."""
+        flags = self.raw_flags(samples)
+        if not flags.any():
+            return flags
+
+        # Drop speech runs shorter than min_speech_frames
+        edges = np.diff(np.concatenate(([0], flags.astype(np.int8), [0])))
+        starts, ends = np.nonzero(edges == 1)[0], np.nonzero(edges == -1)[0]
+        flags = np.zeros_like(flags)
+        for start, end in zip(starts, ends):
+            if end - start >= self.min_speech_frames:
+                flags[start:end] = True
+
+        if self.hangover_frames and flags.any():
+            kernel = np.ones(self.hangover_frames + 1)
+            flags = np.convolve(flags, kernel)[:len(flags)] > 0
+        return flags
+
+    def segments(
+        self,
+        samples: np.ndarray,
+        min_silence_ms: float = 500.0,
+        pad_ms: float = 100.0,
+        max_segment_s: float = None,
+    ) -> List[Tuple[int, int]]:
+        """Speech regions of ``samples`` as ``(start, end)`` sample indices.
+
+        Regions separated by less than ``min_silence_ms`` are merged, each
+        is padded by ``pad_ms`` on both sides, and regions longer than
+        ``max_segment_s`` are cut into pieces of at most that length.
+        """
+        flags = self.frame_flags(samples)
+        self._record(len(samples), int(flags.sum()) * self.frame_length)
+        if not flags.any():
+            return []
+
+        edges = np.diff(np.concatenate(([0], flags.astype(np.int8), [0])))
+        starts = np.nonzero(edges == 1)[0] * self.frame_length
+        ends = np.nonzero(edges == -1)[0] * self.frame_length
+        min_gap = int(self.sample_rate * min_silence_ms / 1000)
+        pad = int(self.sample_rate * pad_ms / 1000)
+
+        merged: List[List[int]] = []
+        for start, end in zip(starts, ends):
+            if merged and start - merged[-1][1] < min_gap:
+                merged[-1][1] = end
+            else:
+                merged.append([start, end])
+
+        regions = []
+        limit = int(self.sample_rate * max_segment_s) if max_segment_s else None
+        for start, end in merged:
+            start, end = max(0, start - pad), min(len(samples), end + pad)
+            step = limit or end - start
+            regions.extend((s, min(s + step, end)) for s in range(start, end, step))
+        return regions
+
+    def trim(self, samples: np.ndarray, pad_ms: float = 100.0) -> np.ndarray:
+        """Cut leading and trailing silence (a view; empty if all silence)."""
+        flags = self.frame_flags(samples)
+        self._record(len(samples), int(flags.sum()) * self.frame_length)
+        speech = np.nonzero(flags)[0]
+        if len(speech) == 0:
+            return samples[:0]
+        pad = int(self.sample_rate * pad_ms / 1000)
+        start = max(0, speech[0] * self.frame_length - pad)
+        end = min(len(samples), (speech[-1] + 1) * self.frame_length + pad)
+        return samples[start:end]
+
+    def is_speech(self, samples: np.ndarray) -> bool:
+        """True if ``samples`` contain any speech."""
+        flags = self.raw_flags(samples)
+        # A run must last min_speech_frames to count
+        runs = np.convolve(flags, np.ones(self.min_speech_frames), mode="valid") if len(flags) else flags
+        found = bool((runs >= self.min_speech_frames).any())
+        self._record(len(samples), len(samples) if found else 0, skipped=not found)
+        return found
+
+    def _record(self, total: int, speech: int, skipped: bool = False):
+        self.stats.record(total / self.sample_rate, speech / self.sample_rate, skipped)
+
+
+# Global VAD statistics
+vad_stats = VADStats()
+
+
+def create_vad(sample_rate: int = 16000) -> EnergyVAD:
+    """Build a VAD from the configuration (sharing the global statistics)."""
+    return EnergyVAD(
+        sample_rate=sample_rate,
+        threshold_db=config.vad_threshold_db,
+        hangover_ms=config.vad_hangover_ms,
+        min_speech_ms=config.vad_min_speech_ms,
+        stats=vad_stats,
+    )
@@ -0,0 +1,280 @@
+"""Streaming voice turns: ASR, skills and TTS overlapped on one websocket."""
+
+import asyncio
+import math
+from typing import List, Optional
+
+import numpy as np
+
+from .audio import decode_audio
+from .config import config
+from .inference import InferenceSaturatedError
+from .services.asr_service import asr_service
+from .services.tts_service import tts_service
+from .vad import EnergyVAD, create_vad
+from .wake_word import voice_assistant
+
+# Input audio format of the voice turn websocket
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2
+
+# Audio kept from before speech was detected, so the first syllable is not lost
+PRE_ROLL_MS = 300
+
+
+class TurnDetector:
+    """Tracks when the user starts and stops talking.
+
+    Chunks of any size are cut into VAD frames (leftover samples are carried
+    over). Speech starts after ``min_speech_frames`` consecutive speech
+    frames and ends after ``end_silence_ms`` without any.
+    """
+
+    def __init__(self, vad: EnergyVAD, end_silence_ms: float = 700.0):
+        self.vad = vad
+        self.frame_ms = vad.frame_length * 1000.0 / vad.sample_rate
+        self.end_silence_frames = max(1, math.ceil(end_silence_ms / self.frame_ms))
+        self.in_speech = False
+        self._speech_run = 0
+        self._silence_run = 0
+        self._pending = np.zeros(0, dtype=np.float32)
+
+    @property
+    def silence_ms(self) -> float:
+        """How long it has been quiet (0 while the user is talking)."""
+        return self._silence_run * self.frame_ms
+
+    def process(self, samples: np.ndarray) -> List[str]:
+        """Consume PCM and return the ``start``/``end`` events it contains."""
+        samples = np.concatenate([self._pending, samples])
+        usable = len(samples) - len(samples) % self.vad.frame_length
+        self._pending = samples[usable:]
+        events = []
+        for speech in self.vad.raw_flags(samples[:usable]):
+            if speech:
+                self._speech_run += 1
+                self._silence_run = 0
+                if not self.in_speech and self._speech_run >= self.vad.min_speech_frames:
+                    self.in_speech = True
+                    events.append("start")
+            else:
+                self._speech_run = 0
+                self._silence_run += 1
+                if self.in_speech and self._silence_run >= self.end_silence_frames:
+                    self.in_speech = False
+                    events.append("end")
+        return events
+
+
+class VoiceTurnSession:
+    """One voice conversation over a websocket, with the stages overlapped.
+
+    Incoming 16 kHz PCM is watched by a :class:`TurnDetector`. When the user
+    starts talking the audio is streamed to the ASR model (``partial`` and
+    ``final`` messages are forwarded); when they stop, the turn is answered
+    in the background while audio keeps being read:
+
+    - Once the user pauses (``speculate_silence_ms``) the current transcript
+      is routed to a skill and its first sentence synthesised speculatively.
+      If the turn ends with the same transcript the reply is already under
+      way; otherwise the speculation is dropped.
+    - The reply is synthesised sentence by sentence, and every sentence is
+      sent as a binary PCM frame as soon as it is ready while the next one
+      renders.
+    - If the user starts talking again before the reply is finished
+      (barge-in), the remaining synthesis is cancelled and a new turn begins.
+
+    Messages sent besides the ASR ones::
+
+        {"type": "turn", "transcript": "..."}
+        {"type": "response", "transcript": "...", "text": "...", "encoding": "pcm_s16le", "sample_rate": 22050}
+        {"type": "response_end"}
+        {"type": "barge_in"}
+        {"type": "error", "detail": "..."}
+
+    ``text`` is None (and no audio follows) when nothing needed an answer,
+    e.g. before the wake word.
+    """
+
+    def __init__(
+        self,
+        ws,
+        session_id: str,
+        asr_model: str = None,
+        tts_model: str = None,
+        speaker: str = None,
+        assistant=None,
+        asr=None,
+        tts=None,
+        vad: EnergyVAD = None,
+        end_silence_ms: float = None,
+        speculate_silence_ms: float = None,
+    ):
+        self.ws = ws
+        self.session_id = session_id
+        self.asr_model = asr_model
+        self.tts_model = tts_model
+        self.speaker = speaker
+        self.assistant = assistant or voice_assistant
+        self.asr = asr or asr_service
+        self.tts = tts or tts_service
+        self.turns = TurnDetector(
+            vad or create_vad(SAMPLE_RATE),
+            config.voice_end_silence_ms if end_silence_ms is None else end_silence_ms,
+        )
+        self.speculate_silence_ms = (
+            config.voice_speculate_silence_ms if speculate_silence_ms is None else speculate_silence_ms
+        )
+
+        self._pre_roll = b""
+        self._pre_roll_bytes = int(SAMPLE_RATE * PRE_ROLL_MS / 1000) * BYTES_PER_SAMPLE
+        self._transcriber = None
+        self._finals: List[str] = []
+        self._partial = ""
+        self._speculation: Optional[asyncio.Task] = None
+        self._speculated_text = None
+        self._response: Optional[asyncio.Task] = None
+
+    @property
+    def responding(self) -> bool:
+        return self._response is not None and not self._response.done()
+
+    async def feed(self, data: bytes):
+        """Handle one binary frame of 16-bit mono PCM."""
+        self._pre_roll = (self._pre_roll + data)[-self._pre_roll_bytes:]
+        events = self.turns.process(decode_audio(data, SAMPLE_RATE, encoding="pcm_s16le"))
+
+        if self._transcriber is not None:
+            await self._forward(await self._transcriber.feed(data))
+        if "start" in events and self._transcriber is None:
+            await self._start_turn()
+        if "end" in events and self._transcriber is not None:
+            await self.end_turn()
+        elif self._transcriber is not None and self.turns.silence_ms >= self.speculate_silence_ms:
+            self._speculate(self._transcript())
+
+    async def end_turn(self):
+        """Finish the current turn and start answering it."""
+        if self._transcriber is None:
+            return
+        transcriber, self._transcriber = self._transcriber, None
+        await self._forward(await transcriber.close())
+        transcript = self._transcript()
+        self._finals, self._partial = [], ""
+        await self.ws.send_json({"type": "turn", "transcript": transcript})
+        if transcript:
+            self._response = asyncio.ensure_future(self._respond(transcript))
+        else:
+            await self._drop_speculation()
+
+    async def close(self):
+        """Stop any work still running for this connection."""
+        await self._drop_speculation()
+        if self._response is not None:
+            self._response.cancel()
+            await asyncio.gather(self._response, return_exceptions=True)
+        self._transcriber = None
+
+    async def _start_turn(self):
+        if self.responding:
+            # Barge-in: the user talks over the reply
+            self._response.cancel()
+            await asyncio.gather(self._response, return_exceptions=True)
+            await self.ws.send_json({"type": "barge_in"})
+        self._transcriber = self.asr.create_stream("pcm_s16le", self.asr_model)
+        await self._forward(await self._transcriber.feed(self._pre_roll))
+
+    async def _forward(self, messages: List[dict]):
+        for message in messages:
+            if message["type"] == "final":
+                self._finals.append(message["text"])
+                self._partial = ""
+            elif message["type"] == "partial":
+                self._partial = message["text"]
+            await self.ws.send_json(message)
+
+    def _transcript(self) -> str:
+        return " ".join(self._finals + [self._partial]).strip()
+
+    def _speculate(self, text: str):
+        if not text or text == self._speculated_text:
+            return
+        if self._speculation is not None:
+            asyncio.ensure_future(self._discard(self._speculation))
+        self._speculated_text = text
+        self._speculation = asyncio.ensure_future(self._prepare(text))
+
+    async def _prepare(self, text: str):
+        """Route ``text`` and render the first sentence of the reply."""
+        response = await self.assistant.prepare_response(text, self.session_id)
+        if response is None:
+            return None, None, None
+        stream = self.tts.synthesize_stream(response.text, self.speaker, self.tts_model)
+        try:
+            first = await stream.__anext__()
+        except StopAsyncIteration:
+            first = None
+        return response, stream, first
+
+    async def _take_speculation(self, transcript: str):
+        """Prepared reply for ``transcript``, if the speculation guessed it."""
+        speculation, text = self._speculation, self._speculated_text
+        self._speculation, self._speculated_text = None, None
+        if speculation is None:
+            return None
+        if text != transcript:
+            await self._discard(speculation)
+            return None
+        try:
+            return await speculation
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Speculative response failed, answering normally: {e}")
+            return None
+
+    async def _drop_speculation(self):
+        speculation, self._speculation, self._speculated_text = self._speculation, None, None
+        if speculation is not None:
+            await self._discard(speculation)
+
+    @staticmethod
+    async def _discard(speculation: asyncio.Task):
+        speculation.cancel()
+        results = await asyncio.gather(speculation, return_exceptions=True)
+        if isinstance(results[0], tuple) and results[0][1] is not None:
+            await results[0][1].aclose()
+
+    async def _respond(self, transcript: str):
+        prepared = await self._take_speculation(transcript)
+        response, stream, first = prepared or (None, None, None)
+        try:
+            text = await self.assistant.process_voice_input(transcript, self.session_id, prepared=response)
+            message: dict = {"type": "response", "transcript": transcript, "text": text}
+            if text is None:
+                await self.ws.send_json(message)
+                return
+            if response is None or response.text != text:
+                if stream is not None:
+                    await stream.aclose()
+                stream, first = self.tts.synthesize_stream(text, self.speaker, self.tts_model), None
+            await self.tts.ensure_loaded(self.tts_model)
+            message.update(encoding="pcm_s16le", sample_rate=self.tts.sample_rate_for(self.tts_model))
+            await self.ws.send_json(message)
+            if first is not None:
+                await self.ws.send_bytes(first)
+            async for chunk in stream:
+                await self.ws.send_bytes(chunk)
+            await self.ws.send_json({"type": "response_end"})
+        except InferenceSaturatedError as e:
+            await self.ws.send_json({"type": "error", "detail": str(e)})
+        except Exception as e:
+            # Nothing awaits this task, so report the failure to the client here
+            print(f"Voice response failed: {e}")
+            try:
+                await self.ws.send_json({"type": "error", "detail": f"Response failed: {str(e)}"})
+            except Exception:
+                pass  # the connection itself is gone
+        finally:
+            if stream is not None:
+                await stream.aclose()
@@ -3,9 +3,21 @@
 import asyncio
 from typing import Callable, Optional
 from dataclasses import dataclass
-import re
 
+from .audio import decode_audio
 from .config import config
+from .kws import KeywordSpotter, KeywordStream
+from .phonetics import WakeWordMatcher
+from .sessions import (
+    DEFAULT_SESSION_ID,
+    ConversationSnapshot,
+    ConversationState,
+    SessionStore,
+    create_session_store,
+)
+
+# Reply spoken when the wake word opens a conversation
+WAKE_RESPONSE = "ሰላም! እንዴት ልረዳሽ? Hello! How can I help you?"
 
 
 @dataclass
@@ -17,7 +29,13 @@ class WakeWordEvent:
 
 
 class WakeWordDetector:
-    """Simple wake word detector for Saba."""
+    """Simple wake word detector for Saba.
+
+    Transcripts are matched phonetically against a prebuilt index of wake
+    word variants, so ASR spellings such as "sabba" or "ሣባ" still count.
+    Raw audio is checked by a lightweight keyword spotter against recorded
+    templates of the wake word, without running the ASR model.
+    """
     
     def __init__(self, wake_word: str = None, threshold: float = None):
         self.wake_word = wake_word or config.wake_word
@@ -25,13 +43,32 @@ class WakeWordDetector:
         self.is_listening = False
         self.callbacks = []
         
-        # Simple pattern matching for wake word variants
+        # Wake word variants
         self.wake_patterns = [
             self.wake_word,  # Exact match
             "ሳባ",  # Amharic "Saba"
             "saba",  # Latin "saba"
             "ሳባን",  # Amharic with object marker
         ]
+        self.matcher = WakeWordMatcher(
+            self.wake_patterns,
+            max_cost=config.wake_word_max_cost,
+            cost_per_symbol=config.wake_word_cost_per_symbol,
+        )
+        
+        # Keyword spotter for raw audio; disabled until templates are recorded
+        self.spotter = KeywordSpotter.from_directory(
+            config.kws_template_dir,
+            threshold=config.kws_threshold,
+            refractory_s=config.kws_refractory_s,
+        )
+        self._audio_stream: Optional[KeywordStream] = None
+        self.last_event: Optional[WakeWordEvent] = None
+        
+    def add_variant(self, variant: str):
+        """Accept another spelling of the wake word."""
+        self.wake_patterns.append(variant)
+        self.matcher.add(variant)
         
     def add_callback(self, callback: Callable[[WakeWordEvent], None]):
         """Add a callback to be called when wake word is detected."""
@@ -44,32 +81,22 @@ class WakeWordDetector:
             
     async def detect_in_text(self, text: str) -> bool:
         """Detect wake word in transcribed text."""
-        text_lower = text.lower().strip()
-        
-        # Check for wake word patterns
-        for pattern in self.wake_patterns:
-            if pattern.lower() in text_lower:
-                confidence = self._calculate_confidence(text_lower, pattern.lower())
-                if confidence >= self.threshold:
-                    event = WakeWordEvent(confidence=confidence, timestamp=asyncio.get_event_loop().time())
-                    await self._trigger_callbacks(event)
-                    return True
+        confidence = self.confidence(text)
+        if confidence >= self.threshold:
+            event = WakeWordEvent(confidence=confidence, timestamp=asyncio.get_event_loop().time())
+            await self._trigger_callbacks(event)
+            return True
                     
         return False
         
-    def _calculate_confidence(self, text: str, pattern: str) -> float:
-        """Calculate confidence score for wake word detection."""
-        # Simple confidence based on exact match and context
-        if pattern in text:
-            # Higher confidence for exact word boundaries
-            if re.search(rf'\b{re.escape(pattern)}\b', text):
-                return 0.9
-            # Lower confidence for partial matches
-            return 0.7
-        return 0.0
+    def confidence(self, text: str) -> float:
+        """Confidence that ``text`` contains the wake word (0.0 if not found)."""
+        match = self.matcher.match(text)
+        return match.confidence if match is not None else 0.0
         
     async def _trigger_callbacks(self, event: WakeWordEvent):
         """Trigger all registered callbacks."""
+        self.last_event = event
         for callback in self.callbacks:
             try:
                 if asyncio.iscoroutinefunction(callback):
@@ -88,69 +115,78 @@ class WakeWordDetector:
         """Stop listening for wake word."""
         self.is_listening = False
         
-    async def process_audio_stream(self, audio_data: bytes) -> bool:
-        """Process audio stream for wake word detection."""
-        if not self.is_listening:
+    async def process_audio_stream(self, audio_data: bytes, stream: KeywordStream = None) -> bool:
+        """Process audio stream for wake word detection.
+        
+        ``audio_data`` is 16-bit mono PCM at the spotter's sample rate
+        (16 kHz). Pass a ``stream`` from ``self.spotter.stream()`` per audio
+        source; without one a shared stream is used.
+        """
+        if not self.is_listening or not self.spotter.enabled:
             return False
             
-        # For now, this is a placeholder - in a real implementation,
-        # this would use an ASR model to transcribe the audio first
-        # and then check for wake words
-        
-        # Placeholder: assume audio processing happens elsewhere
-        # and we just check if we should be listening
-        return False
-
-
-class ConversationState:
-    """Manages conversation state and flow."""
-    
-    def __init__(self):
-        self.is_active = False
-        self.last_interaction = None
-        self.context = {}
-        self.session_id = None
-        
-    def start_conversation(self, session_id: str = None):
-        """Start a new conversation session."""
-        self.is_active = True
-        self.session_id = session_id or f"session_{asyncio.get_event_loop().time()}"
-        self.context = {"session_start": asyncio.get_event_loop().time()}
-        self.last_interaction = asyncio.get_event_loop().time()
-        
-    def end_conversation(self):
-        """End the current conversation session."""
-        self.is_active = False
-        self.context = {}
-        self.session_id = None
-        self.last_interaction = None
-        
-    def update_context(self, key: str, value):
-        """Update conversation context."""
-        self.context[key] = value
-        self.last_interaction = asyncio.get_event_loop().time()
-        
-    def is_conversation_timeout(self, timeout_seconds: int = 30) -> bool:
-        """Check if conversation has timed out."""
-        if not self.is_active or self.last_interaction is None:
+        if stream is None:
+            if self._audio_stream is None:
+                self._audio_stream = self.spotter.stream()
+            stream = self._audio_stream
+            
+        samples = decode_audio(audio_data, self.spotter.extractor.sample_rate, encoding="pcm_s16le")
+        detection = stream.process(samples)
+        if detection is None:
             return False
             
-        current_time = asyncio.get_event_loop().time()
-        return (current_time - self.last_interaction) > timeout_seconds
+        event = WakeWordEvent(
+            confidence=detection.confidence,
+            timestamp=asyncio.get_event_loop().time(),
+            audio_data=audio_data,
+        )
+        await self._trigger_callbacks(event)
+        return True
 
 
 class VoiceAssistantCore:
-    """Core voice assistant functionality combining wake word detection and conversation."""
+    """Core voice assistant functionality combining wake word detection and conversation.
+
+    Conversation state is kept per session ID in a :class:`SessionStore`, so
+    concurrent users each get their own conversation. The session methods
+    are coroutines so that a store doing I/O stays off the event loop.
+    """
     
-    def __init__(self):
+    def __init__(self, sessions: SessionStore = None):
         self.wake_detector = WakeWordDetector()
-        self.conversation = ConversationState()
+        self.sessions = sessions or create_session_store()
         self.wake_detector.add_callback(self._on_wake_word_detected)
         
+    @property
+    def conversation(self) -> ConversationSnapshot:
+        """Read-only snapshot of the default (anonymous) session's conversation.
+
+        Reads the store directly; async code uses :meth:`get_session`.
+        """
+        state = self.sessions.get(DEFAULT_SESSION_ID) or ConversationState(DEFAULT_SESSION_ID)
+        return ConversationSnapshot.of(state)
+        
+    async def get_session(self, session_id: str = DEFAULT_SESSION_ID) -> ConversationState:
+        """Return the conversation state for ``session_id`` (inactive if unknown).
+
+        Changes to it last only once passed to the store's ``asave``.
+        """
+        return await self.sessions.aget(session_id) or ConversationState(session_id)
+        
+    async def start_conversation(self, session_id: str = DEFAULT_SESSION_ID) -> ConversationState:
+        """Start (or restart) the conversation of a session."""
+        state = await self.get_session(session_id)
+        state.start_conversation(session_id)
+        await self.sessions.asave(state)
+        return state
+        
+    async def end_conversation(self, session_id: str = DEFAULT_SESSION_ID):
+        """End the conversation of a session."""
+        await self.sessions.adelete(session_id)
+        
     async def _on_wake_word_detected(self, event: WakeWordEvent):
         """Handle wake word detection."""
         print(f"Wake word detected with confidence {event.confidence}")
-        self.conversation.start_conversation()
         
         # In a real implementation, this would trigger:
         # 1. Audio recording
@@ -159,38 +195,67 @@ class VoiceAssistantCore:
         # 4. Response generation
         # 5. Text-to-speech
         
-    async def process_voice_input(self, text: str) -> Optional[str]:
-        """Process voice input and return response."""
+    async def prepare_response(self, text: str, session_id: str = DEFAULT_SESSION_ID):
+        """Work out the skill response to ``text`` without changing the session.
+
+        Streaming clients use this to start on a reply while the user may
+        still be talking; the result is handed to :meth:`process_voice_input`
+        once the turn is over. The skill sees a copy of the context. Returns
+        None if the conversation is not active.
+        """
+        state = await self.get_session(session_id)
+        if not state.is_active:
+            return None
+        from .skills import skill_manager
+        return await skill_manager.handle_input(text, dict(state.context, last_input=text))
+        
+    async def process_voice_input(self, text: str, session_id: str = DEFAULT_SESSION_ID, prepared=None) -> Optional[str]:
+        """Process voice input for a session and return the response.
+
+        ``prepared`` is a response from :meth:`prepare_response` for the same
+        text, which is used instead of running the skill again.
+        """
+        state = await self.get_session(session_id)
+        
         # Check for wake word if conversation is not active
-        if not self.conversation.is_active:
+        if not state.is_active:
             wake_detected = await self.wake_detector.detect_in_text(text)
             if wake_detected:
-                return "ሰላም! እንዴት ልረዳሽ? Hello! How can I help you?"
+                await self.start_conversation(session_id)
+                return WAKE_RESPONSE
             return None
             
         # Process input if conversation is active
         from .skills import skill_manager
         
         # Update conversation context
-        self.conversation.update_context("last_input", text)
+        state.update_context("last_input", text)
         
         # Handle input through skill manager
-        response = await skill_manager.handle_input(text, self.conversation.context)
+        response = prepared or await skill_manager.handle_input(text, state.context)
         
         # End conversation if requested
         if response.end_conversation:
-            self.conversation.end_conversation()
+            await self.end_conversation(session_id)
+        else:
+            await self.sessions.asave(state)
             
         return response.text
         
     def start_listening(self):
         """Start listening for wake word."""
         self.wake_detector.start_listening()
+        try:
+            self.sessions.start()
+        except RuntimeError:
+            # No running event loop; sessions then expire lazily
+            pass
         
     def stop_listening(self):
         """Stop listening."""
         self.wake_detector.stop_listening()
-        self.conversation.end_conversation()
+        self.sessions.stop()
+        self.sessions.delete(DEFAULT_SESSION_ID)
 
 
 # Global voice assistant instance
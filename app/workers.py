@@ -0,0 +1,489 @@
+"""Model worker processes for scaling inference across CPU cores.
+
+One Python process cannot keep a large machine busy: the GIL serialises the
+glue code and every PyTorch model competes for the same intra-op threads.
+With ``SABA_MODEL_WORKERS`` set, ASR and TTS models are loaded into a pool
+of spawned processes instead, each pinned to its own subset of cores with a
+matching thread count. Audio moves through a shared-memory buffer owned by
+each worker; only small control messages are pickled over a pipe.
+"""
+
+import asyncio
+import dataclasses
+import gc
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .batching import MicroBatcher
+from .config import ModelConfig, config
+from .inference import InferenceSaturatedError
+from .models.asr import ASRModel
+from .models.tts import TTSModel
+from .models.xtts import QuantizedXTTSModel
+
+
+class ModelWorkerError(RuntimeError):
+    """Raised when a model call fails inside a worker process."""
+
+
+def load_asr_model(model_config: ModelConfig) -> ASRModel:
+    return ASRModel(
+        model=model_config.path,
+        language=model_config.language,
+        sample_rate=model_config.sample_rate,
+        backend=model_config.backend,
+    )
+
+
+def load_tts_model(model_config: ModelConfig) -> TTSModel:
+    model_class = QuantizedXTTSModel if model_config.backend == "int8" else TTSModel
+    return model_class(
+        model_name=model_config.path,
+        language=model_config.language,
+        sample_rate=model_config.sample_rate,
+    )
+
+
+DEFAULT_FACTORIES = {"asr": load_asr_model, "tts": load_tts_model}
+
+
+def split_cores(processes: int, cores: List[int] = None) -> List[List[int]]:
+    """Divide the usable cores into ``processes`` contiguous groups."""
+    if cores is None:
+        cores = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    if processes >= len(cores):
+        return [[cores[i % len(cores)]] for i in range(processes)]
+    size, extra = divmod(len(cores), processes)
+    groups, start = [], 0
+    for i in range(processes):
+        end = start + size + (1 if i < extra else 0)
+        groups.append(cores[start:end])
+        start = end
+    return groups
+
+
+# Audio is laid out in shared memory as a list of (offset, nbytes, is_array)
+# entries; arrays are float32 PCM, anything else is raw encoded bytes.
+Layout = List[Tuple[int, int, bool]]
+
+
+def _layout(items: List[Any]) -> Tuple[Layout, int]:
+    layout, offset = [], 0
+    for item in items:
+        is_array = isinstance(item, np.ndarray)
+        nbytes = item.size * 4 if is_array else len(item)
+        layout.append((offset, nbytes, is_array))
+        offset += nbytes
+    return layout, offset
+
+
+def _write_items(buffer: memoryview, items: List[Any], layout: Layout):
+    for item, (offset, nbytes, is_array) in zip(items, layout):
+        if is_array:
+            target = np.ndarray(item.shape, dtype=np.float32, buffer=buffer, offset=offset)
+            target[...] = item
+        else:
+            buffer[offset:offset + nbytes] = item
+
+
+def _read_items(buffer: memoryview, layout: Layout) -> List[Any]:
+    items = []
+    for offset, nbytes, is_array in layout:
+        if is_array:
+            items.append(np.frombuffer(buffer, dtype=np.float32, count=nbytes // 4, offset=offset).copy())
+        else:
+            items.append(bytes(buffer[offset:offset + nbytes]))
+    return items
+
+
+def _limit_threads(cores: List[int], threads: int):
+    """Pin the current process to ``cores`` and size its thread pools."""
+    for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[variable] = str(threads)
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, cores)
+        except OSError as e:
+            print(f"Could not pin model worker to cores {cores}: {e}")
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only allowed before the first parallel operation
+        pass
+
+
+def _worker_main(conn, shm_name: str, cores: List[int], threads: int, factories: Dict[str, Callable]):
+    """Entry point of a worker process: serve requests until told to stop."""
+    _limit_threads(cores, threads)
+    slot = SharedMemory(name=shm_name)
+    # Keyed by the whole config: during a swap, requests for the old and the
+    # new checkpoint both hit a loaded copy until the old one is unloaded
+    models: Dict[Tuple[str, tuple], Any] = {}
+
+    def model_key(kind: str, model_config: ModelConfig) -> Tuple[str, tuple]:
+        return kind, dataclasses.astuple(model_config)
+
+    def get_model(kind: str, model_config: ModelConfig):
+        key = model_key(kind, model_config)
+        if key not in models:
+            models[key] = factories[kind](model_config)
+        return models[key]
+
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                break
+            if message is None:
+                break
+            op, kind, model_config, payload = message
+            try:
+                if op == "unload":
+                    model = models.pop(model_key(kind, model_config), None)
+                    del model
+                    gc.collect()
+                    conn.send(("ok", None))
+                    continue
+                model = get_model(kind, model_config)
+                if op == "load":
+                    memory_bytes = getattr(model, "memory_bytes", None)
+                    reply = {
+                        "sample_rate": model.sample_rate,
+                        "memory_bytes": memory_bytes() if callable(memory_bytes) else 0,
+                    }
+                elif op == "transcribe":
+                    layout, segment = payload
+                    if segment is None:
+                        items = _read_items(slot.buf, layout)
+                    else:
+                        shm = SharedMemory(name=segment)
+                        try:
+                            items = _read_items(shm.buf, layout)
+                        finally:
+                            shm.close()
+                    # Per-item failures go back as plain errors, which always pickle
+                    reply = [
+                        RuntimeError(f"{type(result).__name__}: {result}") if isinstance(result, Exception) else result
+                        for result in model._transcribe_batch(items)
+                    ]
+                elif op == "synthesize":
+                    audio = np.ascontiguousarray(model._render(*payload), dtype=np.float32)
+                    reply = _write_result(slot, audio)
+                elif op == "register_speaker":
+                    reply = model.register_speaker_blocking(*payload)
+                else:
+                    raise ValueError(f"unknown operation {op!r}")
+                conn.send(("ok", reply))
+            except Exception as e:
+                conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        slot.close()
+
+
+def _write_result(slot: SharedMemory, audio: np.ndarray) -> Tuple[int, Optional[str]]:
+    """Put a waveform in the worker's slot, or a new segment if it is too big."""
+    if audio.nbytes <= slot.size:
+        np.ndarray(audio.shape, dtype=np.float32, buffer=slot.buf)[...] = audio
+        return len(audio), None
+    # The parent copies the audio out and unlinks the segment
+    shm = SharedMemory(create=True, size=audio.nbytes)
+    np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)[...] = audio
+    name = shm.name
+    shm.close()
+    return len(audio), name
+
+
+class _Worker:
+    """Parent-side handle of one worker process and its shared buffer."""
+
+    def __init__(self, index: int, cores: List[int], threads: int, shm_bytes: int, factories: Dict[str, Callable]):
+        self.index = index
+        self.cores = cores
+        self.threads = threads
+        self.factories = factories
+        self.slot = SharedMemory(create=True, size=shm_bytes)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.process = None
+        self.conn = None
+        self.start()
+
+    def start(self):
+        context = get_context("spawn")
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, self.slot.name, self.cores, self.threads, self.factories),
+            name=f"saba-model-worker-{self.index}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def request(self, op: str, kind: str, model_config: ModelConfig, payload: Any = None) -> Any:
+        """Send one request and wait for the reply (blocking)."""
+        with self.lock:
+            self.requests += 1
+            try:
+                if op == "transcribe":
+                    return self._transcribe(kind, model_config, payload)
+                if op == "synthesize":
+                    return self._synthesize(kind, model_config, payload)
+                return self._call(op, kind, model_config, payload)
+            except (EOFError, BrokenPipeError, ConnectionResetError):
+                # The process died (e.g. out of memory); replace it for later calls
+                self.stop()
+                self.start()
+                raise ModelWorkerError(f"Model worker {self.index} exited during a {kind} call")
+
+    def _call(self, op: str, kind: str, model_config: ModelConfig, payload: Any) -> Any:
+        self.conn.send((op, kind, model_config, payload))
+        status, reply = self.conn.recv()
+        if status == "error":
+            raise ModelWorkerError(reply)
+        return reply
+
+    def _transcribe(self, kind: str, model_config: ModelConfig, items: List[Any]) -> List[str]:
+        layout, total = _layout(items)
+        if total <= self.slot.size:
+            _write_items(self.slot.buf, items, layout)
+            return self._call("transcribe", kind, model_config, (layout, None))
+        shm = SharedMemory(create=True, size=total)
+        try:
+            _write_items(shm.buf, items, layout)
+            return self._call("transcribe", kind, model_config, (layout, shm.name))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def _synthesize(self, kind: str, model_config: ModelConfig, args: Tuple) -> np.ndarray:
+        length, segment = self._call("synthesize", kind, model_config, args)
+        if segment is None:
+            return np.frombuffer(self.slot.buf, dtype=np.float32, count=length).copy()
+        shm = SharedMemory(name=segment)
+        try:
+            return np.frombuffer(shm.buf, dtype=np.float32, count=length).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+    def close(self):
+        self.stop()
+        self.slot.close()
+        self.slot.unlink()
+
+
+class ModelWorkerPool:
+    """A pool of model worker processes.
+
+    Every worker loads the models it is asked to run, so each process holds
+    its own copy and concurrent requests run truly in parallel on disjoint
+    cores. Calls are admitted while fewer than ``processes + queue_depth``
+    are pending; beyond that :class:`InferenceSaturatedError` is raised,
+    as with the in-process executor. Processes are started on first use.
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        threads_per_worker: int = 0,
+        shm_bytes: int = 32 * 1024 * 1024,
+        queue_depth: int = None,
+        retry_after: int = None,
+        factories: Dict[str, Callable[[ModelConfig], Any]] = None,
+        cores: List[int] = None,
+    ):
+        self.processes = processes
+        self.threads_per_worker = threads_per_worker
+        self.shm_bytes = shm_bytes
+        self.queue_depth = config.inference_queue_depth if queue_depth is None else queue_depth
+        self.retry_after = retry_after or config.inference_retry_after
+        self.factories = factories or DEFAULT_FACTORIES
+        self.cores = cores
+
+        self._workers: List[_Worker] = []
+        self._idle: List[_Worker] = []
+        self._condition = threading.Condition()
+        self._pending = 0
+        self._rejected = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.processes > 0
+
+    @property
+    def capacity(self) -> int:
+        return self.processes + self.queue_depth
+
+    def start(self):
+        """Spawn the worker processes (a no-op once they are running)."""
+        with self._condition:
+            if self._workers:
+                return
+            for index, cores in enumerate(split_cores(self.processes, self.cores)):
+                threads = self.threads_per_worker or len(cores)
+                worker = _Worker(index, cores, threads, self.shm_bytes, self.factories)
+                self._workers.append(worker)
+                self._idle.append(worker)
+
+    def load(self, kind: str, model_config: ModelConfig) -> Dict[str, Any]:
+        """Load a model in every worker (blocking); returns its sample rate and size."""
+        self.start()
+        with ThreadPoolExecutor(max_workers=len(self._workers)) as loader:
+            replies = list(loader.map(lambda w: w.request("load", kind, model_config), self._workers))
+        return {
+            "sample_rate": replies[0]["sample_rate"],
+            "memory_bytes": sum(reply["memory_bytes"] for reply in replies),
+        }
+
+    def unload(self, kind: str, model_config: ModelConfig):
+        """Drop a model from every worker (blocking); waits for calls in progress."""
+        with self._condition:
+            workers = list(self._workers)
+        if not workers:
+            return
+        with ThreadPoolExecutor(max_workers=len(workers)) as unloader:
+            list(unloader.map(lambda w: w.request("unload", kind, model_config), workers))
+
+    async def call(self, op: str, kind: str, model_config: ModelConfig, payload: Any = None) -> Any:
+        """Run one request on the next idle worker without blocking the event loop."""
+        if self._pending >= self.capacity:
+            self._rejected += 1
+            raise InferenceSaturatedError(self.retry_after)
+        self._pending += 1
+        try:
+            return await asyncio.to_thread(self.call_blocking, op, kind, model_config, payload)
+        finally:
+            self._pending -= 1
+
+    def call_blocking(self, op: str, kind: str, model_config: ModelConfig, payload: Any = None) -> Any:
+        self.start()
+        with self._condition:
+            while not self._idle:
+                self._condition.wait()
+            worker = self._idle.pop()
+        try:
+            return worker.request(op, kind, model_config, payload)
+        finally:
+            with self._condition:
+                self._idle.append(worker)
+                self._condition.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "processes": len(self._workers),
+            "pending": self._pending,
+            "rejected": self._rejected,
+            "workers": [
+                {"pid": w.process.pid, "cores": w.cores, "threads": w.threads, "requests": w.requests}
+                for w in self._workers
+            ],
+        }
+
+    def shutdown(self):
+        """Stop every worker and release the shared buffers."""
+        with self._condition:
+            workers, self._workers, self._idle = self._workers, [], []
+        for worker in workers:
+            worker.close()
+
+
+class RemoteASRModel(ASRModel):
+    """ASR model whose batched forward passes run in the worker pool.
+
+    Requests are still micro-batched in the API process; each batch is
+    handed to an idle worker, which decodes, runs the VAD and transcribes.
+    """
+
+    def __init__(self, model_config: ModelConfig, pool: ModelWorkerPool):
+        # The model itself lives in the workers, so ASRModel.__init__ is not run
+        self.model_config = model_config
+        self.pool = pool
+        self.language = model_config.language
+        self.model_name = model_config.path
+        self.backend = model_config.backend
+        info = pool.load("asr", model_config)
+        self.sample_rate = info["sample_rate"]
+        self._memory_bytes = info["memory_bytes"]
+        self.vad = None
+        self.batcher = MicroBatcher(
+            self._run_batch,
+            max_batch_size=config.asr_batch_size,
+            max_wait_ms=config.asr_batch_wait_ms,
+        )
+
+    def memory_bytes(self) -> int:
+        """Memory held by the copies in all worker processes."""
+        return self._memory_bytes
+
+    def close(self):
+        """Free the copies in the workers (called by the registry on unload)."""
+        self.pool.unload("asr", self.model_config)
+
+    async def _run_batch(self, items):
+        return await self.pool.call("transcribe", "asr", self.model_config, list(items))
+
+
+class RemoteTTSModel(TTSModel):
+    """TTS model rendered by the worker pool.
+
+    Text preprocessing, sentence streaming and the audio cache stay in the
+    API process; only cache misses are sent to a worker.
+    """
+
+    def __init__(self, model_config: ModelConfig, pool: ModelWorkerPool):
+        # The model itself lives in the workers, so TTSModel.__init__ is not run
+        self.model_config = model_config
+        self.pool = pool
+        self.language = model_config.language
+        self.model_name = model_config.path
+        self.backend = model_config.backend
+        info = pool.load("tts", model_config)
+        self.sample_rate = info["sample_rate"]
+        self._memory_bytes = info["memory_bytes"]
+
+    def memory_bytes(self) -> int:
+        """Memory held by the copies in all worker processes."""
+        return self._memory_bytes
+
+    def close(self):
+        """Free the copies in the workers (called by the registry on unload)."""
+        self.pool.unload("tts", self.model_config)
+
+    async def _synthesize_audio(self, processed_text: str, speaker: str = None) -> np.ndarray:
+        return await self.pool.call("synthesize", "tts", self.model_config, (processed_text, speaker))
+
+    async def register_speaker(self, name: str, audio_paths: list):
+        # The worker writes the latents to the shared speaker directory
+        await self.pool.call("register_speaker", "tts", self.model_config, (name, list(audio_paths)))
+
+
+# Global model worker pool (processes start on first use when enabled)
+worker_pool = ModelWorkerPool(
+    config.model_workers,
+    threads_per_worker=config.model_worker_threads,
+    shm_bytes=config.model_worker_shm_mb * 1024 * 1024,
+)
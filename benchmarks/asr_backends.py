@@ -0,0 +1,115 @@
+"""Compare ASR backends on a held-out Amharic set: word error rate and speed.
+
+Each candidate is a model path and backend ("pytorch", "int8" or "onnx").
+Every clip of the evaluation split is transcribed one at a time, as an
+interactive request would be. The script reports WER against the
+reference transcripts and the real-time factor (compute time divided by
+audio duration; lower is faster) for each candidate, relative to the
+first one, which serves as the fp32 baseline.
+
+The dataset is anything ``datasets.load_dataset`` or ``load_from_disk``
+accepts, with ``audio`` and ``text`` columns.
+
+Usage: python benchmarks/asr_backends.py --dataset /path/to/heldout \
+    [--split test] [--limit 200] \
+    [--candidate openai/whisper-small:pytorch ./exports/whisper_multilingual-onnx-int8:onnx ...]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import config  # noqa: E402
+from app.models.asr import ASRModel  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+# Ethiopic and ASCII punctuation ignored when scoring
+PUNCTUATION = re.compile(r"[።፣፤፥፦፧፨.,;:!?\"'()\-]")
+
+
+def words(text: str):
+    return PUNCTUATION.sub(" ", text.lower()).split()
+
+
+def edit_distance(reference, hypothesis) -> int:
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word),
+            ))
+        previous = current
+    return previous[-1]
+
+
+def load_clips(dataset: str, split: str, limit: int):
+    from datasets import Audio, load_dataset, load_from_disk
+
+    if os.path.isdir(dataset) and os.path.exists(os.path.join(dataset, "dataset_dict.json")):
+        ds = load_from_disk(dataset)[split]
+    else:
+        ds = load_dataset(dataset, split=split)
+    ds = ds.cast_column("audio", Audio(sampling_rate=SAMPLE_RATE))
+    if limit:
+        ds = ds.select(range(min(limit, len(ds))))
+    return [(row["audio"]["array"].astype("float32"), row["text"]) for row in ds]
+
+
+def evaluate(model: ASRModel, clips):
+    # One untimed call so lazy initialisation does not count
+    model._transcribe_batch([clips[0][0]])
+    errors = reference_words = 0
+    compute = audio_seconds = 0.0
+    for audio, text in clips:
+        started = time.perf_counter()
+        hypothesis = model._transcribe_batch([audio])[0]
+        compute += time.perf_counter() - started
+        audio_seconds += len(audio) / SAMPLE_RATE
+        reference = words(text)
+        errors += edit_distance(reference, words(hypothesis))
+        reference_words += len(reference)
+    return errors / max(reference_words, 1), compute / audio_seconds
+
+
+def main():
+    default_path = config.asr_models[config.default_asr_model].path
+    parser = argparse.ArgumentParser(description="Benchmark ASR backends")
+    parser.add_argument("--dataset", required=True)
+    parser.add_argument("--split", default="test")
+    parser.add_argument("--limit", type=int, default=0, help="Evaluate at most this many clips")
+    parser.add_argument(
+        "--candidate",
+        nargs="+",
+        default=[f"{default_path}:{backend}" for backend in ("pytorch", "int8", "onnx")],
+        help="path:backend pairs; the first is the baseline",
+    )
+    args = parser.parse_args()
+
+    clips = load_clips(args.dataset, args.split, args.limit)
+    print(f"{len(clips)} clips, {sum(len(a) for a, _ in clips) / SAMPLE_RATE:.0f} s of audio")
+    print(f"{'candidate':<60} {'WER':>7} {'RTF':>7} {'dWER':>7} {'speed-up':>9}")
+
+    baseline = None
+    for candidate in args.candidate:
+        path, _, backend = candidate.rpartition(":")
+        model = ASRModel(model=path, sample_rate=SAMPLE_RATE, backend=backend)
+        wer, rtf = evaluate(model, clips)
+        if baseline is None:
+            baseline = (wer, rtf)
+        print(
+            f"{candidate:<60} {wer:>7.3f} {rtf:>7.3f} "
+            f"{wer - baseline[0]:>+7.3f} {baseline[1] / rtf:>8.2f}x"
+        )
+        del model
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark throughput of the model worker pool as processes are added.
+
+A CPU-bound stand-in model (pure Python, so it holds the GIL like the glue
+code around a real model) transcribes a fixed number of one-second clips.
+The clips are sent to the pool as concurrent requests; the script reports
+requests per second for each pool size and the speed-up over one worker.
+
+Usage: python benchmarks/model_workers.py [--requests 64] [--max-workers 4]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import ModelConfig  # noqa: E402
+from app.workers import ModelWorkerPool  # noqa: E402
+
+MODEL = ModelConfig(name="synthetic", path="synthetic", language="am", sample_rate=16000)
+
+
+class SyntheticASR:
+    sample_rate = 16000
+
+    def memory_bytes(self):
+        return 0
+
+    def _transcribe_batch(self, items):
+        texts = []
+        for audio in items:
+            total = 0.0
+            for value in audio.tolist():
+                total += value * value
+            texts.append(f"{total:.1f}")
+        return texts
+
+
+def load_synthetic(model_config):
+    return SyntheticASR()
+
+
+async def run(pool: ModelWorkerPool, clips):
+    await asyncio.gather(*(pool.call("transcribe", "asr", MODEL, [clip]) for clip in clips))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark model worker scaling")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--max-workers", type=int, default=min(4, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    clips = [rng.standard_normal(16000).astype(np.float32) for _ in range(args.requests)]
+
+    baseline = None
+    for processes in range(1, args.max_workers + 1):
+        pool = ModelWorkerPool(processes, queue_depth=args.requests, factories={"asr": load_synthetic})
+        try:
+            pool.load("asr", MODEL)
+            started = time.perf_counter()
+            asyncio.run(run(pool, clips))
+            elapsed = time.perf_counter() - started
+        finally:
+            pool.shutdown()
+        throughput = args.requests / elapsed
+        baseline = baseline or throughput
+        print(f"workers: {processes:2d}  {throughput:8.1f} req/s  speed-up {throughput / baseline:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Measure Amharic text normalisation throughput in MB/s (UTF-8 input).
+
+Compares the compiled normalisers in ``app.text``, one text at a time and
+in batches, with the per-call string passes the ASR and TTS models used
+before. The TTS normaliser also spells out numbers and abbreviations,
+which the old preprocessing did not, so its comparison is conservative.
+
+Usage: python benchmarks/normalizer.py [--texts 20000] [--batch-size 64] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.text import asr_normalizer, tts_normalizer  # noqa: E402
+
+TEMPLATES = [
+    "ሰላም፣ እንዴት ነዎት? ዛሬ {n} ሰዓት ላይ እንገናኝ.",
+    "ስብሰባው በ{year} ዓ.ም ተካሄደ!  ዶ/ር አበበ ተገኝተው ነበር.",
+    "saba, what is the weather in Ethiopia today  ",
+    "የአማርኛ ትምህርት ቤት {n} ተማሪዎች አሉት።",
+    "ዋጋው {price} ብር ነው? amharic keyboard ይጠቀሙ.",
+    "የኢትዮጵያ ዋና ከተማ አ.አ ናት። ሕዝቧ ፴፻፼ ያህል ነው.",
+]
+
+
+def corpus(count: int, rng: random.Random):
+    return [
+        rng.choice(TEMPLATES).format(
+            n=rng.randint(1, 999), year=rng.randint(1950, 2017), price=f"{rng.randint(1, 9999)}.{rng.randint(0, 99)}"
+        )
+        for _ in range(count)
+    ]
+
+
+def legacy_asr(text: str) -> str:
+    """``ASRModel._post_process_amharic_text`` before the shared normaliser."""
+    if not text:
+        return text
+    text = text.strip()
+    text = text.replace("  ", " ")
+    replacements = {"saba": "ሳባ", "ethiopia": "ኢትዮጵያ", "amharic": "አማርኛ"}
+    text_lower = text.lower()
+    for eng, amh in replacements.items():
+        if eng in text_lower:
+            text = text.replace(eng, amh)
+    return text
+
+
+def legacy_tts(text: str) -> str:
+    """``TTSModel._preprocess_amharic_text`` before the shared normaliser."""
+    if not text:
+        return text
+    text = text.strip()
+    text = " ".join(text.split())
+    text = text.replace(".", "።")
+    text = text.replace("?", "፧")
+    text = text.replace("!", "፤")
+    any(ord(char) >= 0x1200 and ord(char) <= 0x137F for char in text)
+    return text
+
+
+def throughput(function, texts, repeat: int) -> float:
+    size = sum(len(text.encode("utf-8")) for text in texts)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(texts)
+        best = min(best, time.perf_counter() - started)
+    return size / best / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Amharic text normalisation")
+    parser.add_argument("--texts", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = corpus(args.texts, random.Random(0))
+    size = args.batch_size
+
+    def batched(normalizer):
+        return lambda items: [
+            out for start in range(0, len(items), size) for out in normalizer.normalize_batch(items[start:start + size])
+        ]
+
+    cases = [
+        ("asr legacy", lambda items: [legacy_asr(text) for text in items]),
+        ("asr normalize", lambda items: [asr_normalizer.normalize(text) for text in items]),
+        (f"asr normalize_batch({size})", batched(asr_normalizer)),
+        ("tts legacy", lambda items: [legacy_tts(text) for text in items]),
+        ("tts normalize", lambda items: [tts_normalizer.normalize(text) for text in items]),
+        (f"tts normalize_batch({size})", batched(tts_normalizer)),
+    ]
+    print(f"{len(texts)} texts, {sum(len(t.encode('utf-8')) for t in texts) / 1e6:.1f} MB")
+    print(f"{'case':<28} {'MB/s':>8}")
+    for name, function in cases:
+        print(f"{name:<28} {throughput(function, texts, args.repeat):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark skill routing with many registered skills.
+
+Compares the compiled intent index used by SkillManager against checking
+every skill's ``can_handle`` in turn.
+
+Usage: python benchmarks/skill_routing.py [--skills 1000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.skills import Skill, SkillManager, SkillResponse  # noqa: E402
+
+# Fidel syllables and Latin letters used to build synthetic trigger words
+ALPHABET = list("ሀለሐመሠረሰሸቀበተቸኀነኘአከኸወዐዘዠየደጀገጠጨጰጸፀፈፐ") + list("abcdefghijklmnopqrstuvwxyz")
+
+
+def random_word(rng: random.Random, length: int) -> str:
+    return "".join(rng.choice(ALPHABET) for _ in range(length))
+
+
+class SyntheticSkill(Skill):
+    def __init__(self, name, keywords, patterns):
+        super().__init__(name)
+        self.keywords = keywords
+        self.patterns = patterns
+
+    async def handle(self, text, context):
+        return SkillResponse(text=self.name)
+
+    @property
+    def description(self) -> str:
+        return "Synthetic benchmark skill"
+
+
+def build_manager(count: int, rng: random.Random) -> SkillManager:
+    manager = SkillManager()
+    for number in range(count):
+        keywords = tuple(random_word(rng, rng.randint(4, 8)) for _ in range(5))
+        head, tail = random_word(rng, 3), random_word(rng, 3)
+        skill = SyntheticSkill(f"skill_{number}", keywords, (rf"{head}\s*{tail}",))
+        skill.sample_phrase = f"{head} {tail}"
+        manager.register_skill(skill)
+    return manager
+
+
+def build_queries(manager: SkillManager, count: int, rng: random.Random):
+    keywords = [k for skill in manager.skills for k in skill.keywords]
+    phrases = [skill.sample_phrase for skill in manager.skills if hasattr(skill, "sample_phrase")]
+    queries = []
+    for _ in range(count):
+        words = [random_word(rng, rng.randint(2, 7)) for _ in range(rng.randint(4, 12))]
+        roll = rng.random()
+        if roll < 0.4:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        elif roll < 0.6:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(phrases))
+        queries.append(" ".join(words))
+    return queries
+
+
+def linear_route(manager: SkillManager, text: str):
+    for skill in manager.skills:
+        if skill.can_handle(text, {}):
+            return skill
+    return None
+
+
+def timed(route, queries):
+    started = time.perf_counter()
+    results = [route(query) for query in queries]
+    return (time.perf_counter() - started) / len(queries), results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SkillManager routing")
+    parser.add_argument("--skills", type=int, default=1000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    manager = build_manager(args.skills, rng)
+    queries = build_queries(manager, args.queries, rng)
+
+    started = time.perf_counter()
+    manager.route("")
+    build_seconds = time.perf_counter() - started
+
+    linear_seconds, linear_results = timed(lambda q: linear_route(manager, q), queries)
+    indexed_seconds, indexed_results = timed(manager.route, queries)
+    assert linear_results == indexed_results, "index and linear routing disagree"
+
+    print(f"skills: {len(manager.skills)}, queries: {len(queries)}")
+    print(f"index build:     {build_seconds * 1000:10.1f} ms")
+    print(f"linear routing:  {linear_seconds * 1e6:10.1f} us/query")
+    print(f"indexed routing: {indexed_seconds * 1e6:10.1f} us/query")
+    print(f"speedup:         {linear_seconds / indexed_seconds:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Compare TTS backends on speed and check the optimised one for regressions.
+
+Each configured TTS model (a key of ``tts_models``) renders the same
+Amharic sentences, bypassing the audio cache. The first model is the
+baseline (normally the full-precision XTTS). The script reports:
+
+- RTF: synthesis time divided by audio duration (below 1 is faster than
+  real time);
+- duration drift: mean relative difference in utterance length from the
+  baseline (int8 decoding that drops or repeats tokens shows up here);
+- MCD: mel-cepstral distortion from the baseline after DTW alignment, in
+  dB, as a proxy for a listening (MOS) test: identical audio scores 0 and
+  lower is closer. XTTS samples its audio tokens, so every sentence is
+  rendered with the same random seed to keep runs comparable.
+
+It exits non-zero if a candidate exceeds --max-duration-drift or --max-mcd,
+so it can gate changes to the optimised backend.
+
+Usage: python benchmarks/tts_backends.py [--models coqui_multilingual xtts_int8] [--speaker NAME]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.audio import resample  # noqa: E402
+from app.config import config  # noqa: E402
+from app.kws import LogMelExtractor, trim_silence  # noqa: E402
+from app.models.tts import TTSModel  # noqa: E402
+from app.models.xtts import QuantizedXTTSModel  # noqa: E402
+
+SENTENCES = [
+    "ሰላም፣ እንዴት ነዎት፧",
+    "ዛሬ የአየር ሁኔታው ፀሐያማ ነው።",
+    "ስብሰባው ነገ ከጠዋቱ ሦስት ሰዓት ይጀምራል።",
+    "እባክዎ ሙዚቃውን ትንሽ ቀንሱት።",
+    "አዲስ አበባ የኢትዮጵያ ዋና ከተማ ናት።",
+    "የምትፈልጉትን መረጃ በአጭር ጊዜ ውስጥ እልክላችኋለሁ።",
+]
+
+FEATURE_RATE = 16000
+N_CEPSTRA = 13
+
+
+def mel_cepstra(audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Mel-cepstral coefficients 1..13 of speech frames (silence trimmed)."""
+    extractor = LogMelExtractor(FEATURE_RATE)
+    log_mel = trim_silence(extractor.compute(resample(audio, sample_rate, FEATURE_RATE)))
+    # Floor at 60 dB below the peak so near-silent frames do not dominate
+    log_mel = np.maximum(log_mel, log_mel.max() - np.log(1e6))
+    n = log_mel.shape[1]
+    # Orthonormal DCT-II of the log amplitude (half the log power)
+    basis = np.cos(np.pi / n * (np.arange(n) + 0.5)[None, :] * np.arange(N_CEPSTRA + 1)[:, None])
+    basis *= np.sqrt(2.0 / n)
+    basis[0] /= np.sqrt(2.0)
+    return (0.5 * log_mel @ basis.T)[:, 1:]
+
+
+def mcd_dtw(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """Mean mel-cepstral distortion (dB) along the best DTW alignment."""
+    distance = np.sqrt(((reference[:, None, :] - candidate[None, :, :]) ** 2).sum(-1))
+    cost = np.full((len(reference) + 1, len(candidate) + 1), np.inf)
+    steps = np.zeros_like(cost)
+    cost[0, 0] = 0.0
+    for i in range(1, len(reference) + 1):
+        for j in range(1, len(candidate) + 1):
+            options = (cost[i - 1, j - 1], cost[i - 1, j], cost[i, j - 1])
+            best = int(np.argmin(options))
+            previous = ((i - 1, j - 1), (i - 1, j), (i, j - 1))[best]
+            cost[i, j] = options[best] + distance[i - 1, j - 1]
+            steps[i, j] = steps[previous] + 1
+    mean_distance = cost[-1, -1] / max(steps[-1, -1], 1)
+    return float(10.0 / np.log(10.0) * np.sqrt(2.0) * mean_distance)
+
+
+def load(name: str) -> TTSModel:
+    model_config = config.tts_models[name]
+    model_class = QuantizedXTTSModel if model_config.backend == "int8" else TTSModel
+    return model_class(
+        model_name=model_config.path,
+        language=model_config.language,
+        sample_rate=model_config.sample_rate,
+    )
+
+
+def render_all(model: TTSModel, speaker: str):
+    import torch
+
+    # One untimed sentence so lazy initialisation does not count
+    model._render(model._preprocess_amharic_text(SENTENCES[0]), speaker)
+    outputs, compute = [], 0.0
+    for sentence in SENTENCES:
+        text = model._preprocess_amharic_text(sentence)
+        torch.manual_seed(0)
+        started = time.perf_counter()
+        audio = model._render(text, speaker)
+        compute += time.perf_counter() - started
+        outputs.append(audio)
+    duration = sum(len(audio) for audio in outputs) / model.sample_rate
+    return outputs, compute / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TTS backends")
+    parser.add_argument("--models", nargs="+", default=["coqui_multilingual", "xtts_int8"],
+                        help="tts_models keys; the first is the baseline")
+    parser.add_argument("--speaker", default=None)
+    parser.add_argument("--max-duration-drift", type=float, default=0.2)
+    parser.add_argument("--max-mcd", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"{'model':<24} {'RTF':>7} {'speed-up':>9} {'drift':>7} {'MCD dB':>7}")
+    baseline = None
+    failed = False
+    for name in args.models:
+        model = load(name)
+        outputs, rtf = render_all(model, args.speaker)
+        rate = model.sample_rate
+        del model
+        if baseline is None:
+            baseline = (outputs, rate, rtf)
+            print(f"{name:<24} {rtf:>7.3f} {'1.00x':>9} {'-':>7} {'-':>7}")
+            continue
+
+        base_outputs, base_rate, base_rtf = baseline
+        drift = np.mean([
+            abs(len(out) / rate - len(ref) / base_rate) / (len(ref) / base_rate)
+            for out, ref in zip(outputs, base_outputs)
+        ])
+        mcd = np.mean([
+            mcd_dtw(mel_cepstra(ref, base_rate), mel_cepstra(out, rate))
+            for out, ref in zip(outputs, base_outputs)
+        ])
+        regressed = drift > args.max_duration_drift or mcd > args.max_mcd
+        failed |= regressed
+        print(
+            f"{name:<24} {rtf:>7.3f} {base_rtf / rtf:>8.2f}x {drift:>7.1%} {mcd:>7.2f}"
+            + ("  REGRESSION" if regressed else "")
+        )
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import io
+import wave
+
+import numpy as np
+
+from app.audio import decode_audio, resample
+
+
+def _wav_bytes(samples: np.ndarray, rate: int, channels: int = 1) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples.astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+def test_decode_int16_wav():
+    samples = np.array([0, 16384, -16384, 32767], dtype=np.int16)
+    audio = decode_audio(_wav_bytes(samples, 16000), 16000)
+    assert audio.dtype == np.float32
+    np.testing.assert_allclose(audio, samples / 32768.0, atol=1e-6)
+
+
+def test_decode_stereo_wav_downmixes():
+    frames = np.array([[1000, 3000], [-2000, 2000]], dtype=np.int16)
+    audio = decode_audio(_wav_bytes(frames.reshape(-1), 16000, channels=2), 16000)
+    np.testing.assert_allclose(audio, np.array([2000, 0]) / 32768.0, atol=1e-6)
+
+
+def test_raw_float_pcm_is_zero_copy():
+    data = np.linspace(-1, 1, 64, dtype="<f4").tobytes()
+    audio = decode_audio(data, 16000, encoding="pcm_f32le")
+    assert np.shares_memory(audio, np.frombuffer(data, dtype="<f4"))
+
+
+def test_wav_is_resampled_to_model_rate():
+    tone = (np.sin(np.arange(44100) * 2 * np.pi * 440 / 44100) * 10000).astype(np.int16)
+    audio = decode_audio(_wav_bytes(tone, 44100), 16000)
+    assert len(audio) == 16000
+
+
+def test_resample_preserves_tone():
+    t = np.arange(8000) / 8000
+    audio = np.sin(2 * np.pi * 200 * t).astype(np.float32)
+    out = resample(audio, 8000, 16000)
+    expected = np.sin(2 * np.pi * 200 * np.arange(16000) / 16000)
+    np.testing.assert_allclose(out, expected, atol=1e-3)
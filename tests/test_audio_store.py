@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.audio_store import AudioStore
+from app.controllers import audio_controller
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_identical_audio_gets_one_id(tmp_path):
+    store = AudioStore(str(tmp_path), max_bytes=1024, ttl_s=60)
+    first = store.put(b"RIFF-one")
+    assert store.put(b"RIFF-one") == first
+    assert first.endswith(".wav") and len(list(tmp_path.iterdir())) == 1
+    assert store.get(first).read_bytes() == b"RIFF-one"
+    assert store.get("../secret.wav") is None
+
+
+def test_put_file_moves_temporary_files(tmp_path):
+    store = AudioStore(str(tmp_path / "store"), max_bytes=1024, ttl_s=60)
+    source = tmp_path / "reply.wav"
+    source.write_bytes(b"RIFF-temp")
+    audio_id = store.put_file(str(source))
+    assert not source.exists()
+    assert store.get(audio_id).read_bytes() == b"RIFF-temp"
+
+
+def test_eviction_by_size_and_age(tmp_path):
+    store = AudioStore(str(tmp_path), max_bytes=10, ttl_s=60)
+    old = store.put(b"1234")
+    recent = store.put(b"5678")
+    store.get(old)
+    store.put(b"9999")  # Over the cap: the least recently used entry goes
+    assert store.get(recent) is None
+    assert store.get(old) is not None
+
+    assert store.evict(now=store._entries[old][1] + 61) == 2
+    assert store.stats()["entries"] == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_index_survives_restart(tmp_path):
+    audio_id = AudioStore(str(tmp_path), max_bytes=1024, ttl_s=60).put(b"RIFF-kept")
+    assert AudioStore(str(tmp_path), max_bytes=1024, ttl_s=60).get(audio_id).read_bytes() == b"RIFF-kept"
+
+
+def test_compressed_variant_is_encoded_once(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_encode(data, fmt):
+        calls.append(fmt)
+        return b"OggS" + data
+
+    monkeypatch.setattr("app.audio_store.encode_audio", fake_encode)
+    store = AudioStore(str(tmp_path), max_bytes=1024, ttl_s=60)
+    stem = store.put(b"RIFF-x").split(".")[0]
+
+    path = asyncio.run(store.resolve(f"{stem}.opus"))
+    assert path.read_bytes() == b"OggSRIFF-x"
+    asyncio.run(store.resolve(f"{stem}.opus"))
+    assert calls == ["opus"]
+    with pytest.raises(ValueError):
+        asyncio.run(store.resolve(f"{stem}.flac"))
+
+
+def test_audio_route_supports_ranges_and_revalidation(tmp_path, monkeypatch):
+    store = AudioStore(str(tmp_path), max_bytes=1024, ttl_s=60)
+    monkeypatch.setattr(audio_controller, "audio_store", store)
+    audio_id = store.put(b"RIFF0123456789")
+
+    response = client.get(f"/audio/{audio_id}")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "audio/wav"
+    assert response.headers["etag"] == f'"{audio_id}"'
+    assert response.content == b"RIFF0123456789"
+
+    response = client.get(f"/audio/{audio_id}", headers={"Range": "bytes=4-7"})
+    assert response.status_code == 206
+    assert response.content == b"0123"
+    assert response.headers["content-range"] == "bytes 4-7/14"
+
+    response = client.get(f"/audio/{audio_id}", headers={"If-None-Match": f'"{audio_id}"'})
+    assert response.status_code == 304
+
+    assert client.get("/audio/" + "0" * 32 + ".wav").status_code == 404
+
+
+def test_audio_route_refuses_unknown_formats_and_reports_encoder_failures(tmp_path, monkeypatch):
+    calls = []
+
+    def failing_encode(data, fmt):
+        calls.append(fmt)
+        raise RuntimeError("ffmpeg exited with 1")
+
+    monkeypatch.setattr("app.audio_store.encode_audio", failing_encode)
+    store = AudioStore(str(tmp_path), max_bytes=1024, ttl_s=60)
+    monkeypatch.setattr(audio_controller, "audio_store", store)
+    stem = store.put(b"RIFF-x").split(".")[0]
+
+    assert client.get(f"/audio/{stem}.flac").status_code == 406
+    assert calls == []
+    assert client.get(f"/audio/{stem}.mp3").status_code == 500
+    assert calls == ["mp3"]
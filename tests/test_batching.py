@@ -0,0 +1,88 @@
+import asyncio
+
+from app.batching import MicroBatcher
+
+
+def test_concurrent_requests_share_a_batch():
+    seen = []
+
+    async def process(items):
+        seen.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(process, max_batch_size=8, max_wait_ms=10)
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert asyncio.run(scenario()) == [0, 2, 4, 6, 8]
+    assert seen == [[0, 1, 2, 3, 4]]
+    stats = batcher.stats()
+    assert stats["batch_size"]["count"] == 1
+    assert stats["queue_wait_ms"]["count"] == 5
+
+
+def test_full_batch_dispatches_without_waiting():
+    async def process(items):
+        return items
+
+    batcher = MicroBatcher(process, max_batch_size=2, max_wait_ms=10_000)
+
+    async def scenario():
+        return await asyncio.wait_for(
+            asyncio.gather(batcher.submit("a"), batcher.submit("b")), timeout=1
+        )
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+
+
+def test_batch_errors_reach_every_caller():
+    async def process(items):
+        raise RuntimeError("model failed")
+
+    batcher = MicroBatcher(process, max_batch_size=4, max_wait_ms=1)
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.submit(1), batcher.submit(2), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_item_errors_reach_only_their_caller():
+    async def process(items):
+        return [ValueError(item) if item == "bad" else item.upper() for item in items]
+
+    batcher = MicroBatcher(process, max_batch_size=4, max_wait_ms=1)
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.submit("a"), batcher.submit("bad"), batcher.submit("b"), return_exceptions=True
+        )
+
+    first, bad, second = asyncio.run(scenario())
+    assert (first, second) == ("A", "B")
+    assert isinstance(bad, ValueError)
+
+
+def test_corrupt_upload_does_not_fail_its_batch(monkeypatch):
+    import numpy as np
+
+    from app.models import asr as asr_module
+
+    def decode_audio(data, sample_rate):
+        if data == b"corrupt":
+            raise RuntimeError("ffmpeg could not decode the audio")
+        return np.zeros(160, dtype=np.float32)
+
+    monkeypatch.setattr(asr_module, "decode_audio", decode_audio)
+    model = asr_module.ASRModel.__new__(asr_module.ASRModel)
+    model.sample_rate = 16000
+    model.vad = None
+    model.pipe = lambda inputs, batch_size: [{"text": "ሰላም"} for _ in inputs]
+
+    good, corrupt, array = model._transcribe_batch([b"ok", b"corrupt", np.zeros(160, dtype=np.float32)])
+    assert good == array == "ሰላም"
+    assert isinstance(corrupt, RuntimeError)
@@ -0,0 +1,76 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.encoding import AudioEncoder, convert_pcm, media_type_for, negotiate_format
+from app.models import tts as tts_module
+from app.models.tts import TTSModel
+from app.tts_cache import TTSCache
+
+
+class FakeTTS(TTSModel):
+    def __init__(self):
+        # No model to load; audio comes from _synthesize_audio
+        self.language = "am"
+        self.model_name = "fake"
+        self.sample_rate = 16000
+        self.calls = 0
+
+    async def _synthesize_audio(self, processed_text, speaker=None):
+        self.calls += 1
+        return np.full(1600, 0.5, dtype=np.float32)
+
+
+def test_explicit_format_wins_over_accept():
+    assert negotiate_format("audio/mpeg", "OPUS") == "opus"
+    with pytest.raises(ValueError):
+        negotiate_format(None, "flac")
+
+
+def test_accept_header_is_ranked_by_quality():
+    assert negotiate_format(None) == "wav"
+    assert negotiate_format("*/*") == "wav"
+    assert negotiate_format("audio/mpeg;q=0.5, audio/ogg") == "opus"
+    assert negotiate_format("audio/flac, audio/pcm;q=0.1") == "pcm"
+    assert negotiate_format("audio/ogg;q=0, audio/*;q=0.2") == "wav"
+    with pytest.raises(ValueError):
+        negotiate_format("audio/flac, text/html")
+    assert media_type_for("pcm", 8000) == "audio/pcm;rate=8000;channels=1;encoding=s16le"
+
+
+def test_pcm_and_wav_are_resampled_without_ffmpeg():
+    pcm = (np.full(1600, 0.25) * 32767).astype("<i2").tobytes()
+    assert convert_pcm(pcm, 16000) is pcm
+    assert len(convert_pcm(pcm, 16000, 8000)) == 1600
+
+    wav = asyncio.run(AudioEncoder(max_workers=1).encode(pcm, 16000, "wav", 8000))
+    assert wav[:4] == b"RIFF" and len(wav) == 44 + 1600
+    assert int.from_bytes(wav[24:28], "little") == 8000
+
+
+def test_encoded_variant_is_cached(monkeypatch):
+    monkeypatch.setattr(tts_module, "tts_cache", TTSCache(memory_bytes=1 << 20, disk_dir=""))
+    tts = FakeTTS()
+
+    first = asyncio.run(tts.synthesize_encoded("ሰላም", "pcm", sample_rate=8000))
+    assert len(first) == 1600
+    assert asyncio.run(tts.synthesize_encoded("ሰላም", "pcm", sample_rate=8000)) == first
+    # The 16 kHz PCM is reused for a second rendition
+    assert len(asyncio.run(tts.synthesize_encoded("ሰላም", "pcm"))) == 3200
+    assert tts.calls == 1
+
+
+def test_encoded_stream_follows_synthesis(monkeypatch):
+    monkeypatch.setattr(tts_module, "tts_cache", TTSCache(memory_bytes=1 << 20, disk_dir=""))
+    tts = FakeTTS()
+
+    async def collect(fmt):
+        return [chunk async for chunk in tts.synthesize_encoded_stream("አንድ። ሁለት።", fmt)]
+
+    chunks = asyncio.run(collect("wav"))
+    assert chunks[0][:4] == b"RIFF" and len(chunks) == 3
+    assert tts.calls == 2
+    streamed = b"".join(asyncio.run(collect("pcm")))
+    # A complete stream is replayed from the cache in one piece
+    assert asyncio.run(collect("pcm")) == [streamed]
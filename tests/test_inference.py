@@ -0,0 +1,54 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.inference import InferenceExecutor, InferenceSaturatedError
+
+
+def test_run_returns_result():
+    executor = InferenceExecutor(max_workers=1, max_queue_depth=0)
+    assert asyncio.run(executor.run("asr", lambda a, b: a + b, 1, b=2)) == 3
+    assert executor.stats()["completed"] == 1
+    executor.shutdown()
+
+
+def test_rejects_when_saturated():
+    executor = InferenceExecutor(max_workers=1, max_queue_depth=0, retry_after=7)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.ensure_future(executor.run("asr", release.wait))
+        await asyncio.sleep(0.05)
+        with pytest.raises(InferenceSaturatedError) as err:
+            await executor.run("tts", lambda: None)
+        release.set()
+        await blocked
+        return err.value
+
+    error = asyncio.run(scenario())
+    assert error.retry_after == 7
+    assert executor.stats()["rejected"] == 1
+    executor.shutdown()
+
+
+def test_per_model_concurrency_cap():
+    executor = InferenceExecutor(max_workers=4, max_queue_depth=4, model_concurrency=1)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        threading.Event().wait(0.02)
+        with lock:
+            active.pop()
+
+    async def scenario():
+        await asyncio.gather(*(executor.run("asr", work) for _ in range(4)))
+
+    asyncio.run(scenario())
+    assert max(peak) == 1
+    executor.shutdown()
@@ -0,0 +1,80 @@
+import asyncio
+
+from app.intents import AhoCorasick, IntentIndex, literal_prefixes
+from app.skills import Skill, SkillManager, SkillResponse
+
+
+class KeywordSkill(Skill):
+    def __init__(self, name, keywords=(), patterns=()):
+        super().__init__(name)
+        self.keywords = keywords
+        self.patterns = patterns
+
+    async def handle(self, text, context):
+        return SkillResponse(text=self.name)
+
+    @property
+    def description(self):
+        return self.name
+
+
+class ContextSkill(KeywordSkill):
+    def can_handle(self, text, context):
+        return context.get("follow_up", False)
+
+
+def test_aho_corasick_finds_overlapping_keywords():
+    automaton = AhoCorasick()
+    for word in ("he", "she", "his", "hers"):
+        automaton.add(word, word)
+    found = sorted((end, value) for end, value in automaton.find_all("ushers"))
+    assert found == [(3, "he"), (3, "she"), (5, "hers")]
+    assert not automaton.contains_any("xyz")
+
+
+def test_literal_prefixes():
+    assert literal_prefixes(r"(ሰላም|hello|hi)") == ["ሰላም", "hello", "hi"]
+    assert literal_prefixes(r"\?\s*$") == ["?"]
+    assert literal_prefixes(r"good\s*day") == ["good"]
+    assert literal_prefixes(r"\w+day") is None
+    assert literal_prefixes(r"(?i)hello") is None
+
+
+def test_index_returns_highest_priority_match():
+    skills = [
+        KeywordSkill("a", keywords=("alpha",)),
+        KeywordSkill("b", keywords=("beta",), patterns=(r"gam+a",)),
+        KeywordSkill("c", patterns=(r"\d+ items",)),
+    ]
+    index = IntentIndex(skills)
+    assert index.match("BETA and ALPHA") == 0
+    assert index.match("gammma") == 1
+    assert index.match("gaa") is None
+    assert index.match("there are 12 items and beta") == 1
+    assert index.match("there are 12 items") == 2
+
+
+def test_default_skills_route_like_before():
+    manager = SkillManager()
+    assert manager.route("ሰላም").name == "greeting"
+    assert manager.route("Is it going to rain").name == "weather"
+    assert manager.route("ማን ነህ?").name == "qa"
+    assert manager.route("really?  ").name == "qa"
+    assert manager.route("xyz") is None
+    assert asyncio.run(manager.handle_input("xyz")) is manager.FALLBACK_RESPONSE
+
+
+def test_imperative_skills_keep_their_order():
+    manager = SkillManager()
+    manager.skills.insert(0, ContextSkill("follow_up"))
+    manager.register_skill(ContextSkill("late"))
+    assert manager.route("hello", {"follow_up": True}).name == "follow_up"
+    assert manager.route("hello", {}).name == "greeting"
+    assert manager.route("xyz", {"follow_up": True}).name == "follow_up"
+
+
+def test_register_skill_rebuilds_index():
+    manager = SkillManager()
+    assert manager.route("tell me a joke") is None
+    manager.register_skill(KeywordSkill("joke", keywords=("joke",)))
+    assert manager.route("tell me a joke").name == "joke"
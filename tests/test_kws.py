@@ -0,0 +1,78 @@
+import asyncio
+
+import numpy as np
+
+from app.kws import KeywordSpotter, LogMelExtractor
+from app.wake_word import WakeWordDetector
+
+SAMPLE_RATE = 16000
+
+
+def word(seed, duration=0.6):
+    rng = np.random.default_rng(seed)
+    length = int(SAMPLE_RATE * duration / 3)
+    t = np.arange(length) / SAMPLE_RATE
+    syllables = []
+    for _ in range(3):
+        tone = 0.4 * np.sin(2 * np.pi * rng.uniform(150, 300) * t)
+        tone += 0.4 * np.sin(2 * np.pi * rng.uniform(300, 2500) * t)
+        syllables.append(tone * np.hanning(length))
+    return (0.3 * np.concatenate(syllables)).astype(np.float32)
+
+
+def noisy_stream(inserted, seconds=2.0):
+    audio = (0.003 * np.random.default_rng(0).standard_normal(int(seconds * SAMPLE_RATE))).astype(np.float32)
+    audio[SAMPLE_RATE // 2:SAMPLE_RATE // 2 + len(inserted)] += inserted
+    return audio
+
+
+def run(stream, audio, hop=160):
+    return [d for d in (stream.process(audio[i:i + hop]) for i in range(0, len(audio), hop)) if d]
+
+
+def test_log_mel_frames():
+    extractor = LogMelExtractor()
+    assert extractor.compute(np.zeros(100, dtype=np.float32)).shape == (0, 40)
+    # 25 ms windows every 10 ms
+    assert extractor.compute(np.zeros(16000, dtype=np.float32)).shape == (98, 40)
+
+
+def test_spotter_detects_only_the_template():
+    spotter = KeywordSpotter()
+    spotter.add_template(word(1), name="saba")
+
+    detections = run(spotter.stream(), noisy_stream(word(1)))
+    assert len(detections) == 1
+    assert detections[0].template == "saba"
+    assert 1.0 < detections[0].end_time < 1.3
+
+    assert run(spotter.stream(), noisy_stream(word(7))) == []
+
+
+def test_chunk_size_does_not_matter():
+    spotter = KeywordSpotter()
+    spotter.add_template(word(1))
+    audio = noisy_stream(word(1))
+    small = run(spotter.stream(), audio, hop=160)
+    odd = run(spotter.stream(), audio, hop=317)
+    assert [d.confidence for d in small] == [d.confidence for d in odd]
+
+
+def test_process_audio_stream_triggers_callbacks():
+    detector = WakeWordDetector()
+    detector.spotter = KeywordSpotter()
+    events = []
+    detector.add_callback(events.append)
+    pcm = (noisy_stream(word(1)) * 32767).astype("<i2").tobytes()
+
+    # Not listening, or no templates: nothing is detected
+    assert not asyncio.run(detector.process_audio_stream(pcm))
+    detector.start_listening()
+    assert not asyncio.run(detector.process_audio_stream(pcm))
+
+    detector.spotter.add_template(word(1))
+    stream = detector.spotter.stream()
+    hop = 640
+    found = [asyncio.run(detector.process_audio_stream(pcm[i:i + hop], stream)) for i in range(0, len(pcm), hop)]
+    assert sum(found) == 1
+    assert events[0].confidence >= detector.spotter.threshold
@@ -0,0 +1,116 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.longform import LongFormTranscriber
+from app.vad import EnergyVAD
+
+RATE = 16000
+
+
+class FakeUpload:
+    def __init__(self, samples: np.ndarray):
+        self.data = (np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes()
+        self.position = 0
+
+    async def read(self, size: int) -> bytes:
+        chunk = self.data[self.position:self.position + size]
+        self.position += len(chunk)
+        return chunk
+
+
+def bursts(count: int, speech_s: float = 0.7, pause_s: float = 0.5) -> np.ndarray:
+    t = np.arange(int(speech_s * RATE)) / RATE
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t)
+    pause = np.zeros(int(pause_s * RATE))
+    return np.concatenate([np.concatenate([tone, pause]) for _ in range(count)]).astype(np.float32)
+
+
+def test_long_form_cuts_at_pauses():
+    audio = bursts(8, pause_s=0.8)
+    segments_audio = []
+
+    async def transcribe(samples):
+        segments_audio.append(samples)
+        return f"burst{len(segments_audio)}"
+
+    session = LongFormTranscriber(
+        transcribe, sample_rate=RATE, encoding="pcm_s16le", window_s=3.0, search_s=1.5,
+        vad=EnergyVAD(RATE),
+    )
+    result = asyncio.run(session.transcribe_file(FakeUpload(audio), chunk_size=4096))
+
+    assert len(segments_audio) > 1
+    for samples in segments_audio[:-1]:
+        assert len(samples) <= 3 * RATE
+        assert np.abs(samples[-160:]).max() < 1e-3
+    starts = [segment["start"] for segment in result["segments"]]
+    ends = [segment["end"] for segment in result["segments"]]
+    assert starts == sorted(starts)
+    assert starts[1:] == ends[:-1]
+    assert ends[-1] == round(len(audio) / RATE, 2)
+
+
+def test_long_form_stitches_hard_cut_overlap():
+    # Every 0.1 s block has its own level, transcribed as one "word"
+    blocks = 60
+    audio = np.repeat(np.arange(blocks) / 100.0, RATE // 10).astype(np.float32)
+
+    async def transcribe(samples):
+        levels = np.round(samples[::RATE // 10] * 100).astype(int)
+        return " ".join(f"w{level}" for level in levels)
+
+    session = LongFormTranscriber(transcribe, sample_rate=RATE, encoding="pcm_s16le", window_s=2.0, overlap_s=0.5)
+    result = asyncio.run(session.transcribe_file(FakeUpload(audio)))
+
+    assert result["transcript"] == " ".join(f"w{n}" for n in range(blocks))
+    assert len(result["segments"]) == 4
+    assert result["segments"][1]["start"] == 1.5
+
+
+def test_long_form_rejects_overlap_not_shorter_than_window():
+    async def transcribe(samples):
+        return ""
+
+    for overlap_s in (2.0, 3.0, -0.5):
+        with pytest.raises(ValueError):
+            LongFormTranscriber(transcribe, sample_rate=RATE, encoding="pcm_s16le", window_s=2.0, overlap_s=overlap_s)
+    LongFormTranscriber(transcribe, sample_rate=RATE, encoding="pcm_s16le", window_s=2.0, overlap_s=0.0)
+
+
+def test_long_form_bounds_concurrent_windows():
+    active = 0
+    peak = 0
+
+    async def transcribe(samples):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return "x"
+
+    session = LongFormTranscriber(
+        transcribe, sample_rate=RATE, encoding="pcm_s16le", window_s=0.5, overlap_s=0.0, max_in_flight=2,
+    )
+    result = asyncio.run(session.transcribe_file(FakeUpload(np.full(5 * RATE, 0.1, dtype=np.float32))))
+
+    assert peak == 2
+    assert len(result["segments"]) == 10
+
+
+def test_long_form_skips_silent_windows():
+    calls = []
+
+    async def transcribe(samples):
+        calls.append(samples)
+        return "x"
+
+    session = LongFormTranscriber(
+        transcribe, sample_rate=RATE, encoding="pcm_s16le", window_s=1.0, overlap_s=0.25, vad=EnergyVAD(RATE),
+    )
+    result = asyncio.run(session.transcribe_file(FakeUpload(np.zeros(3 * RATE, dtype=np.float32))))
+
+    assert calls == []
+    assert result == {"transcript": "", "segments": []}
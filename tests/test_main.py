@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
 
@@ -12,6 +13,9 @@ class DummyASR:
     async def transcribe_bytes(self, data: bytes) -> str:
         return "chunk"
 
+    async def transcribe_array(self, audio, model=None) -> str:
+        return "chunk"
+
 class DummyTTS:
     async def synthesize(self, text: str) -> str:
         from tempfile import NamedTemporaryFile
@@ -44,8 +48,21 @@ def test_synthesize(monkeypatch):
 
 
 def test_transcribe_ws(monkeypatch):
-    monkeypatch.setattr(asr_service, "transcribe_bytes", DummyASR().transcribe_bytes)
-    with client.websocket_connect("/transcribe_ws") as websocket:
-        websocket.send_bytes(b"data")
-        text = websocket.receive_text()
-        assert text == "chunk"
+    monkeypatch.setattr(asr_service, "transcribe_array", DummyASR().transcribe_array)
+    with client.websocket_connect("/api/transcribe_ws?encoding=pcm_s16le") as websocket:
+        # Silence is dropped by the VAD without reaching the model
+        websocket.send_bytes(b"\x00\x00" * 8000)
+        tone = (np.sin(np.arange(8000) * 0.3) * 8000).astype("<i2").tobytes()
+        websocket.send_bytes(tone)
+        assert websocket.receive_json() == {"type": "partial", "text": "chunk", "stable": ""}
+        websocket.send_text("end")
+        assert websocket.receive_json() == {"type": "final", "text": "chunk"}
+
+
+def test_readyz_reports_models_not_loaded():
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    body = response.json()
+    assert body["status"] == "loading"
+    assert body["asr_loaded"] is False
+    assert "import_app" in body["startup_seconds"]
@@ -0,0 +1,56 @@
+import asyncio
+
+from app.phonetics import WakeWordMatcher, phonetic_key, weighted_distance
+from app.wake_word import WakeWordDetector
+
+
+def test_phonetic_key_unifies_scripts_and_homophones():
+    assert phonetic_key("ሳባ") == "saba"
+    assert phonetic_key("SABBA") == "saba"
+    assert phonetic_key("ሣባ") == phonetic_key("ሳባ")
+    assert phonetic_key("ሐገር") == phonetic_key("ሀገር")
+    assert phonetic_key("ሳባን") == "saban"
+    assert phonetic_key("shay") == "Xay"
+
+
+def test_weighted_distance_discounts_vowels():
+    assert weighted_distance("saba", "saba") == 0
+    assert weighted_distance("saba", "sabe") == 0.5
+    assert weighted_distance("saba", "kaba") == 1.0
+    assert weighted_distance("saba", "sab") == 0.5
+
+
+def test_matcher_confidence_levels():
+    matcher = WakeWordMatcher(["ሳባ", "saba", "ሳባን"])
+    assert matcher.match("ሰላም ሳባ").confidence == 0.9
+    assert matcher.match("hey sabba").confidence == 0.9
+    assert matcher.match("ሰብሪና") is None
+    matcher.add("ሳብሪና")
+    assert matcher.match("ሰብሪና").confidence == 0.675
+    assert matcher.match("የሳባን").confidence == 0.7
+    assert matcher.match("hello world") is None
+    assert matcher.match("") is None
+
+
+def test_short_near_words_do_not_trigger():
+    detector = WakeWordDetector()
+    for word in ["ሰባ", "ሳብ", "ሳቢ", "ሳበ"]:
+        assert detector.matcher.match(word) is None
+        assert not asyncio.run(detector.detect_in_text(f"{word} ብር"))
+
+
+def test_matcher_respects_max_cost():
+    matcher = WakeWordMatcher(["saba"], max_cost=0.0)
+    assert matcher.match("sabe") is None
+    assert matcher.match("saba").variant == "saba"
+
+
+def test_detector_uses_phonetic_matching():
+    detector = WakeWordDetector(threshold=0.6)
+    assert asyncio.run(detector.detect_in_text("ሣባ እባክሽ"))
+    assert not asyncio.run(detector.detect_in_text("hello world"))
+    assert detector.confidence("ok") == 0.0
+
+    detector.add_variant("ሳብሪና")
+    assert detector.confidence("ሳብሪና") == 0.9
+    assert asyncio.run(detector.detect_in_text("ሰብሪና እባክሽ"))
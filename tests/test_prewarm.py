@@ -0,0 +1,33 @@
+import asyncio
+
+from app.inference import InferenceSaturatedError
+from app.prewarm import TTSPrewarmer, collect_phrases
+from app.skills import skill_manager
+from app.wake_word import WAKE_RESPONSE
+
+
+def test_collect_phrases_covers_skills_fallback_and_wake_reply():
+    phrases = collect_phrases()
+    assert phrases[0] == WAKE_RESPONSE
+    assert skill_manager.FALLBACK_RESPONSE.speech in phrases
+    assert len(phrases) == len(set(phrases))
+
+
+def test_prewarm_reports_progress_and_retries_when_saturated():
+    class FakeTTS:
+        def __init__(self):
+            self.calls = []
+
+        async def prewarm(self, text):
+            self.calls.append(text)
+            if len(self.calls) == 1:
+                raise InferenceSaturatedError(1)
+            if text == "bad":
+                raise RuntimeError("synthesis failed")
+
+    service = FakeTTS()
+    prewarmer = TTSPrewarmer(retry_delay=0)
+    asyncio.run(prewarmer.run(service, ["ሰላም", "bad"]))
+    progress = prewarmer.progress()
+    assert service.calls == ["ሰላም", "ሰላም", "bad"]
+    assert (progress["state"], progress["done"], progress["failed"]) == ("finished", 1, 1)
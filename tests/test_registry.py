@@ -0,0 +1,223 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.config import ModelConfig
+from app.registry import ModelRegistry, UnknownModelError
+
+
+class FakeModel:
+    def __init__(self, config):
+        self.path = config.path
+        self.closed = False
+
+    def memory_bytes(self):
+        return 100
+
+    def close(self):
+        self.closed = True
+
+
+def _registry(budget=0):
+    models = {
+        name: ModelConfig(name=name, path=f"{name}-path", language="am")
+        for name in ("base", "tuned", "small")
+    }
+    return ModelRegistry("asr", FakeModel, models, "base", memory_budget_bytes=budget)
+
+
+def test_lazy_load_and_unknown_model():
+    registry = _registry()
+    assert not registry.is_loaded()
+    assert registry.get().path == "base-path"
+    assert registry.is_loaded("base")
+    with pytest.raises(UnknownModelError):
+        registry.resolve("missing")
+
+
+def test_least_recently_used_model_is_evicted_under_budget():
+    registry = _registry(budget=200)
+    registry.get("base")
+    registry.get("tuned")
+    registry.get("base")
+    registry.get("small")
+    assert registry.is_loaded("base")
+    assert registry.is_loaded("small")
+    assert not registry.is_loaded("tuned")
+
+
+def test_room_is_made_before_reloading_a_model():
+    resident_at_build = []
+
+    def build(config):
+        resident_at_build.append(sum(registry.is_loaded(name) for name in ("base", "tuned", "small")))
+        return FakeModel(config)
+
+    models = {name: ModelConfig(name=name, path=f"{name}-path", language="am") for name in ("base", "tuned", "small")}
+    registry = ModelRegistry("asr", build, models, "base", memory_budget_bytes=200)
+    registry.get("base")
+    registry.get("tuned")
+    registry.get("small")  # size unknown until built: "base" goes afterwards
+    assert resident_at_build[-1] == 2
+    registry.get("base")  # size known: "tuned" goes before the build
+    assert resident_at_build[-1] == 1
+    assert registry.is_loaded("small") and not registry.is_loaded("tuned")
+
+
+def test_in_flight_models_are_not_evicted():
+    registry = _registry(budget=100)
+
+    async def scenario():
+        async with registry.use("base"):
+            registry.get("tuned")
+            assert registry.is_loaded("base")
+
+    asyncio.run(scenario())
+
+
+def test_swap_keeps_in_flight_requests_on_old_model():
+    registry = _registry()
+
+    async def scenario():
+        async with registry.use("base") as old:
+            registry.swap("base", path="checkpoint-2")
+            assert old.path == "base-path"
+            assert registry.status()["draining"] == 1
+        async with registry.use("base") as new:
+            assert new.path == "checkpoint-2"
+        assert registry.status()["draining"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_swap_to_another_backend():
+    registry = _registry()
+    registry.swap("tuned", path="exports/tuned-onnx", backend="onnx")
+    status = registry.status()["models"]["tuned"]
+    assert status["path"] == "exports/tuned-onnx"
+    assert status["backend"] == "onnx"
+    assert registry.status()["models"]["base"]["backend"] == "pytorch"
+
+
+def test_dropped_models_are_closed_once_idle():
+    registry = _registry(budget=100)
+    base = registry.get("base")
+    tuned = registry.get("tuned")
+    assert base.closed and not tuned.closed
+
+    assert registry.unload("tuned")
+    assert tuned.closed
+
+    async def scenario():
+        async with registry.use("small") as old:
+            registry.swap("small", path="checkpoint-2")
+            assert not old.closed
+        assert old.closed
+
+    asyncio.run(scenario())
+    assert not registry.get("small").closed
+
+
+def test_use_reloads_a_model_evicted_before_it_is_held():
+    registry = _registry()
+    load = registry._load
+    evicted = []
+
+    def load_then_evict(name):
+        entry = load(name)
+        if not evicted:
+            # Another request evicts it before this one holds it
+            registry.unload(name)
+            evicted.append(entry.model)
+        return entry
+
+    registry._load = load_then_evict
+
+    async def scenario():
+        async with registry.use("base") as model:
+            assert evicted[0].closed
+            assert not model.closed and model is not evicted[0]
+
+    asyncio.run(scenario())
+
+
+def test_swap_waits_for_a_load_of_the_same_model():
+    building = threading.Event()
+    release = threading.Event()
+
+    def build(config):
+        if config.path == "base-path":
+            building.set()
+            release.wait(5)
+        return FakeModel(config)
+
+    models = {"base": ModelConfig(name="base", path="base-path", language="am")}
+    registry = ModelRegistry("asr", build, models, "base")
+    loader = threading.Thread(target=registry.get)
+    loader.start()
+    assert building.wait(5)
+    swapper = threading.Thread(target=registry.swap, args=("base",), kwargs={"path": "checkpoint-2"})
+    swapper.start()
+    release.set()
+    loader.join(5)
+    swapper.join(5)
+    assert registry.get().path == "checkpoint-2"
+
+
+def test_swap_endpoint_requires_token_and_export_path(monkeypatch, tmp_path):
+    from fastapi.testclient import TestClient
+
+    from app.config import config
+    from app.main import app, asr_service
+
+    swaps = []
+    monkeypatch.setattr(asr_service.registry, "swap", lambda name, path, backend: swaps.append(path))
+    monkeypatch.setattr(config, "model_export_dir", str(tmp_path))
+    client = TestClient(app)
+    url = "/api/models/asr/whisper_amharic/swap"
+    export = tmp_path / "whisper-int8"
+    export.mkdir()
+
+    monkeypatch.setattr(config, "admin_token", "")
+    assert client.post(url, data={"path": str(export)}).status_code == 403
+
+    monkeypatch.setattr(config, "admin_token", "secret")
+    assert client.post(url, data={"path": str(export)}).status_code == 401
+    headers = {"X-Admin-Token": "secret"}
+    assert client.post(url, data={"path": "/etc"}, headers=headers).status_code == 400
+    assert client.post(url, data={"path": str(tmp_path / ".." / "x")}, headers=headers).status_code == 400
+    assert swaps == []
+
+    assert client.post(url, data={"path": str(export), "backend": "int8"}, headers=headers).status_code == 200
+    assert swaps == [str(export.resolve())]
+    assert client.post(url, data={"backend": "tensorrt"}, headers=headers).status_code == 400
+    assert client.post("/api/models/tts/xtts_int8/swap", data={"backend": "onnx"}, headers=headers).status_code == 400
+    assert swaps == [str(export.resolve())]
+
+
+def test_load_and_unload_endpoints_require_token(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.config import config
+    from app.main import app, asr_service
+
+    loads, unloads = [], []
+
+    async def ensure_loaded(name):
+        loads.append(name)
+
+    monkeypatch.setattr(asr_service.registry, "ensure_loaded", ensure_loaded)
+    monkeypatch.setattr(asr_service.registry, "unload", lambda name: unloads.append(name) or True)
+    monkeypatch.setattr(config, "admin_token", "secret")
+    client = TestClient(app)
+    url = "/api/models/asr/whisper_amharic"
+
+    assert client.post(f"{url}/load").status_code == 401
+    assert client.delete(url, headers={"X-Admin-Token": "wrong"}).status_code == 401
+    assert loads == [] and unloads == []
+
+    headers = {"X-Admin-Token": "secret"}
+    assert client.post(f"{url}/load", headers=headers).json()["status"] == "loaded"
+    assert client.delete(url, headers=headers).json()["status"] == "unloaded"
+    assert loads == unloads == ["whisper_amharic"]
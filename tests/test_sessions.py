@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import pytest
+
+from app import sessions
+from app.sessions import ConversationState, MemorySessionStore, SQLiteSessionStore, TimerWheel
+from app.wake_word import VoiceAssistantCore, WAKE_RESPONSE
+
+
+def test_timer_wheel_expires_only_due_keys():
+    wheel = TimerWheel(tick=1.0, slots=8)
+    now = time.time()
+    wheel.schedule("a", now + 2)
+    wheel.schedule("b", now + 20)
+    wheel.schedule("a", now + 4)
+    assert wheel.advance(now + 3) == []
+    assert wheel.advance(now + 5) == ["a"]
+    assert wheel.advance(now + 21) == ["b"]
+    assert len(wheel) == 0
+
+
+def test_memory_store_ttl():
+    store = MemorySessionStore(ttl=5)
+    state = ConversationState("s1")
+    state.start_conversation()
+    store.save(state)
+    assert store.get("s1") is state
+    assert store.expire(time.time() + 10) == 1
+    assert store.get("s1") is None
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    writer = SQLiteSessionStore(path, ttl=30)
+    state = ConversationState("s1")
+    state.start_conversation()
+    state.update_context("last_input", "ሰላም")
+    writer.save(state)
+
+    reader = SQLiteSessionStore(path, ttl=30)
+    loaded = reader.get("s1")
+    assert loaded.is_active
+    assert loaded.context["last_input"] == "ሰላም"
+    assert reader.expire(time.time() + 60) == 1
+    assert writer.get("s1") is None
+
+
+def test_sessions_are_isolated():
+    assistant = VoiceAssistantCore(MemorySessionStore(ttl=30))
+
+    async def scenario():
+        assert await assistant.process_voice_input("ሰላም ሳባ", "alice") == WAKE_RESPONSE
+        assert await assistant.process_voice_input("ሰላም", "bob") is None
+        assert await assistant.process_voice_input("ሰላም", "alice") is not None
+        assert (await assistant.get_session("alice")).is_active
+        assert not (await assistant.get_session("bob")).is_active
+
+    asyncio.run(scenario())
+
+
+def test_sqlite_queries_run_off_the_event_loop(tmp_path, monkeypatch):
+    offloaded = []
+
+    async def fake_to_thread(function, *args):
+        offloaded.append(function.__name__)
+        return function(*args)
+
+    monkeypatch.setattr(sessions.asyncio, "to_thread", fake_to_thread)
+    assistant = VoiceAssistantCore(SQLiteSessionStore(str(tmp_path / "sessions.db"), ttl=30))
+
+    async def scenario():
+        await assistant.start_conversation("alice")
+        assert (await assistant.get_session("alice")).is_active
+        assert await assistant.sessions.acount() == 1
+
+    asyncio.run(scenario())
+    assert offloaded == ["get", "save", "get", "count"]
+
+    memory = VoiceAssistantCore(MemorySessionStore(ttl=30))
+    asyncio.run(memory.start_conversation("bob"))
+    assert offloaded == ["get", "save", "get", "count"]
+
+
+def test_default_conversation_is_read_only():
+    assistant = VoiceAssistantCore(MemorySessionStore(ttl=30))
+    assert not assistant.conversation.is_active
+    with pytest.raises(AttributeError):
+        assistant.conversation.start_conversation()
+    with pytest.raises(TypeError):
+        assistant.conversation.context["last_input"] = "ሰላም"
+
+    asyncio.run(assistant.start_conversation())
+    assert assistant.conversation.is_active
@@ -0,0 +1,106 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.speakers import SpeakerLatents, SpeakerRegistry
+
+MODEL = "tts_models/multilingual/multi-dataset/xtts_v2"
+
+
+def _latents(seed: int):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((1, 32, 1024)), rng.standard_normal((1, 512, 1))
+
+
+def test_put_and_get_round_trip(tmp_path):
+    registry = SpeakerRegistry(str(tmp_path))
+    gpt, embedding = _latents(0)
+    stored = registry.put(MODEL, "አበበ", gpt, embedding)
+
+    latents = registry.get(MODEL, "አበበ")
+    assert latents is stored
+    assert latents.gpt_cond_latent.dtype == np.float32
+    np.testing.assert_allclose(latents.speaker_embedding, embedding.astype(np.float32))
+    assert registry.get("other/model", "አበበ") is None
+    assert registry.get(MODEL, "unknown") is None
+
+
+def test_speakers_persist_across_instances(tmp_path):
+    gpt, embedding = _latents(1)
+    digest = SpeakerRegistry(str(tmp_path)).put(MODEL, "abebe", gpt, embedding).digest
+
+    latents = SpeakerRegistry(str(tmp_path)).get(MODEL, "abebe")
+    assert latents is not None
+    assert latents.digest == digest
+    np.testing.assert_array_equal(latents.gpt_cond_latent, gpt.astype(np.float32))
+
+
+def test_reregistering_changes_digest_in_other_instances(tmp_path):
+    first, second = SpeakerRegistry(str(tmp_path)), SpeakerRegistry(str(tmp_path))
+    first.put(MODEL, "abebe", *_latents(2))
+    old = second.get(MODEL, "abebe").digest
+
+    new = first.put(MODEL, "abebe", *_latents(3)).digest
+    assert new != old
+    # A registry in another process sees the replacement without a restart
+    path = first._path(MODEL, "abebe")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert second.get(MODEL, "abebe").digest == new
+
+
+def test_invalid_names_are_rejected(tmp_path):
+    registry = SpeakerRegistry(str(tmp_path))
+    for name in ["", "../escape", "a/b", "x" * 65]:
+        with pytest.raises(ValueError):
+            registry.put(MODEL, name, *_latents(4))
+        assert registry.get(MODEL, name) is None
+
+
+def test_remove_and_names(tmp_path):
+    registry = SpeakerRegistry(str(tmp_path))
+    assert registry.names(MODEL) == []
+    registry.put(MODEL, "tigist", *_latents(5))
+    registry.put(MODEL, "abebe", *_latents(6))
+    assert registry.names(MODEL) == ["abebe", "tigist"]
+
+    assert registry.remove(MODEL, "abebe") is True
+    assert registry.remove(MODEL, "abebe") is False
+    assert registry.get(MODEL, "abebe") is None
+    assert registry.names(MODEL) == ["tigist"]
+
+
+def test_digest_identifies_the_voice():
+    gpt, embedding = _latents(7)
+    assert SpeakerLatents(gpt, embedding).digest == SpeakerLatents(gpt.copy(), embedding.copy()).digest
+    assert SpeakerLatents(gpt, embedding).digest != SpeakerLatents(*_latents(8)).digest
+
+
+def test_int8_xtts_speakers_are_names_not_paths(tmp_path, monkeypatch):
+    import threading
+    from types import SimpleNamespace
+
+    from app.models import tts as tts_module
+    from app.models.xtts import QuantizedXTTSModel
+
+    registry = SpeakerRegistry(str(tmp_path / "speakers"))
+    monkeypatch.setattr(tts_module, "speaker_registry", registry)
+    builtin = {"Ana Florence": {"gpt_cond_latent": np.ones((1, 4)), "speaker_embedding": np.ones((1, 2))}}
+
+    model = QuantizedXTTSModel.__new__(QuantizedXTTSModel)
+    model.model_name = MODEL
+    model.xtts = SimpleNamespace(speaker_manager=SimpleNamespace(speakers=builtin))
+    model.default_speaker = "Ana Florence"
+    model._latents = {}
+    model._lock = threading.Lock()
+
+    registered = registry.put(MODEL, "abebe", *_latents(9))
+    assert model.speaker_latents("abebe") is registered
+    assert model.speaker_latents(None).digest == SpeakerLatents(np.ones((1, 4)), np.ones((1, 2))).digest
+
+    wav = tmp_path / "voice.wav"
+    wav.write_bytes(b"RIFF")
+    with pytest.raises(ValueError):
+        model.speaker_latents(str(wav))
+    assert str(wav) not in model._latents
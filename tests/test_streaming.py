@@ -0,0 +1,153 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.audio import PCMRingBuffer
+from app.streaming import LocalAgreement, StreamingTranscriber
+from app.vad import EnergyVAD
+
+
+def test_ring_buffer_keeps_latest_samples():
+    ring = PCMRingBuffer(4)
+    ring.append(np.arange(3, dtype=np.float32))
+    ring.append(np.arange(3, 6, dtype=np.float32))
+    assert ring.get().tolist() == [2, 3, 4, 5]
+    ring.discard(3)
+    assert ring.get().tolist() == [5]
+    assert ring.total_written == 6
+
+
+def test_local_agreement_commits_agreed_prefix():
+    agreement = LocalAgreement()
+    assert agreement.insert(["ሰላም", "ሳባ"]) == []
+    assert agreement.insert(["ሰላም", "ሳባ", "እንዴት"]) == ["ሰላም", "ሳባ"]
+    assert agreement.unstable == ["እንዴት"]
+
+
+def test_local_agreement_skips_overlap_after_new_window():
+    agreement = LocalAgreement()
+    agreement.insert(["a", "b", "c"])
+    agreement.insert(["a", "b", "c"])
+    agreement.new_window()
+    assert agreement.insert(["b", "c", "d"]) == []
+    assert agreement.insert(["b", "c", "d", "e"]) == ["d"]
+    assert agreement.committed == ["a", "b", "c", "d"]
+
+
+def test_streaming_session_emits_partials_and_final():
+    calls = []
+
+    async def transcribe(audio):
+        calls.append(len(audio))
+        return "ሰላም ሳባ"
+
+    session = StreamingTranscriber(
+        transcribe, sample_rate=100, encoding="pcm_s16le", step_s=0.5, window_s=2.0
+    )
+    chunk = np.zeros(50, dtype="<i2").tobytes()
+
+    async def scenario():
+        messages = []
+        for _ in range(3):
+            messages.extend(await session.feed(chunk))
+        messages.extend(await session.close())
+        return messages
+
+    messages = asyncio.run(scenario())
+    assert [m["type"] for m in messages] == ["partial"] * 3 + ["final"]
+    assert messages[-1]["text"] == "ሰላም ሳባ"
+    assert max(calls) <= 200
+
+
+def test_streaming_session_skips_silent_steps():
+    calls = []
+
+    async def transcribe(audio):
+        calls.append(len(audio))
+        return "ሰላም"
+
+    session = StreamingTranscriber(
+        transcribe, sample_rate=16000, encoding="pcm_s16le", step_s=0.5, window_s=4.0, vad=EnergyVAD()
+    )
+    silence = np.zeros(8000, dtype="<i2").tobytes()
+    speech = (np.sin(np.arange(8000) * 0.3) * 8000).astype("<i2").tobytes()
+
+    async def scenario():
+        messages = []
+        for chunk in (silence, silence, speech, silence, silence):
+            messages.extend(await session.feed(chunk))
+        return messages
+
+    messages = asyncio.run(scenario())
+    # Only the step holding speech reaches the model
+    assert len(calls) == 1
+    assert [m["type"] for m in messages] == ["partial"]
+
+
+def test_transcribe_ws_discards_stream_on_disconnect(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app, asr_service
+
+    class RecordingStream:
+        def __init__(self):
+            self.discarded = False
+
+        async def feed(self, data):
+            return [{"type": "partial", "text": "", "stable": ""}]
+
+        async def discard(self):
+            self.discarded = True
+
+    streams = []
+
+    def create_stream(encoding=None, model=None):
+        streams.append(RecordingStream())
+        return streams[-1]
+
+    monkeypatch.setattr(asr_service, "create_stream", create_stream)
+    with TestClient(app).websocket_connect("/api/transcribe_ws") as ws:
+        ws.send_bytes(b"\x00\x00")
+        assert ws.receive_json()["type"] == "partial"
+    assert len(streams) == 1 and streams[0].discarded
+
+
+def test_transcribe_ws_rejects_unknown_encodings(monkeypatch):
+    from fastapi.testclient import TestClient
+    from starlette.websockets import WebSocketDisconnect
+
+    from app.main import app, asr_service
+
+    created = []
+    monkeypatch.setattr(asr_service, "create_stream", lambda encoding=None, model=None: created.append(encoding))
+    with TestClient(app).websocket_connect("/api/transcribe_ws?encoding=-i%20/etc/passwd") as ws:
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+    assert closed.value.code == 1008
+    assert created == []
+
+
+def test_stream_decoder_runs_off_the_event_loop(monkeypatch):
+    from app import audio
+
+    calls = []
+
+    async def fake_to_thread(function, *args):
+        calls.append(function.__name__)
+        return function(*args)
+
+    class FakeDecoder(audio.StreamDecoder):
+        def __init__(self):
+            pass
+
+        def feed(self, data):
+            pass
+
+        def close(self):
+            return np.zeros(0, dtype=np.float32)
+
+    monkeypatch.setattr(audio.asyncio, "to_thread", fake_to_thread)
+    asyncio.run(audio.run_decoder(FakeDecoder(), "feed", b""))
+    asyncio.run(audio.run_decoder(FakeDecoder(), "close"))
+    assert calls == ["feed", "close"]
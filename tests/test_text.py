@@ -0,0 +1,68 @@
+from app.text import (
+    TextNormalizer,
+    asr_normalizer,
+    number_to_words,
+    parse_geez_number,
+    split_sentences,
+    tts_normalizer,
+)
+
+
+def test_split_sentences_on_amharic_punctuation():
+    text = "ሰላም! እንዴት ነህ፧ ሳባ እኔ ነኝ።የአማርኛ ድምጽ ረዳት፤"
+    assert split_sentences(text) == ["ሰላም!", "እንዴት ነህ፧", "ሳባ እኔ ነኝ።", "የአማርኛ ድምጽ ረዳት፤"]
+
+
+def test_split_sentences_keeps_commas_and_trailing_text():
+    assert split_sentences("ይቅርታ፣ ያንን አልተረዳሁም። እባክሽ") == ["ይቅርታ፣ ያንን አልተረዳሁም።", "እባክሽ"]
+    assert split_sentences("   ") == []
+
+
+def test_number_to_words():
+    assert number_to_words(0) == "ዜሮ"
+    assert number_to_words(15) == "አስራ አምስት"
+    assert number_to_words(40) == "አርባ"
+    assert number_to_words(2016) == "ሁለት ሺህ አስራ ስድስት"
+    assert number_to_words(1_250_000) == "አንድ ሚሊዮን ሁለት መቶ ሃምሳ ሺህ"
+
+
+def test_parse_geez_number():
+    assert parse_geez_number("፳፻፲፮") == 2016
+    assert parse_geez_number("፲፪፼፴፬፻፶፮") == 123456
+    assert parse_geez_number("፻፼") == 1_000_000
+    assert parse_geez_number("፼፼") == 100_000_000
+
+
+def test_tts_normalizer_spells_numbers_and_abbreviations():
+    text = "  በ2016 ዓ.ም.  ዶ/ር አበበ 3.5 ኪሎ ገዛ!  ስልክ 0911? ፳ "
+    assert tts_normalizer.normalize(text) == (
+        "በሁለት ሺህ አስራ ስድስት ዓመተ ምሕረት። ዶክተር አበበ ሦስት ነጥብ አምስት ኪሎ ገዛ፤ "
+        "ስልክ ዜሮ ዘጠኝ አንድ አንድ፧ ሃያ"
+    )
+    assert tts_normalizer.normalize("1,000 ብር.") == "አንድ ሺህ ብር።"
+    assert tts_normalizer.normalize("") == ""
+
+
+def test_asr_normalizer_replaces_whole_words_in_any_case():
+    assert asr_normalizer.normalize(" Saba,  ethiopia\tAMHARIC ") == "ሳባ, ኢትዮጵያ አማርኛ"
+    assert asr_normalizer.normalize("sabana amharics") == "sabana amharics"
+
+
+def test_normalize_batch_matches_single_texts():
+    texts = ["ሰላም!", "", "  12 ሰዓት. ", "saba 3", "a\x00b"]
+    for normalizer in (asr_normalizer, tts_normalizer):
+        expected = [normalizer.normalize(text) for text in texts]
+        assert normalizer.normalize_batch(texts) == expected
+        assert normalizer.normalize_batch(texts[:-1]) == expected[:-1]
+    assert tts_normalizer.normalize_batch([]) == []
+
+
+def test_custom_normalizer_prefers_longest_lexicon_entry():
+    normalizer = TextNormalizer(lexicon={"new": "አዲስ", "New York": "ኒው ዮርክ"})
+    assert normalizer.normalize("new york, new") == "ኒው ዮርክ, አዲስ"
+
+
+
+def test_custom_normalizer_matches_entries_with_punctuation():
+    normalizer = TextNormalizer(lexicon={"Dr.": "ዶክተር", "e.g.": "ለምሳሌ"}, expand_numbers=True)
+    assert normalizer.normalize("DR. 2, e.g. dr.x ለdr. e.g.3") == "ዶክተር ሁለት, ለምሳሌ dr.x ለdr. e.g.ሦስት"
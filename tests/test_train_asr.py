@@ -0,0 +1,101 @@
+import json
+
+import numpy as np
+import pytest
+
+datasets = pytest.importorskip("datasets")
+train_asr = pytest.importorskip("app.train_asr")
+
+
+class FakeExtractor:
+    feature_size = 4
+    nb_max_frames = 6
+
+    def __init__(self):
+        self.calls = []
+
+    def to_json_string(self):
+        return json.dumps({"feature_size": self.feature_size})
+
+    def __call__(self, arrays, sampling_rate, return_tensors):
+        assert return_tensors == "np"
+        self.calls.append(len(arrays))
+        features = np.stack([np.full((4, 6), len(a), dtype=np.float64) for a in arrays])
+        return type("Inputs", (), {"input_features": features})
+
+
+class FakeTokenizer:
+    name_or_path = "fake"
+
+    def __len__(self):
+        return 100
+
+    def __call__(self, texts):
+        return type("Encoded", (), {"input_ids": [[len(t), 1] for t in texts]})
+
+
+class FakeProcessor:
+    def __init__(self):
+        self.feature_extractor = FakeExtractor()
+        self.tokenizer = FakeTokenizer()
+
+
+def make_dataset(n=5):
+    rows = {
+        "audio": [{"array": [0.0] * (10 + i), "sampling_rate": 16000} for i in range(n)],
+        "text": ["ሰላም" * (i + 1) for i in range(n)],
+    }
+    return datasets.DatasetDict({"train": datasets.Dataset.from_dict(rows)})
+
+
+def test_features_are_extracted_in_batches_and_cached(tmp_path):
+    processor = FakeProcessor()
+    ds = make_dataset()
+    processed = train_asr.preprocess_dataset(
+        ds, processor, "whisper", "local", batch_size=2, cache_dir=str(tmp_path)
+    )
+    train = processed["train"].with_format("numpy")
+    assert processor.feature_extractor.calls == [2, 2, 1]
+    assert train.column_names == ["input_features", "labels", "input_length"]
+    assert train[0]["input_features"].shape == (4, 6)
+    assert list(train["input_length"]) == [10, 11, 12, 13, 14]
+    assert train[2]["labels"].tolist() == [9, 1]
+
+    # A second run loads the saved features without extracting again
+    again = train_asr.preprocess_dataset(
+        make_dataset(), processor, "whisper", "local", batch_size=2, cache_dir=str(tmp_path)
+    )
+    assert processor.feature_extractor.calls == [2, 2, 1]
+    assert list(again["train"]["input_length"]) == [10, 11, 12, 13, 14]
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_cache_key_follows_data_and_model():
+    processor = FakeProcessor()
+    key = train_asr.feature_cache_key("local", {"train": "abc"}, processor, "whisper")
+    assert key == train_asr.feature_cache_key("local", {"train": "abc"}, processor, "whisper")
+    assert key != train_asr.feature_cache_key("local", {"train": "abd"}, processor, "whisper")
+    assert key != train_asr.feature_cache_key("local", {"train": "abc"}, processor, "whisper-small")
+    processor.feature_extractor.feature_size = 8
+    assert key != train_asr.feature_cache_key("local", {"train": "abc"}, processor, "whisper")
+
+
+def test_collator_pads_labels_to_the_batch():
+    collator = train_asr.SpeechSeq2SeqCollator(decoder_start_token_id=50, pad_to_multiple_of=4)
+    batch = collator([
+        {"input_features": np.zeros((4, 6), dtype=np.float32), "labels": np.array([50, 1, 2, 3, 4]), "input_length": 10},
+        {"input_features": np.ones((4, 6), dtype=np.float32), "labels": np.array([50, 5]), "input_length": 3},
+    ])
+    assert tuple(batch["input_features"].shape) == (2, 4, 6)
+    assert batch["labels"].tolist() == [[1, 2, 3, 4], [5, -100, -100, -100]]
+
+
+def test_step_bounded_runs_save_by_steps():
+    assert train_asr.schedule_kwargs(-1, True) == {"eval_strategy": "epoch", "save_strategy": "epoch"}
+    assert train_asr.schedule_kwargs(5000, False) == {
+        "eval_strategy": "no",
+        "eval_steps": 500,
+        "save_strategy": "steps",
+        "save_steps": 500,
+    }
+    assert train_asr.schedule_kwargs(5, True)["save_steps"] == 1
@@ -0,0 +1,63 @@
+from app.tts_cache import TTSCache
+
+
+def test_key_depends_on_every_field():
+    base = TTSCache.make_key("ሰላም", "xtts", None, "am", 22050)
+    assert base == TTSCache.make_key("ሰላም", "xtts", None, "am", 22050)
+    assert base != TTSCache.make_key("ሰላም", "xtts", "ana", "am", 22050)
+    assert base != TTSCache.make_key("ሰላም", "xtts", None, "am", 16000)
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = TTSCache(memory_bytes=8, disk_dir="")
+    cache.put("a", b"1234")
+    cache.put("b", b"5678")
+    assert cache.get("a") == b"1234"
+    cache.put("c", b"9999")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234"
+    stats = cache.stats()
+    assert stats["memory_evictions"] == 1
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_disk_tier_survives_restart_and_is_capped(tmp_path):
+    cache = TTSCache(memory_bytes=1024, disk_dir=str(tmp_path), disk_bytes=8)
+    cache.put("a" * 64, b"1234")
+    cache.put("b" * 64, b"5678")
+
+    restarted = TTSCache(memory_bytes=1024, disk_dir=str(tmp_path), disk_bytes=8)
+    assert restarted.get("b" * 64) == b"5678"
+    assert restarted.stats()["disk_hits"] == 1
+
+    restarted.put("c" * 64, b"9999")
+    assert restarted.stats()["disk_evictions"] == 1
+    assert len(list(tmp_path.glob("*/*.pcm"))) == 2
+
+
+def test_async_access_keeps_disk_io_off_the_loop(tmp_path, monkeypatch):
+    import asyncio
+
+    from app import tts_cache
+
+    offloaded = []
+
+    async def fake_to_thread(function, *args):
+        offloaded.append(function.__name__)
+        return function(*args)
+
+    monkeypatch.setattr(tts_cache.asyncio, "to_thread", fake_to_thread)
+    cache = TTSCache(memory_bytes=1024, disk_dir=str(tmp_path), disk_bytes=1024)
+
+    async def scenario():
+        await cache.aput("a" * 64, b"1234")
+        assert await cache.aget("a" * 64) == b"1234"
+        restarted = TTSCache(memory_bytes=1024, disk_dir=str(tmp_path), disk_bytes=1024)
+        assert await restarted.aget("a" * 64) == b"1234"
+        assert await restarted.aget("a" * 64) == b"1234"
+        assert await restarted.aget("b" * 64) is None
+
+    asyncio.run(scenario())
+    # Memory hits stay on the loop; the disk write and disk lookups do not
+    assert offloaded == ["_put_disk", "_get_disk", "_get_disk"]
@@ -0,0 +1,50 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.audio import wav_header
+from app.inference import InferenceSaturatedError
+from app.main import app, tts_service
+
+
+def _fake_stream(monkeypatch, chunks, error=None):
+    async def ensure_loaded(model=None):
+        pass
+
+    async def synthesize_stream(text, speaker=None, model=None):
+        for chunk in chunks:
+            yield chunk
+        if error is not None:
+            raise error
+
+    monkeypatch.setattr(tts_service, "ensure_loaded", ensure_loaded)
+    monkeypatch.setattr(tts_service, "sample_rate_for", lambda model=None: 16000)
+    monkeypatch.setattr(tts_service, "synthesize_stream", synthesize_stream)
+
+
+def test_streamed_synthesis_sends_header_and_sentences(monkeypatch):
+    _fake_stream(monkeypatch, [b"\x01\x00", b"\x02\x00"])
+    response = TestClient(app).post("/api/synthesize", data={"text": "ሰላም። እንዴት ነህ?", "stream": "true"})
+    assert response.status_code == 200
+    assert response.content == wav_header(16000) + b"\x01\x00\x02\x00"
+
+
+@pytest.mark.parametrize("error, status", [(InferenceSaturatedError(retry_after=2), 503), (RuntimeError("boom"), 500)])
+def test_streamed_synthesis_reports_errors_before_the_first_sentence(monkeypatch, error, status):
+    _fake_stream(monkeypatch, [], error)
+    response = TestClient(app).post("/api/synthesize", data={"text": "ሰላም።", "stream": "true"})
+    assert response.status_code == status
+    if status == 503:
+        assert response.headers["Retry-After"] == "2"
+
+
+def test_synthesize_ws_reports_errors_and_keeps_the_connection(monkeypatch):
+    _fake_stream(monkeypatch, [], RuntimeError("boom"))
+    with TestClient(app).websocket_connect("/api/synthesize_ws") as ws:
+        ws.send_text("ሰላም።")
+        assert ws.receive_json()["type"] == "error"
+
+        _fake_stream(monkeypatch, [b"\x01\x00"])
+        ws.send_text("ሰላም።")
+        assert ws.receive_json() == {"type": "start", "encoding": "pcm_s16le", "sample_rate": 16000}
+        assert ws.receive_bytes() == b"\x01\x00"
+        assert ws.receive_json() == {"type": "end"}
@@ -0,0 +1,59 @@
+import numpy as np
+
+from app.vad import EnergyVAD, VADStats
+
+RATE = 16000
+
+
+def tone(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * RATE), dtype=np.float32)
+
+
+def test_frame_flags_with_hangover_and_click_removal():
+    vad = EnergyVAD(hangover_ms=100, min_speech_ms=60)
+    audio = np.concatenate([silence(0.2), tone(0.2), silence(0.4)])
+    flags = vad.frame_flags(audio)
+    assert not flags[:10].any()
+    # 10 speech frames plus 5 frames of hangover
+    assert flags.sum() == 15
+
+    click = np.concatenate([silence(0.2), tone(0.02), silence(0.2)])
+    assert not vad.frame_flags(click).any()
+
+
+def test_quiet_fricatives_count_as_speech():
+    vad = EnergyVAD(threshold_db=-40)
+    noise = (0.006 * np.random.default_rng(0).standard_normal(RATE // 2)).astype(np.float32)
+    assert vad.is_speech(noise)
+    assert not vad.is_speech(silence(0.5))
+    assert not vad.is_speech(tone(0.5, amplitude=0.005))
+
+
+def test_trim_and_segments():
+    vad = EnergyVAD(hangover_ms=0)
+    audio = np.concatenate([silence(1.0), tone(0.5), silence(1.0), tone(0.5), silence(0.2), tone(0.3), silence(1.0)])
+
+    trimmed = vad.trim(audio, pad_ms=0)
+    assert len(trimmed) == int(2.5 * RATE)
+    assert len(vad.trim(silence(1.0))) == 0
+
+    segments = vad.segments(audio, min_silence_ms=500, pad_ms=0)
+    assert segments == [(16000, 24000), (40000, 56000)]
+    # Long regions are cut to max_segment_s
+    assert vad.segments(tone(2.5), pad_ms=0, max_segment_s=1.0) == [(0, 16000), (16000, 32000), (32000, 40000)]
+
+
+def test_stats_are_shared():
+    stats = VADStats()
+    vad = EnergyVAD(stats=stats)
+    vad.is_speech(silence(1.0))
+    vad.is_speech(tone(1.0))
+    snapshot = stats.snapshot()
+    assert snapshot["checked_seconds"] == 2.0
+    assert snapshot["speech_ratio"] == 0.5
+    assert snapshot["skipped_chunks"] == 1
@@ -0,0 +1,160 @@
+import asyncio
+
+import numpy as np
+
+from app.skills import SkillResponse
+from app.streaming import StreamingTranscriber
+from app.vad import EnergyVAD
+from app.voice_pipeline import TurnDetector, VoiceTurnSession
+
+RATE = 16000
+CHUNK = RATE // 50  # 20 ms
+
+
+def pcm(samples: np.ndarray) -> bytes:
+    return (samples * 32767).astype("<i2").tobytes()
+
+
+def tone(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def chunks(samples: np.ndarray):
+    for start in range(0, len(samples), CHUNK):
+        yield pcm(samples[start:start + CHUNK])
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.messages = []
+
+    async def send_json(self, message):
+        self.messages.append(message)
+
+    async def send_bytes(self, data):
+        self.messages.append(data)
+
+    def types(self):
+        return [m if isinstance(m, bytes) else m["type"] for m in self.messages]
+
+
+class FakeASR:
+    def create_stream(self, encoding=None, model=None):
+        async def transcribe(audio):
+            return "ሰላም ሳባ"
+        return StreamingTranscriber(transcribe, sample_rate=RATE, encoding=encoding, vad=EnergyVAD(RATE))
+
+
+class FakeTTS:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.streams = []
+        self.closed = 0
+
+    async def ensure_loaded(self, model=None):
+        pass
+
+    def sample_rate_for(self, model=None):
+        return 22050
+
+    async def synthesize_stream(self, text, speaker=None, model=None):
+        self.streams.append(text)
+        try:
+            for sentence in text.split("።"):
+                if sentence.strip():
+                    await asyncio.sleep(self.delay)
+                    yield sentence.strip().encode()
+        finally:
+            self.closed += 1
+
+
+class FakeAssistant:
+    def __init__(self, reply: str):
+        self.reply = reply
+        self.prepared = []
+        self.processed = []
+
+    async def prepare_response(self, text, session_id):
+        self.prepared.append(text)
+        return SkillResponse(text=self.reply)
+
+    async def process_voice_input(self, text, session_id, prepared=None):
+        self.processed.append((text, prepared is not None))
+        return prepared.text if prepared is not None else self.reply
+
+
+def make_session(tts, assistant):
+    ws = FakeWebSocket()
+    session = VoiceTurnSession(
+        ws, "test", assistant=assistant, asr=FakeASR(), tts=tts, vad=EnergyVAD(RATE),
+        end_silence_ms=500, speculate_silence_ms=200,
+    )
+    return ws, session
+
+
+def test_turn_detector_reports_start_and_end():
+    detector = TurnDetector(EnergyVAD(RATE, hangover_ms=0), end_silence_ms=200)
+    events = []
+    for chunk in chunks(np.concatenate([np.zeros(RATE // 2, dtype=np.float32), tone(0.5), np.zeros(RATE // 2, dtype=np.float32)])):
+        events.extend(detector.process(np.frombuffer(chunk, dtype="<i2").astype(np.float32) / 32768))
+    assert events == ["start", "end"]
+    assert detector.silence_ms >= 200
+
+
+def test_voice_turn_streams_reply_prepared_during_pause():
+    tts = FakeTTS()
+    assistant = FakeAssistant("አንድ። ሁለት።")
+    ws, session = make_session(tts, assistant)
+
+    async def scenario():
+        for chunk in chunks(np.concatenate([tone(1.0), np.zeros(RATE, dtype=np.float32)])):
+            await session.feed(chunk)
+            await asyncio.sleep(0)
+        await session._response
+        await session.close()
+
+    asyncio.run(scenario())
+
+    types = ws.types()
+    assert "partial" in types
+    turn = next(m for m in ws.messages if isinstance(m, dict) and m["type"] == "turn")
+    assert turn["transcript"] == "ሰላም ሳባ"
+    start = types.index("response")
+    assert ws.messages[start]["sample_rate"] == 22050
+    assert ws.messages[start + 1:] == ["አንድ".encode(), "ሁለት".encode(), {"type": "response_end"}]
+    # The reply prepared during the pause was used rather than recomputed
+    assert assistant.prepared == ["ሰላም ሳባ"]
+    assert assistant.processed == [("ሰላም ሳባ", True)]
+    assert len(tts.streams) == 1
+
+
+def test_talking_over_the_reply_cancels_it():
+    tts = FakeTTS(delay=0.2)
+    assistant = FakeAssistant("አንድ። ሁለት። ሶስት። አራት።")
+    ws, session = make_session(tts, assistant)
+
+    async def scenario():
+        for chunk in chunks(np.concatenate([tone(1.0), np.zeros(RATE, dtype=np.float32), tone(0.5)])):
+            await session.feed(chunk)
+            await asyncio.sleep(0.001)
+        await session.close()
+
+    asyncio.run(scenario())
+
+    types = ws.types()
+    assert "barge_in" in types
+    assert "response_end" not in types
+    assert tts.closed == len(tts.streams)
+    # The interrupting speech is transcribed as a new turn
+    assert "partial" in types[types.index("barge_in"):]
+
+
+def test_failed_reply_is_reported_to_the_client():
+    class FailingAssistant(FakeAssistant):
+        async def process_voice_input(self, text, session_id, prepared=None):
+            raise RuntimeError("skill crashed")
+
+    ws, session = make_session(FakeTTS(), FailingAssistant("አንድ።"))
+    asyncio.run(session._respond("ሰላም ሳባ"))
+    assert ws.messages == [{"type": "error", "detail": "Response failed: skill crashed"}]
@@ -0,0 +1,153 @@
+import asyncio
+import dataclasses
+import itertools
+import os
+import time
+
+import numpy as np
+import pytest
+
+from app.config import ModelConfig
+from app.workers import ModelWorkerPool, RemoteASRModel, RemoteTTSModel, split_cores
+
+ASR_CONFIG = ModelConfig(name="fake_asr", path="fake/asr", language="am", sample_rate=16000)
+TTS_CONFIG = ModelConfig(name="fake_tts", path="fake/tts-workers", language="am", sample_rate=22050)
+
+
+# Counts the models built in each worker process
+_instances = itertools.count(1)
+
+
+class FakeASR:
+    sample_rate = 16000
+
+    def __init__(self, path):
+        self.path = path
+        self.instance = next(_instances)
+
+    def memory_bytes(self):
+        return 10
+
+    def _transcribe_batch(self, items):
+        time.sleep(0.2)
+        texts = []
+        for item in items:
+            prefix = f"{os.getpid()} {self.instance} {self.path}"
+            if isinstance(item, bytes):
+                texts.append(f"{prefix} bytes {len(item)}")
+            else:
+                texts.append(f"{prefix} pcm {len(item)} {item.sum():.1f}")
+        return texts
+
+
+class FakeTTS:
+    sample_rate = 24000
+
+    def memory_bytes(self):
+        return 20
+
+    def _render(self, text, speaker=None):
+        if text == "fail":
+            raise ValueError("cannot say that")
+        return np.full(len(text) * 1000, 0.25, dtype=np.float32)
+
+
+def fake_asr(model_config):
+    return FakeASR(model_config.path)
+
+
+def fake_tts(model_config):
+    return FakeTTS()
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ModelWorkerPool(2, shm_bytes=4096, factories={"asr": fake_asr, "tts": fake_tts}, cores=[0])
+    yield pool
+    pool.shutdown()
+
+
+def test_split_cores_gives_each_worker_its_own_group():
+    assert split_cores(3, list(range(8))) == [[0, 1, 2], [3, 4, 5], [6, 7]]
+    assert split_cores(3, [0, 1]) == [[0], [1], [0]]
+
+
+def test_pool_transcribes_in_parallel_processes(pool):
+    audio = np.ones(100, dtype=np.float32)
+
+    async def scenario():
+        return await asyncio.gather(
+            pool.call("transcribe", "asr", ASR_CONFIG, [audio, b"RIFF"]),
+            pool.call("transcribe", "asr", ASR_CONFIG, [audio * 2]),
+        )
+
+    first, second = asyncio.run(scenario())
+
+    assert first[0].endswith("pcm 100 100.0") and first[1].endswith("bytes 4")
+    assert second[0].endswith("pcm 100 200.0")
+    # Concurrent calls go to different worker processes
+    pids = {first[0].split()[0], second[0].split()[0]}
+    assert len(pids) == 2 and str(os.getpid()) not in pids
+
+
+def test_pool_moves_audio_larger_than_the_buffer(pool):
+    audio = np.arange(5000, dtype=np.float32)
+    result = asyncio.run(pool.call("transcribe", "asr", ASR_CONFIG, [audio]))
+    assert result[0].endswith(f"pcm 5000 {audio.sum():.1f}")
+
+    audio = asyncio.run(pool.call("synthesize", "tts", TTS_CONFIG, ("ሰላም", None)))
+    assert audio.dtype == np.float32 and len(audio) == 3000 and audio[-1] == 0.25
+
+
+def test_remote_models_delegate_to_the_pool(pool):
+    asr = RemoteASRModel(ASR_CONFIG, pool)
+    tts = RemoteTTSModel(TTS_CONFIG, pool)
+    assert tts.sample_rate == 24000
+    assert asr.memory_bytes() == 20 and tts.memory_bytes() == 40
+
+    text = asyncio.run(asr.transcribe_array(np.ones(10, dtype=np.float32)))
+    assert text.endswith("pcm 10 10.0")
+    pcm = asyncio.run(tts.synthesize_pcm("ab"))
+    assert len(pcm) == 2 * 2000
+
+
+def test_worker_errors_are_raised_in_the_caller(pool):
+    with pytest.raises(RuntimeError, match="cannot say that"):
+        asyncio.run(pool.call("synthesize", "tts", TTS_CONFIG, ("fail", None)))
+
+
+def _served_by(pool, model_config):
+    """(pid, instance, path) of one transcription in each worker."""
+    audio = np.ones(4, dtype=np.float32)
+
+    async def scenario():
+        return await asyncio.gather(*[
+            pool.call("transcribe", "asr", model_config, [audio]) for _ in range(pool.processes)
+        ])
+
+    return sorted(tuple(result[0].split()[:3]) for result in asyncio.run(scenario()))
+
+
+def test_unload_frees_the_model_in_every_worker(pool):
+    model_config = dataclasses.replace(ASR_CONFIG, path="fake/unload")
+    pool.load("asr", model_config)
+    before = _served_by(pool, model_config)
+    assert _served_by(pool, model_config) == before
+
+    pool.unload("asr", model_config)
+    after = _served_by(pool, model_config)
+    # Rebuilt on the next call: each worker made a new instance
+    assert [int(i) for _, i, _ in after] != [int(i) for _, i, _ in before]
+
+
+def test_swap_alternation_does_not_reload(pool):
+    old = dataclasses.replace(ASR_CONFIG, path="fake/old")
+    new = dataclasses.replace(ASR_CONFIG, path="fake/new")
+    pool.load("asr", old)
+    pool.load("asr", new)
+    first = _served_by(pool, old) + _served_by(pool, new)
+    second = _served_by(pool, old) + _served_by(pool, new)
+    assert sorted(first) == sorted(second)
+
+    pool.unload("asr", old)
+    assert sorted(_served_by(pool, new)) == sorted(_served_by(pool, new))